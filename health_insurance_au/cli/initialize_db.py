@@ -4,6 +4,11 @@
 import argparse
 import sys
 
+from health_insurance_au.utils.logging_config import get_logger
+
+# Set up logging
+logger = get_logger(__name__)
+
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Initialize the health insurance database")
@@ -35,7 +40,7 @@ def main():
         )
         return 0
     except Exception as e:
-        print(f"Error initializing database: {e}", file=sys.stderr)
+        logger.exception(f"Error initializing database: {e}")
         return 1
 
 if __name__ == "__main__":
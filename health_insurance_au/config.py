@@ -2,13 +2,28 @@
 Configuration settings for the Health Insurance AU simulation.
 """
 import os
+from functools import lru_cache
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
 from health_insurance_au.utils.logging_config import get_logger
 from health_insurance_au.utils.env_utils import get_db_config
 
+# Reference tables are defined once in core.constants and re-exported here
+from health_insurance_au.core.constants import (
+    STATES, STATE_CODES, HOSPITAL_TIERS, DEFAULT_WAITING_PERIODS, CLAIM_TYPES
+)
+
+# DB_CONFIG and the date-dependent defaults are resolved lazily by __getattr__
+# and left out, so a star import does not load them
+__all__ = [
+    'STATES', 'STATE_CODES', 'HOSPITAL_TIERS', 'DEFAULT_WAITING_PERIODS', 'CLAIM_TYPES',
+    'BASE_DIR', 'PROJECT_ROOT', 'DEFAULT_ENV_FILE', 'LOG_CONFIG', 'DATA_DIR',
+    'SAMPLE_DATA_PATH', 'DEFAULT_START_DATE', 'PHI_REBATE_TIERS', 'PHI_REBATE_UNDER_65'
+]
+
 # Set up logging
 logger = get_logger(__name__)
 
@@ -31,86 +46,78 @@
 DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
 SAMPLE_DATA_PATH = os.path.join(DATA_DIR, 'health_insurance_demo_10k.json')
 
-# Simulation defaults
+# Simulation defaults (DEFAULT_END_DATE and DEFAULT_SIMULATION_DAYS are
+# computed on first access, see __getattr__ below)
 DEFAULT_START_DATE = datetime(2023, 1, 1)
-DEFAULT_END_DATE = datetime.now()
-DEFAULT_SIMULATION_DAYS = (DEFAULT_END_DATE - DEFAULT_START_DATE).days
-
-# Australian states and territories
-STATES = {
-    'NSW': 'New South Wales',
-    'VIC': 'Victoria',
-    'QLD': 'Queensland',
-    'WA': 'Western Australia',
-    'SA': 'South Australia',
-    'TAS': 'Tasmania',
-    'ACT': 'Australian Capital Territory',
-    'NT': 'Northern Territory'
-}
-
-# Hospital tiers as per Australian PHI reforms
-HOSPITAL_TIERS = ['Basic', 'Bronze', 'Silver', 'Gold']
-
-# Default waiting periods (in months)
-DEFAULT_WAITING_PERIODS = {
-    'general': 2,
-    'pre_existing': 12,
-    'pregnancy': 12,
-    'psychiatric': 2,
-    'rehabilitation': 2
-}
 
 # PHI Rebate tiers for 2023-2024
-PHI_REBATE_TIERS = [
-    {
+PHI_REBATE_TIERS = (
+    MappingProxyType({
         'name': 'Base',
         'income_single': 93000,
         'income_family': 186000,
         'rebate_under65': 24.608,
         'rebate_65to69': 28.710,
         'rebate_70plus': 32.812
-    },
-    {
+    }),
+    MappingProxyType({
         'name': 'Tier1',
         'income_single': 108000,
         'income_family': 216000,
         'rebate_under65': 16.405,
         'rebate_65to69': 20.507,
         'rebate_70plus': 24.608
-    },
-    {
+    }),
+    MappingProxyType({
         'name': 'Tier2',
         'income_single': 144000,
         'income_family': 288000,
         'rebate_under65': 8.202,
         'rebate_65to69': 12.303,
         'rebate_70plus': 16.405
-    },
-    {
+    }),
+    MappingProxyType({
         'name': 'Tier3',
         'income_single': 144001,  # Above this threshold
         'income_family': 288001,  # Above this threshold
         'rebate_under65': 0,
         'rebate_65to69': 0,
         'rebate_70plus': 0
-    }
-]
+    })
+)
 
-# Claim types
-CLAIM_TYPES = [
-    'Hospital',
-    'Medical',
-    'Dental',
-    'Optical',
-    'Physiotherapy',
-    'Chiropractic',
-    'Psychology',
-    'Podiatry',
-    'Acupuncture',
-    'Naturopathy',
-    'Remedial Massage',
-    'Ambulance'
-]
+# Under-65 rebate percentage by tier name
+PHI_REBATE_UNDER_65 = MappingProxyType({
+    tier['name']: float(tier['rebate_under65']) for tier in PHI_REBATE_TIERS
+})
+
+# Load the database configuration lazily
+@lru_cache(maxsize=1)
+def _load_db_config() -> Dict[str, Any]:
+    """
+    Load the database configuration on first use.
+    
+    The same dictionary is returned on every call, so scripts that override
+    values on DB_CONFIG at runtime are seen by all later users.
+    
+    Returns:
+        A dictionary with database configuration
+    """
+    return get_db_config(DEFAULT_ENV_FILE)
 
-# Load the database configuration
-DB_CONFIG = get_db_config(DEFAULT_ENV_FILE)
\ No newline at end of file
+def __getattr__(name: str) -> Any:
+    """
+    Resolve DB_CONFIG and the date-dependent simulation defaults lazily, so
+    importing config neither reads the env file nor samples the clock.
+    """
+    if name == 'DB_CONFIG':
+        return _load_db_config()
+    if name == 'DEFAULT_END_DATE':
+        # Fixed at first access and reused, like the old import-time value
+        value = globals()[name] = datetime.now()
+        return value
+    if name == 'DEFAULT_SIMULATION_DAYS':
+        end_date = globals().get('DEFAULT_END_DATE') or __getattr__('DEFAULT_END_DATE')
+        value = globals()[name] = (end_date - DEFAULT_START_DATE).days
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
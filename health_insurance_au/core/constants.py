@@ -1,6 +1,7 @@
 """
 Constants specific to the Australian health insurance system.
 """
+from types import MappingProxyType
 
 # Hospital Cover Tiers
 HOSPITAL_TIER_BASIC = "Basic"
@@ -13,49 +14,87 @@
 WAITING_PERIOD_PRE_EXISTING = 12
 WAITING_PERIOD_PREGNANCY = 12
 
+# Reference tables are read-only so every importer shares one immutable copy
+
 # Australian States and Territories
-STATES = {
-    "ACT": "Australian Capital Territory",
+STATES = MappingProxyType({
     "NSW": "New South Wales",
-    "NT": "Northern Territory",
+    "VIC": "Victoria",
     "QLD": "Queensland",
+    "WA": "Western Australia",
     "SA": "South Australia",
     "TAS": "Tasmania",
-    "VIC": "Victoria",
-    "WA": "Western Australia"
-}
+    "ACT": "Australian Capital Territory",
+    "NT": "Northern Territory"
+})
+
+# State codes, for random selection without rebuilding a key list each time
+STATE_CODES = tuple(STATES)
+
+# Hospital tiers as per Australian PHI reforms
+HOSPITAL_TIERS = (
+    HOSPITAL_TIER_BASIC,
+    HOSPITAL_TIER_BRONZE,
+    HOSPITAL_TIER_SILVER,
+    HOSPITAL_TIER_GOLD
+)
+
+# Default waiting periods (in months)
+DEFAULT_WAITING_PERIODS = MappingProxyType({
+    "general": WAITING_PERIOD_GENERAL,
+    "pre_existing": WAITING_PERIOD_PRE_EXISTING,
+    "pregnancy": WAITING_PERIOD_PREGNANCY,
+    "psychiatric": 2,
+    "rehabilitation": 2
+})
+
+# Claim types
+CLAIM_TYPES = (
+    "Hospital",
+    "Medical",
+    "Dental",
+    "Optical",
+    "Physiotherapy",
+    "Chiropractic",
+    "Psychology",
+    "Podiatry",
+    "Acupuncture",
+    "Naturopathy",
+    "Remedial Massage",
+    "Ambulance"
+)
 
 # Private Health Insurance Rebate Tiers
-PHI_REBATE_TIERS = {
-    "Base": {
+PHI_REBATE_TIERS = MappingProxyType({
+    "Base": MappingProxyType({
         "single_income_threshold": 90000,
         "family_income_threshold": 180000,
         "rebate_under_65": 0.25,
         "rebate_65_69": 0.29,
         "rebate_70_plus": 0.33
-    },
-    "Tier1": {
+    }),
+    "Tier1": MappingProxyType({
         "single_income_threshold": 105000,
         "family_income_threshold": 210000,
         "rebate_under_65": 0.17,
         "rebate_65_69": 0.21,
         "rebate_70_plus": 0.25
-    },
-    "Tier2": {
+    }),
+    "Tier2": MappingProxyType({
         "single_income_threshold": 140000,
         "family_income_threshold": 280000,
         "rebate_under_65": 0.08,
         "rebate_65_69": 0.12,
         "rebate_70_plus": 0.16
-    },
-    "Tier3": {
+    }),
+    "Tier3": MappingProxyType({
         "single_income_threshold": float('inf'),
         "family_income_threshold": float('inf'),
         "rebate_under_65": 0.0,
         "rebate_65_69": 0.0,
         "rebate_70_plus": 0.0
-    }
-}
+    })
+})
 
 # Lifetime Health Cover (LHC) Loading
 LHC_BASE_AGE = 31
@@ -7,13 +7,54 @@
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Optional
 
-from health_insurance_au.utils.db_utils import execute_query, execute_non_query, bulk_insert
+from health_insurance_au.utils.db_utils import (
+    execute_query, execute_non_query, execute_many, bulk_insert_rows, MAX_IN_CLAUSE_PARAMS
+)
 from health_insurance_au.models.models import Member, Claim
 from health_insurance_au.utils.logging_config import get_logger
 
 # Set up logging
 logger = get_logger(__name__)
 
+# Maximum birth date difference for linking a Synthea patient to a member
+DOB_MATCH_WINDOW = timedelta(days=365 * 5)
+
+# Claims columns in the order generate_claims_from_encounters builds each row
+ENCOUNTER_CLAIM_COLUMNS = (
+    'ClaimNumber', 'PolicyID', 'MemberID', 'ProviderID', 'ServiceDate', 'SubmissionDate',
+    'ClaimType', 'ServiceDescription', 'MBSItemNumber', 'ChargedAmount', 'MedicareAmount',
+    'InsuranceAmount', 'GapAmount', 'ExcessApplied', 'Status', 'ProcessedDate',
+    'PaymentDate', 'RejectionReason'
+)
+
+# Rows sent per executemany round trip by the Synthea imports
+IMPORT_BATCH_SIZE = 1000
+
+def _import_rows(query: str, rows: List[tuple], description: str) -> int:
+    """
+    Insert rows in batches, carrying on past a batch that fails.
+    
+    A bad row fails its whole batch; the batch is logged and skipped so the
+    remaining batches are still imported.
+    
+    Args:
+        query: The parameterized INSERT statement
+        rows: The parameter tuples to insert
+        description: What the rows are, for log messages
+        
+    Returns:
+        The number of rows actually inserted
+    """
+    imported_count = 0
+    for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+        batch = rows[start:start + IMPORT_BATCH_SIZE]
+        inserted = execute_many(query, batch, IMPORT_BATCH_SIZE)
+        if inserted < len(batch):
+            logger.error(f"Failed to import Synthea {description} {start + 1}-{start + len(batch)} "
+                         f"of {len(rows)}; that batch was skipped")
+        imported_count += inserted
+    return imported_count
+
 class SyntheaIntegration:
     """
     Class for integrating Synthea FHIR data with the health insurance simulation.
@@ -54,7 +95,7 @@ def import_patients(self, limit: int = None) -> int:
         logger.info(f"Found {len(patient_files)} Synthea patient files")
         
         # Process each patient file
-        imported_count = 0
+        rows = []
         for file_path in patient_files:
             try:
                 with open(file_path, 'r') as f:
@@ -66,20 +107,18 @@ def import_patients(self, limit: int = None) -> int:
                     logger.warning(f"No patient ID found in {file_path}")
                     continue
                 
-                # Store the patient data
-                try:
-                    query = """
-                    INSERT INTO Integration.SyntheaPatients (PatientFHIRID, PatientData)
-                    VALUES (?, ?)
-                    """
-                    execute_non_query(query, (patient_id, json.dumps(patient_data)))
-                    imported_count += 1
-                except Exception as e:
-                    logger.error(f"Error importing patient {patient_id}: {e}")
+                rows.append((patient_id, json.dumps(patient_data)))
             except Exception as e:
                 logger.error(f"Error processing file {file_path}: {e}")
         
-        logger.info(f"Imported {imported_count} Synthea patients")
+        # Store all patients in batched round trips rather than one per file
+        query = """
+        INSERT INTO Integration.SyntheaPatients (PatientFHIRID, PatientData)
+        VALUES (?, ?)
+        """
+        imported_count = _import_rows(query, rows, 'patients')
+        
+        logger.info(f"Imported {imported_count} of {len(rows)} Synthea patients")
         return imported_count
     
     def import_encounters(self, limit: int = None) -> int:
@@ -108,7 +147,7 @@ def import_encounters(self, limit: int = None) -> int:
         logger.info(f"Found {len(encounter_files)} Synthea encounter files")
         
         # Process each encounter file
-        imported_count = 0
+        rows = []
         for file_path in encounter_files:
             try:
                 with open(file_path, 'r') as f:
@@ -130,20 +169,18 @@ def import_encounters(self, limit: int = None) -> int:
                     logger.warning(f"No patient reference found in encounter {encounter_id}")
                     continue
                 
-                # Store the encounter data
-                try:
-                    query = """
-                    INSERT INTO Integration.SyntheaEncounters (EncounterFHIRID, PatientFHIRID, EncounterData)
-                    VALUES (?, ?, ?)
-                    """
-                    execute_non_query(query, (encounter_id, patient_ref, json.dumps(encounter_data)))
-                    imported_count += 1
-                except Exception as e:
-                    logger.error(f"Error importing encounter {encounter_id}: {e}")
+                rows.append((encounter_id, patient_ref, json.dumps(encounter_data)))
             except Exception as e:
                 logger.error(f"Error processing file {file_path}: {e}")
         
-        logger.info(f"Imported {imported_count} Synthea encounters")
+        # Store all encounters in batched round trips rather than one per file
+        query = """
+        INSERT INTO Integration.SyntheaEncounters (EncounterFHIRID, PatientFHIRID, EncounterData)
+        VALUES (?, ?, ?)
+        """
+        imported_count = _import_rows(query, rows, 'encounters')
+        
+        logger.info(f"Imported {imported_count} of {len(rows)} Synthea encounters")
         return imported_count
     
     def import_procedures(self, limit: int = None) -> int:
@@ -172,7 +209,7 @@ def import_procedures(self, limit: int = None) -> int:
         logger.info(f"Found {len(procedure_files)} Synthea procedure files")
         
         # Process each procedure file
-        imported_count = 0
+        rows = []
         for file_path in procedure_files:
             try:
                 with open(file_path, 'r') as f:
@@ -204,20 +241,18 @@ def import_procedures(self, limit: int = None) -> int:
                     logger.warning(f"No encounter reference found in procedure {procedure_id}")
                     continue
                 
-                # Store the procedure data
-                try:
-                    query = """
-                    INSERT INTO Integration.SyntheaProcedures (ProcedureFHIRID, PatientFHIRID, EncounterFHIRID, ProcedureData)
-                    VALUES (?, ?, ?, ?)
-                    """
-                    execute_non_query(query, (procedure_id, patient_ref, encounter_ref, json.dumps(procedure_data)))
-                    imported_count += 1
-                except Exception as e:
-                    logger.error(f"Error importing procedure {procedure_id}: {e}")
+                rows.append((procedure_id, patient_ref, encounter_ref, json.dumps(procedure_data)))
             except Exception as e:
                 logger.error(f"Error processing file {file_path}: {e}")
         
-        logger.info(f"Imported {imported_count} Synthea procedures")
+        # Store all procedures in batched round trips rather than one per file
+        query = """
+        INSERT INTO Integration.SyntheaProcedures (ProcedureFHIRID, PatientFHIRID, EncounterFHIRID, ProcedureData)
+        VALUES (?, ?, ?, ?)
+        """
+        imported_count = _import_rows(query, rows, 'procedures')
+        
+        logger.info(f"Imported {imported_count} of {len(rows)} Synthea procedures")
         return imported_count
     
     def link_patients_to_members(self) -> int:
@@ -272,6 +307,17 @@ def link_patients_to_members(self) -> int:
                 if 'birthDate' in patient_data:
                     patient_dob = patient_data['birthDate']
                 
+                # Parse the patient's birth date once and turn the allowed 5-year
+                # difference into a birth date window each member is range-checked against
+                earliest_dob = latest_dob = None
+                if patient_dob:
+                    try:
+                        patient_date = datetime.strptime(patient_dob, '%Y-%m-%d').date()
+                        earliest_dob = patient_date - DOB_MATCH_WINDOW
+                        latest_dob = patient_date + DOB_MATCH_WINDOW
+                    except ValueError:
+                        pass
+                
                 # Find matching members
                 matching_members = []
                 for member in members:
@@ -283,17 +329,13 @@ def link_patients_to_members(self) -> int:
                     )
                     
                     # Check approximate DOB match
-                    dob_match = False
-                    if patient_dob and member['DateOfBirth']:
-                        try:
-                            patient_date = datetime.strptime(patient_dob, '%Y-%m-%d').date()
-                            member_date = member['DateOfBirth']
-                            # Allow for a 5-year difference
-                            dob_match = abs((patient_date - member_date).days) < 365 * 5
-                        except:
-                            pass
+                    member_date = member['DateOfBirth']
+                    dob_match = (
+                        earliest_dob is not None and member_date is not None
+                        and earliest_dob < member_date < latest_dob
+                    )
                     
-                    if gender_match and (dob_match or not patient_dob or not member['DateOfBirth']):
+                    if gender_match and (dob_match or not patient_dob or not member_date):
                         matching_members.append(member)
                 
                 if matching_members:
@@ -335,16 +377,22 @@ def generate_claims_from_encounters(self, limit: int = None) -> int:
         """
         logger.info("Generating claims from Synthea encounters...")
         
-        # Get encounters that don't already have claims
+        # Get encounters that don't already have claims (one row per encounter;
+        # joining procedures here would repeat each encounter once per procedure),
+        # along with the member's active policy if they hold one
         encounters = execute_query("""
             SELECT e.SyntheaEncounterID, e.EncounterFHIRID, e.PatientFHIRID, e.EncounterData,
-                   p.MemberID, m.FirstName, m.LastName
+                   p.MemberID, m.FirstName, m.LastName, pol.PolicyID, pol.ExcessAmount
             FROM Integration.SyntheaEncounters e
             JOIN Integration.SyntheaPatients p ON e.PatientFHIRID = p.PatientFHIRID
             JOIN Insurance.Members m ON p.MemberID = m.MemberID
-            LEFT JOIN Integration.SyntheaProcedures pr ON e.EncounterFHIRID = pr.EncounterFHIRID
+            OUTER APPLY (
+                SELECT TOP 1 ap.PolicyID, ap.ExcessAmount
+                FROM Insurance.Policies ap
+                WHERE ap.PrimaryMemberID = m.MemberID AND ap.Status = 'Active'
+                ORDER BY ap.PolicyID DESC
+            ) pol
             WHERE e.ClaimID IS NULL
-            ORDER BY NEWID()
         """)
         
         if not encounters:
@@ -353,24 +401,10 @@ def generate_claims_from_encounters(self, limit: int = None) -> int:
         
         logger.info(f"Found {len(encounters)} eligible encounters for claim generation")
         
-        if limit:
-            encounters = encounters[:limit]
-        
-        # Get policies for members
-        policies = execute_query("""
-            SELECT p.PolicyID, p.PolicyNumber, p.PrimaryMemberID, p.ExcessAmount, p.Status
-            FROM Insurance.Policies p
-            WHERE p.Status = 'Active'
-        """)
-        
-        if not policies:
-            logger.warning("No active policies found")
-            return 0
-        
-        # Create a mapping of member ID to policy ID
-        member_policy_map = {}
-        for policy in policies:
-            member_policy_map[policy['PrimaryMemberID']] = policy
+        # Pick the limited subset at random here rather than shuffling every eligible
+        # encounter on the server with ORDER BY NEWID(); processing order is irrelevant
+        if limit and limit < len(encounters):
+            encounters = random.sample(encounters, limit)
         
         # Get providers
         providers = execute_query("""
@@ -383,17 +417,35 @@ def generate_claims_from_encounters(self, limit: int = None) -> int:
             logger.warning("No suitable providers found")
             return 0
         
+        # Group providers by type once; encounter types with no matching provider
+        # fall back to the full provider list
+        providers_by_type = {}
+        for provider in providers:
+            providers_by_type.setdefault(provider['ProviderType'], []).append(provider)
+        
+        # Today's date and the claim number prefix are the same for every claim
+        # in the batch, so build them once
+        today = date.today()
+        claim_number_prefix = f"CL-{today.strftime('%Y%m%d')}-"
+        
+        # Draw the per-claim random values that don't depend on the encounter type
+        # in batches up front rather than with several calls per encounter
+        encounter_count = len(encounters)
+        service_day_offsets = random.choices(range(1, 366), k=encounter_count)
+        submission_day_offsets = random.choices(range(1, 11), k=encounter_count)
+        claim_number_suffixes = random.choices(range(10000, 100000), k=encounter_count)
+        
         # Generate claims
         claims_data = []
-        for encounter in encounters:
+        for encounter, service_day_offset, submission_day_offset, claim_number_suffix in zip(
+            encounters, service_day_offsets, submission_day_offsets, claim_number_suffixes
+        ):
             try:
                 # Check if member has an active policy
-                if encounter['MemberID'] not in member_policy_map:
+                if encounter['PolicyID'] is None:
                     logger.debug(f"No active policy found for member {encounter['MemberID']}")
                     continue
                 
-                policy = member_policy_map[encounter['MemberID']]
-                
                 # Parse encounter data
                 encounter_data = json.loads(encounter['EncounterData'])
                 
@@ -406,14 +458,10 @@ def generate_claims_from_encounters(self, limit: int = None) -> int:
                     elif 'emergency' in class_code:
                         encounter_type = 'Specialist'
                 
-                matching_providers = [p for p in providers if p['ProviderType'] == encounter_type]
-                if not matching_providers:
-                    matching_providers = providers
-                
-                provider = random.choice(matching_providers)
+                provider = random.choice(providers_by_type.get(encounter_type, providers))
                 
                 # Extract service date
-                service_date = date.today() - timedelta(days=random.randint(1, 365))
+                service_date = today - timedelta(days=service_day_offset)
                 if 'period' in encounter_data and 'start' in encounter_data['period']:
                     try:
                         service_date = datetime.strptime(encounter_data['period']['start'], '%Y-%m-%dT%H:%M:%S%z').date()
@@ -421,7 +469,7 @@ def generate_claims_from_encounters(self, limit: int = None) -> int:
                         pass
                 
                 # Generate submission date (a few days after service date)
-                submission_date = service_date + timedelta(days=random.randint(1, 10))
+                submission_date = service_date + timedelta(days=submission_day_offset)
                 
                 # Extract reason for visit
                 service_description = "Medical consultation"
@@ -431,61 +479,64 @@ def generate_claims_from_encounters(self, limit: int = None) -> int:
                             service_description = reason['text']
                             break
                 
-                # Calculate charges
+                # Calculate charges (drawn in whole cents rather than rounding a float)
                 if encounter_type == 'Hospital':
-                    charged_amount = round(random.uniform(500, 5000), 2)
+                    charged_amount = random.randint(50000, 500000) / 100
                     medicare_amount = round(charged_amount * 0.75, 2)
-                    excess_applied = min(policy['ExcessAmount'], charged_amount - medicare_amount)
+                    excess_applied = min(encounter['ExcessAmount'], charged_amount - medicare_amount)
                 else:
-                    charged_amount = round(random.uniform(80, 300), 2)
+                    charged_amount = random.randint(8000, 30000) / 100
                     medicare_amount = round(charged_amount * 0.85, 2)
                     excess_applied = 0
                 
                 insurance_amount = round(charged_amount - medicare_amount - excess_applied, 2)
                 gap_amount = max(0, round(charged_amount - medicare_amount - insurance_amount - excess_applied, 2))
                 
-                # Generate claim
-                claim = {
-                    'ClaimNumber': f"CL-{date.today().strftime('%Y%m%d')}-{random.randint(10000, 99999)}",
-                    'PolicyID': policy['PolicyID'],
-                    'MemberID': encounter['MemberID'],
-                    'ProviderID': provider['ProviderID'],
-                    'ServiceDate': service_date,
-                    'SubmissionDate': submission_date,
-                    'ClaimType': encounter_type,
-                    'ServiceDescription': service_description,
-                    'MBSItemNumber': None,
-                    'ChargedAmount': charged_amount,
-                    'MedicareAmount': medicare_amount,
-                    'InsuranceAmount': insurance_amount,
-                    'GapAmount': gap_amount,
-                    'ExcessApplied': excess_applied,
-                    'Status': 'Submitted',
-                    'ProcessedDate': None,
-                    'PaymentDate': None,
-                    'RejectionReason': None
-                }
-                
-                claims_data.append(claim)
+                # Generate the claim directly as an insert row in ENCOUNTER_CLAIM_COLUMNS
+                # order; nothing else reads it, so no dict or Claim object is built
+                claims_data.append((
+                    f"{claim_number_prefix}{claim_number_suffix}",
+                    encounter['PolicyID'],
+                    encounter['MemberID'],
+                    provider['ProviderID'],
+                    service_date,
+                    submission_date,
+                    encounter_type,
+                    service_description,
+                    None,  # MBSItemNumber
+                    charged_amount,
+                    medicare_amount,
+                    insurance_amount,
+                    gap_amount,
+                    excess_applied,
+                    'Submitted',
+                    None,  # ProcessedDate
+                    None,  # PaymentDate
+                    None   # RejectionReason
+                ))
             except Exception as e:
                 logger.error(f"Error generating claim for encounter {encounter['EncounterFHIRID']}: {e}")
         
         # Insert claims into database
         if claims_data:
             try:
-                rows_affected = bulk_insert("Insurance.Claims", claims_data)
+                rows_affected = bulk_insert_rows("Insurance.Claims", ENCOUNTER_CLAIM_COLUMNS, claims_data)
                 logger.info(f"Added {rows_affected} new claims from Synthea encounters")
                 
                 # Update encounters with claim IDs
                 # This would require getting the new claim IDs and updating the encounters
-                # For simplicity, we'll just mark all processed encounters as having claims
-                for encounter in encounters:
-                    query = """
+                # For simplicity, we'll just mark all processed encounters as having claims,
+                # with one set-based UPDATE per chunk of IDs rather than one per encounter
+                encounter_ids = [encounter['SyntheaEncounterID'] for encounter in encounters]
+                for start in range(0, len(encounter_ids), MAX_IN_CLAUSE_PARAMS):
+                    batch_ids = encounter_ids[start:start + MAX_IN_CLAUSE_PARAMS]
+                    placeholders = ', '.join('?' for _ in batch_ids)
+                    query = f"""
                     UPDATE Integration.SyntheaEncounters
-                    SET ClaimID = -1  # Placeholder to indicate it has been processed
-                    WHERE SyntheaEncounterID = ?
+                    SET ClaimID = -1  -- Placeholder to indicate it has been processed
+                    WHERE SyntheaEncounterID IN ({placeholders})
                     """
-                    execute_non_query(query, (encounter['SyntheaEncounterID'],))
+                    execute_non_query(query, tuple(batch_ids))
                 
                 return rows_affected
             except Exception as e:
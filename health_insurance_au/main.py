@@ -88,32 +88,33 @@ def main():
     
     if args.command == 'daily':
         # Run daily simulation
-        simulation = HealthInsuranceSimulation()
-        simulation.run_daily_simulation(
-            simulation_date=args.date,
-            add_new_members=not args.no_members,
-            new_members_count=args.members,
-            add_new_plans=args.plans > 0,
-            new_plans_count=args.plans,
-            create_new_policies=not args.no_policies,
-            new_policies_count=args.policies,
-            update_members=not args.no_updates,
-            process_policy_changes=not args.no_changes,
-            generate_hospital_claims=not args.no_hospital_claims,
-            hospital_claims_count=args.hospital_claims,
-            generate_general_claims=not args.no_general_claims,
-            general_claims_count=args.general_claims,
-            process_premium_payments=not args.no_payments,
-            process_claims=not args.no_claims_processing
-        )
+        with HealthInsuranceSimulation() as simulation:
+            simulation.run_daily_simulation(
+                simulation_date=args.date,
+                add_new_members=not args.no_members,
+                new_members_count=args.members,
+                add_new_plans=args.plans > 0,
+                new_plans_count=args.plans,
+                create_new_policies=not args.no_policies,
+                new_policies_count=args.policies,
+                update_members=not args.no_updates,
+                process_policy_changes=not args.no_changes,
+                generate_hospital_claims=not args.no_hospital_claims,
+                hospital_claims_count=args.hospital_claims,
+                generate_general_claims=not args.no_general_claims,
+                general_claims_count=args.general_claims,
+                process_premium_payments=not args.no_payments,
+                process_claims=not args.no_claims_processing
+            )
     elif args.command == 'historical':
-        # Run historical simulation
-        simulation = HealthInsuranceSimulation()
-        simulation.run_historical_simulation(
-            start_date=args.start_date,
-            end_date=args.end_date,
-            frequency=args.frequency
-        )
+        # Run historical simulation, reusing one simulation (and its open
+        # connections) for every simulated day
+        with HealthInsuranceSimulation() as simulation:
+            simulation.run_historical_simulation(
+                start_date=args.start_date,
+                end_date=args.end_date,
+                frequency=args.frequency
+            )
     elif args.command == 'synthea':
         # Run Synthea integration
         integration = SyntheaIntegration(args.dir)
@@ -3,8 +3,14 @@
 """
 from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import List, Dict, Optional, Any
+from operator import attrgetter
+from typing import List, Dict, Optional, Any, Tuple
 import json
+import sys
+
+# Models that are generated in bulk and never carry extra attributes are
+# declared with __slots__ (no per-instance __dict__) where dataclasses support it
+SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 @dataclass
 class Member:
@@ -127,7 +133,7 @@ def to_dict(self) -> Dict[str, Any]:
             'NextPremiumDueDate': self.next_premium_due_date
         }
 
-@dataclass
+@dataclass(**SLOTS)
 class PolicyMember:
     """Policy member relationship data model."""
     policy_id: int
@@ -187,7 +193,7 @@ def to_dict(self) -> Dict[str, Any]:
             'IsActive': self.is_active
         }
 
-@dataclass
+@dataclass(**SLOTS)
 class Claim:
     """Health insurance claim data model."""
     claim_number: str
@@ -232,7 +238,7 @@ def to_dict(self) -> Dict[str, Any]:
             'RejectionReason': self.rejection_reason
         }
 
-@dataclass
+@dataclass(**SLOTS)
 class PremiumPayment:
     """Premium payment data model."""
     policy_id: int
@@ -244,6 +250,20 @@ class PremiumPayment:
     payment_reference: Optional[str] = None
     payment_status: str = "Successful"  # Successful, Failed, Pending, Refunded
     
+    # Database columns in the order to_row returns their values
+    COLUMNS = (
+        'PolicyID', 'PaymentDate', 'PaymentAmount', 'PaymentMethod',
+        'PaymentReference', 'PaymentStatus', 'PeriodStartDate', 'PeriodEndDate'
+    )
+    _ROW_VALUES = attrgetter(
+        'policy_id', 'payment_date', 'payment_amount', 'payment_method',
+        'payment_reference', 'payment_status', 'period_start_date', 'period_end_date'
+    )
+    
+    def to_row(self) -> Tuple[Any, ...]:
+        """Convert the premium payment to a tuple of values in COLUMNS order."""
+        return PremiumPayment._ROW_VALUES(self)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert the premium payment to a dictionary for database operations."""
         return {
@@ -0,0 +1,38 @@
+"""
+Database table lists shared by the database maintenance scripts.
+"""
+
+# Tables tracked by Change Data Capture, as (schema, table)
+CDC_TABLES = [
+    ('Insurance', 'Members'),
+    ('Insurance', 'CoveragePlans'),
+    ('Insurance', 'Policies'),
+    ('Insurance', 'PolicyMembers'),
+    ('Insurance', 'Providers'),
+    ('Insurance', 'Claims'),
+    ('Insurance', 'PremiumPayments'),
+    ('Regulatory', 'PHIRebateTiers'),
+    ('Regulatory', 'MBSItems'),
+    ('Integration', 'SyntheaPatients'),
+    ('Integration', 'SyntheaEncounters'),
+    ('Integration', 'SyntheaProcedures')
+]
+
+# High-write CDC tables whose net changes are never queried, so they skip
+# net-change support and the extra index it maintains
+CDC_ALL_CHANGES_ONLY_TABLES = frozenset({
+    ('Insurance', 'Claims'),
+    ('Insurance', 'PremiumPayments'),
+    ('Integration', 'SyntheaPatients'),
+    ('Integration', 'SyntheaEncounters'),
+    ('Integration', 'SyntheaProcedures')
+})
+
+# Tables whose structure is reported by check_db, as (schema, table)
+DESCRIBE_TABLES = [
+    ('Insurance', 'Members'),
+    ('Insurance', 'CoveragePlans'),
+    ('Insurance', 'Policies'),
+    ('Insurance', 'Claims'),
+    ('Insurance', 'Providers')
+]
@@ -2,7 +2,7 @@
 Claims generator for the Health Insurance AU simulation.
 """
 import random
-import string
+from itertools import accumulate
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 
@@ -10,7 +10,6 @@
 from health_insurance_au.models.models import Claim, Policy, Member, Provider
 from health_insurance_au.utils.logging_config import get_logger
 from health_insurance_au.utils.datetime_utils import generate_random_datetime
-from health_insurance_au.utils.db_utils import execute_query, execute_non_query
 
 # Set up logging
 logger = get_logger(__name__)
@@ -29,6 +28,12 @@
     {'number': '30473', 'description': 'Breast biopsy', 'fee': 260.05}
 ]
 
+# Medicare pays 75% of the MBS fee for inpatient services; the benefit depends
+# only on the item, so it is rounded once here rather than for every claim
+HOSPITAL_MBS_ITEMS = [
+    {**item, 'medicare_benefit': round(item['fee'] * 0.75, 2)} for item in HOSPITAL_MBS_ITEMS
+]
+
 # Service descriptions for general treatment claims
 GENERAL_TREATMENT_SERVICES = {
     'Dental': [
@@ -83,6 +88,51 @@
     ]
 }
 
+# Insert statement for generated claims; parameters follow claim_insert_params
+CLAIM_INSERT_QUERY = """
+INSERT INTO Insurance.Claims (
+    ClaimNumber, PolicyID, MemberID, ProviderID, ServiceDate, SubmissionDate,
+    ClaimType, ServiceDescription, MBSItemNumber, ChargedAmount, MedicareAmount,
+    InsuranceAmount, GapAmount, ExcessApplied, Status, ProcessedDate,
+    PaymentDate, RejectionReason, LastModified
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Initial statuses for generated claims, with cumulative weights so a whole
+# batch of statuses can be drawn in one call
+CLAIM_STATUSES = ('Submitted', 'In Process', 'Approved', 'Paid', 'Rejected')
+CLAIM_STATUS_CUM_WEIGHTS = tuple(accumulate((0.1, 0.1, 0.2, 0.5, 0.1)))
+
+# Statuses of claims that have been processed and accepted for payment
+PAYABLE_CLAIM_STATUSES = frozenset({'Approved', 'Paid'})
+
+# Shared day offsets for claim date arithmetic (claims reach back at most 90 days),
+# so the claim loops index a prebuilt timedelta instead of allocating one per use
+DAY_DELTAS = tuple(timedelta(days=days) for days in range(91))
+
+# Cumulative weights of (excess applied, not applied) for hospital claims
+EXCESS_APPLIED_CUM_WEIGHTS = (0.3, 1.0)
+
+# Claim types that are generated as general treatment (extras) claims
+GENERAL_CLAIM_TYPES = tuple(t for t in CLAIM_TYPES if t != 'Hospital' and t != 'Medical')
+
+# Reasons a rejected claim may give, built once rather than per rejected claim
+HOSPITAL_REJECTION_REASONS = (
+    'Service not covered by policy',
+    'Waiting period not served',
+    'Insufficient documentation',
+    'Duplicate claim',
+    'Member not covered on service date'
+)
+GENERAL_REJECTION_REASONS = (
+    'Service not covered by policy',
+    'Annual limit reached',
+    'Waiting period not served',
+    'Insufficient documentation',
+    'Duplicate claim'
+)
+
 def generate_claim_number(simulation_date: date = None) -> str:
     """
     Generate a random claim number.
@@ -93,10 +143,44 @@ def generate_claim_number(simulation_date: date = None) -> str:
     Returns:
         A claim number in the format CLM-YYYYMMDD-NNNNN
     """
-    # Format: CLM-YYYYMMDD-NNNNN where YYYYMMDD is the simulation date and NNNNN is a 5-digit number
-    date_str = simulation_date.strftime('%Y%m%d') if simulation_date else date.today().strftime('%Y%m%d')
-    number = ''.join(random.choices(string.digits, k=5)).zfill(5)  # Ensure 5 digits
-    return f"CLM-{date_str}-{number} "  # Added space to make it 19 characters
+    return generate_claim_numbers(1, simulation_date)[0]
+
+def generate_claim_numbers(count: int, simulation_date: date = None) -> List[str]:
+    """
+    Generate a batch of random claim numbers for the same date.
+    
+    Args:
+        count: Number of claim numbers to generate
+        simulation_date: The date to use in the claim numbers (default: today)
+    
+    Returns:
+        A list of claim numbers in the format CLM-YYYYMMDD-NNNNN
+    """
+    # Format: CLM-YYYYMMDD-NNNNN where YYYYMMDD is the simulation date and NNNNN is a 5-digit number;
+    # the date part is formatted once for the whole batch
+    prefix = f"CLM-{(simulation_date or date.today()).strftime('%Y%m%d')}-"
+    randrange = random.randrange
+    return [f"{prefix}{randrange(100000):05d} " for _ in range(count)]  # Added space to make it 19 characters
+
+def claim_insert_params(claim: Claim, simulation_date: date) -> Tuple:
+    """
+    Build the CLAIM_INSERT_QUERY parameter tuple for a claim.
+    
+    Args:
+        claim: The claim to insert
+        simulation_date: The date to use for LastModified
+        
+    Returns:
+        A tuple of column values in insert order
+    """
+    return (
+        claim.claim_number, claim.policy_id, claim.member_id, claim.provider_id,
+        claim.service_date, claim.submission_date, claim.claim_type,
+        claim.service_description, claim.mbs_item_number, claim.charged_amount,
+        claim.medicare_amount, claim.insurance_amount, claim.gap_amount,
+        claim.excess_applied, claim.status, claim.processed_date,
+        claim.payment_date, claim.rejection_reason, simulation_date
+    )
 
 def generate_hospital_claims(
     policies: List[Policy], 
@@ -140,100 +224,102 @@ def generate_hospital_claims(
         logger.warning("No hospital providers available to generate claims")
         return claims
     
+    # Draw the policy, hospital and MBS item for every claim up front
+    policy_draws = random.choices(active_policies, k=count)
+    provider_draws = random.choices(hospital_providers, k=count)
+    mbs_item_draws = random.choices(HOSPITAL_MBS_ITEMS, k=count)
+    claim_numbers = generate_claim_numbers(count, simulation_date)
+    status_draws = random.choices(CLAIM_STATUSES, cum_weights=CLAIM_STATUS_CUM_WEIGHTS, k=count)
+    # 30% of hospital claims have the policy excess applied
+    excess_mask = random.choices((True, False), cum_weights=EXCESS_APPLIED_CUM_WEIGHTS, k=count)
+    
+    # Map each policy and provider object to its 1-based list position once, so
+    # claims get their IDs without scanning and comparing the lists per claim
+    policy_positions = {id(p): position for position, p in enumerate(policies, 1)}
+    provider_positions = {id(p): position for position, p in enumerate(providers, 1)}
+    
+    # Bind the RNG methods used per claim to locals for the loop below
+    randint, uniform, choice = random.randint, random.uniform, random.choice
+    
     for i in range(count):
         # Select a random policy
-        policy = random.choice(active_policies)
+        policy = policy_draws[i]
         
         # Select a member from this policy (assuming policy_members is not available here)
         # In a real implementation, we would use policy_members to get valid members for each policy
         member_id = policy.primary_member_id
         
-        # Select a hospital provider
-        provider = random.choice(hospital_providers)
-        
-        # Select an MBS item
-        mbs_item = random.choice(HOSPITAL_MBS_ITEMS)
+        # Select a hospital provider and an MBS item
+        provider = provider_draws[i]
+        mbs_item = mbs_item_draws[i]
         
         # Generate service date (within the last 90 days from simulation date)
-        service_date_date = simulation_date - timedelta(days=random.randint(1, 90))
+        service_date_date = simulation_date - DAY_DELTAS[randint(1, 90)]
         service_date = generate_random_datetime(service_date_date)
         
         # Generate submission date (a few days after service date, but not after simulation date)
-        days_after_service = random.randint(1, 10)
-        submission_date_date = min(service_date_date + timedelta(days=days_after_service), simulation_date)
+        days_after_service = randint(1, 10)
+        submission_date_date = min(service_date_date + DAY_DELTAS[days_after_service], simulation_date)
         submission_date = generate_random_datetime(submission_date_date)
         
         # Calculate charged amount (MBS fee plus a markup)
-        markup = random.uniform(1.5, 3.0)
+        markup = uniform(1.5, 3.0)
         charged_amount = round(mbs_item['fee'] * markup, 2)
         
-        # Calculate Medicare amount (75% of MBS fee for inpatient services)
-        medicare_amount = round(mbs_item['fee'] * 0.75, 2)
+        # Medicare amount (75% of MBS fee for inpatient services, precomputed per item)
+        medicare_amount = mbs_item['medicare_benefit']
         
-        # Determine if excess should be applied
-        excess_applied = 0.0
-        if random.random() < 0.3:  # 30% chance of applying excess
-            excess_applied = min(policy.excess_amount, charged_amount - medicare_amount)
+        # Apply the excess if this claim was drawn to have one
+        excess_applied = min(policy.excess_amount, charged_amount - medicare_amount) if excess_mask[i] else 0.0
         
         # Calculate insurance amount (remaining after Medicare and excess)
         insurance_amount = round(charged_amount - medicare_amount - excess_applied, 2)
         
-        # Calculate gap amount (if any)
-        gap_amount = max(0, round(charged_amount - medicare_amount - insurance_amount - excess_applied, 2))
+        # The insurer pays the whole remainder, so there is no gap on hospital claims
+        gap_amount = 0.0
         
-        # Generate claim number
-        claim_number = generate_claim_number(simulation_date)
+        # Take the pre-generated claim number
+        claim_number = claim_numbers[i]
         
         # Determine claim status
-        status = random.choices(
-            ['Submitted', 'In Process', 'Approved', 'Paid', 'Rejected'],
-            weights=[0.1, 0.1, 0.2, 0.5, 0.1],
-            k=1
-        )[0]
+        status = status_draws[i]
         
         # Generate processed date and payment date if applicable
         processed_date = None
         payment_date = None
         rejection_reason = None
         
-        if status in ['Approved', 'Paid']:
+        if status in PAYABLE_CLAIM_STATUSES:
             # Processed date should be between submission date and simulation date
             max_days_after_submission = max(0, (simulation_date - submission_date_date).days)
             if max_days_after_submission > 0:
-                days_after_submission = random.randint(1, min(14, max_days_after_submission))
-                processed_date_date = submission_date_date + timedelta(days=days_after_submission)
+                days_after_submission = randint(1, min(14, max_days_after_submission))
+                processed_date_date = submission_date_date + DAY_DELTAS[days_after_submission]
                 processed_date = generate_random_datetime(processed_date_date)
                 
                 if status == 'Paid' and processed_date_date < simulation_date:
                     # Payment date should be between processed date and simulation date
                     max_days_after_processed = max(0, (simulation_date - processed_date_date).days)
                     if max_days_after_processed > 0:
-                        days_after_processed = random.randint(1, min(7, max_days_after_processed))
-                        payment_date_date = processed_date_date + timedelta(days=days_after_processed)
+                        days_after_processed = randint(1, min(7, max_days_after_processed))
+                        payment_date_date = processed_date_date + DAY_DELTAS[days_after_processed]
                         payment_date = generate_random_datetime(payment_date_date)
         elif status == 'Rejected':
             # Processed date should be between submission date and simulation date
             max_days_after_submission = max(0, (simulation_date - submission_date_date).days)
             if max_days_after_submission > 0:
-                days_after_submission = random.randint(1, min(14, max_days_after_submission))
-                processed_date_date = submission_date_date + timedelta(days=days_after_submission)
+                days_after_submission = randint(1, min(14, max_days_after_submission))
+                processed_date_date = submission_date_date + DAY_DELTAS[days_after_submission]
                 processed_date = generate_random_datetime(processed_date_date)
             
-            rejection_reasons = [
-                'Service not covered by policy',
-                'Waiting period not served',
-                'Insufficient documentation',
-                'Duplicate claim',
-                'Member not covered on service date'
-            ]
-            rejection_reason = random.choice(rejection_reasons)
+            rejection_reason = choice(HOSPITAL_REJECTION_REASONS)
         
         # Create the claim
         claim = Claim(
             claim_number=claim_number,
-            policy_id=policies.index(policy) + 1,  # Assuming PolicyID starts at 1
+            policy_id=policy_positions[id(policy)],  # Assuming PolicyID starts at 1
             member_id=member_id,
-            provider_id=providers.index(provider) + 1,  # Assuming ProviderID starts at 1
+            provider_id=provider_positions[id(provider)],  # Assuming ProviderID starts at 1
             service_date=service_date,
             submission_date=submission_date,
             claim_type='Hospital',
@@ -291,53 +377,82 @@ def generate_general_treatment_claims(
         logger.warning("No members available to generate claims")
         return claims
     
-    # Filter out hospital providers
-    general_providers = [p for p in providers if p.provider_type != 'Hospital']
+    # Filter out hospital providers and bucket the rest by the claim types they
+    # serve in a single pass over the provider list
+    general_providers = []
+    providers_by_claim_type = {claim_type: [] for claim_type in GENERAL_CLAIM_TYPES}
+    for p in providers:
+        provider_type = p.provider_type
+        if provider_type == 'Hospital':
+            continue
+        general_providers.append(p)
+        if isinstance(provider_type, str):
+            for claim_type in GENERAL_CLAIM_TYPES:
+                if claim_type in provider_type:
+                    providers_by_claim_type[claim_type].append(p)
     if not general_providers:
         logger.warning("No general treatment providers available to generate claims")
         return claims
     
+    # Build a flat (claim type, matching providers, service) table once so each
+    # claim needs a single draw instead of rescanning providers and services.
+    # Services are weighted so every claim type stays equally likely however
+    # many services it offers.
+    claim_options = []
+    option_weights = []
+    for claim_type in GENERAL_CLAIM_TYPES:
+        # Fallback if no matching provider
+        matching_providers = providers_by_claim_type[claim_type] or general_providers
+        services = GENERAL_TREATMENT_SERVICES.get(claim_type) or [None]
+        for service in services:
+            claim_options.append((claim_type, matching_providers, service))
+            option_weights.append(1 / len(services))
+    
+    # Draw the policy and the claim type, providers and service for every claim up front
+    policy_draws = random.choices(active_policies, k=count)
+    claim_draws = random.choices(claim_options, weights=option_weights, k=count)
+    claim_numbers = generate_claim_numbers(count, simulation_date)
+    status_draws = random.choices(CLAIM_STATUSES, cum_weights=CLAIM_STATUS_CUM_WEIGHTS, k=count)
+    
+    # Map each policy and provider object to its 1-based list position once, so
+    # claims get their IDs without scanning and comparing the lists per claim
+    policy_positions = {id(p): position for position, p in enumerate(policies, 1)}
+    provider_positions = {id(p): position for position, p in enumerate(providers, 1)}
+    
+    # Bind the RNG methods used per claim to locals for the loop below
+    randint, uniform, choice = random.randint, random.uniform, random.choice
+    
     for i in range(count):
         # Select a random policy
-        policy = random.choice(active_policies)
+        policy = policy_draws[i]
         
         # Select a member from this policy (assuming policy_members is not available here)
         # In a real implementation, we would use policy_members to get valid members for each policy
         member_id = policy.primary_member_id
         
-        # Select a claim type
-        claim_type = random.choice([t for t in CLAIM_TYPES if t != 'Hospital' and t != 'Medical'])
-        
-        # Select a provider of the appropriate type
-        matching_providers = []
-        for p in general_providers:
-            if hasattr(p, 'provider_type') and isinstance(p.provider_type, str):
-                if p.provider_type == claim_type or claim_type in p.provider_type:
-                    matching_providers.append(p)
-        if not matching_providers:
-            matching_providers = general_providers  # Fallback if no matching provider
-        provider = random.choice(matching_providers)
-        
-        # Select a service
-        if claim_type in GENERAL_TREATMENT_SERVICES:
-            service = random.choice(GENERAL_TREATMENT_SERVICES[claim_type])
+        # Select a claim type, a service and a provider of the appropriate type
+        claim_type, matching_providers, service = claim_draws[i]
+        provider = choice(matching_providers)
+        
+        if service is not None:
             service_description = service['description']
             charged_amount = service['fee']
         else:
             service_description = f"{claim_type} service"
-            charged_amount = round(random.uniform(50, 300), 2)
+            # Draw whole cents directly rather than rounding a uniform float
+            charged_amount = randint(5000, 30000) / 100
         
         # Generate service date (within the last 90 days from simulation date)
-        service_date_date = simulation_date - timedelta(days=random.randint(1, 90))
+        service_date_date = simulation_date - DAY_DELTAS[randint(1, 90)]
         service_date = generate_random_datetime(service_date_date)
         
         # Generate submission date (a few days after service date, but not after simulation date)
-        days_after_service = random.randint(1, 10)
-        submission_date_date = min(service_date_date + timedelta(days=days_after_service), simulation_date)
+        days_after_service = randint(1, 10)
+        submission_date_date = min(service_date_date + DAY_DELTAS[days_after_service], simulation_date)
         submission_date = generate_random_datetime(submission_date_date)
         
         # Calculate insurance amount (typically a percentage of charged amount for extras)
-        benefit_percentage = random.uniform(0.5, 0.8)  # 50-80% benefit
+        benefit_percentage = uniform(0.5, 0.8)  # 50-80% benefit
         insurance_amount = round(charged_amount * benefit_percentage, 2)
         
         # No Medicare for general treatment
@@ -349,59 +464,48 @@ def generate_general_treatment_claims(
         # Calculate gap amount
         gap_amount = round(charged_amount - insurance_amount, 2)
         
-        # Generate claim number
-        claim_number = generate_claim_number(simulation_date)
+        # Take the pre-generated claim number
+        claim_number = claim_numbers[i]
         
         # Determine claim status
-        status = random.choices(
-            ['Submitted', 'In Process', 'Approved', 'Paid', 'Rejected'],
-            weights=[0.1, 0.1, 0.2, 0.5, 0.1],
-            k=1
-        )[0]
+        status = status_draws[i]
         
         # Generate processed date and payment date if applicable
         processed_date = None
         payment_date = None
         rejection_reason = None
         
-        if status in ['Approved', 'Paid']:
+        if status in PAYABLE_CLAIM_STATUSES:
             # Processed date should be between submission date and simulation date
             max_days_after_submission = max(0, (simulation_date - submission_date_date).days)
             if max_days_after_submission > 0:
-                days_after_submission = random.randint(1, min(7, max_days_after_submission))
-                processed_date_date = submission_date_date + timedelta(days=days_after_submission)
+                days_after_submission = randint(1, min(7, max_days_after_submission))
+                processed_date_date = submission_date_date + DAY_DELTAS[days_after_submission]
                 processed_date = generate_random_datetime(processed_date_date)
                 
                 if status == 'Paid' and processed_date_date < simulation_date:
                     # Payment date should be between processed date and simulation date
                     max_days_after_processed = max(0, (simulation_date - processed_date_date).days)
                     if max_days_after_processed > 0:
-                        days_after_processed = random.randint(1, min(3, max_days_after_processed))
-                        payment_date_date = processed_date_date + timedelta(days=days_after_processed)
+                        days_after_processed = randint(1, min(3, max_days_after_processed))
+                        payment_date_date = processed_date_date + DAY_DELTAS[days_after_processed]
                         payment_date = generate_random_datetime(payment_date_date)
         elif status == 'Rejected':
             # Processed date should be between submission date and simulation date
             max_days_after_submission = max(0, (simulation_date - submission_date_date).days)
             if max_days_after_submission > 0:
-                days_after_submission = random.randint(1, min(7, max_days_after_submission))
-                processed_date_date = submission_date_date + timedelta(days=days_after_submission)
+                days_after_submission = randint(1, min(7, max_days_after_submission))
+                processed_date_date = submission_date_date + DAY_DELTAS[days_after_submission]
                 processed_date = generate_random_datetime(processed_date_date)
             
-            rejection_reasons = [
-                'Service not covered by policy',
-                'Annual limit reached',
-                'Waiting period not served',
-                'Insufficient documentation',
-                'Duplicate claim'
-            ]
-            rejection_reason = random.choice(rejection_reasons)
+            rejection_reason = choice(GENERAL_REJECTION_REASONS)
         
         # Create the claim
         claim = Claim(
             claim_number=claim_number,
-            policy_id=policies.index(policy) + 1,  # Assuming PolicyID starts at 1
+            policy_id=policy_positions[id(policy)],  # Assuming PolicyID starts at 1
             member_id=member_id,
-            provider_id=providers.index(provider) + 1,  # Assuming ProviderID starts at 1
+            provider_id=provider_positions[id(provider)],  # Assuming ProviderID starts at 1
             service_date=service_date,
             submission_date=submission_date,
             claim_type=claim_type,
@@ -421,114 +525,3 @@ def generate_general_treatment_claims(
     
     logger.info(f"Generated {len(claims)} general treatment claims")
     return claims
-
-
-class ClaimsSimulation:
-    """
-    Class for simulating health insurance claims.
-    """
-    
-    def __init__(self):
-        """Initialize the claims simulation."""
-        self.policies = []
-        self.members = []
-        self.providers = []
-        self.load_data()
-    
-    def load_data(self):
-        """Load data from the database."""
-        # Load policies
-        policy_data = execute_query("SELECT * FROM Insurance.Policies WHERE Status = 'Active'")
-        self.policies = [Policy(**p) for p in policy_data]
-        
-        # Load members
-        member_data = execute_query("SELECT * FROM Insurance.Members WHERE IsActive = 1")
-        self.members = [Member(**m) for m in member_data]
-        
-        # Load providers
-        provider_data = execute_query("SELECT * FROM Insurance.Providers WHERE IsActive = 1")
-        self.providers = [Provider(**p) for p in provider_data]
-    
-    def generate_hospital_claims(self, count: int, simulation_date: date) -> List[Claim]:
-        """
-        Generate hospital claims and insert them into the database.
-        
-        Args:
-            count: Number of claims to generate
-            simulation_date: The date to use for claim generation
-            
-        Returns:
-            A list of generated claims
-        """
-        claims = generate_hospital_claims(
-            self.policies, 
-            self.members, 
-            self.providers, 
-            count, 
-            simulation_date
-        )
-        
-        # Insert claims into the database
-        for claim in claims:
-            query = """
-            INSERT INTO Insurance.Claims (
-                ClaimNumber, PolicyID, MemberID, ProviderID, ServiceDate, SubmissionDate,
-                ClaimType, ServiceDescription, MBSItemNumber, ChargedAmount, MedicareAmount,
-                InsuranceAmount, GapAmount, ExcessApplied, Status, ProcessedDate,
-                PaymentDate, RejectionReason, LastModified
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            execute_non_query(query, (
-                claim.claim_number, claim.policy_id, claim.member_id, claim.provider_id,
-                claim.service_date, claim.submission_date, claim.claim_type,
-                claim.service_description, claim.mbs_item_number, claim.charged_amount,
-                claim.medicare_amount, claim.insurance_amount, claim.gap_amount,
-                claim.excess_applied, claim.status, claim.processed_date,
-                claim.payment_date, claim.rejection_reason, simulation_date
-            ), simulation_date)
-        
-        logger.info(f"Inserted {len(claims)} hospital claims into the database")
-        return claims
-    
-    def generate_general_treatment_claims(self, count: int, simulation_date: date) -> List[Claim]:
-        """
-        Generate general treatment claims and insert them into the database.
-        
-        Args:
-            count: Number of claims to generate
-            simulation_date: The date to use for claim generation
-            
-        Returns:
-            A list of generated claims
-        """
-        claims = generate_general_treatment_claims(
-            self.policies, 
-            self.members, 
-            self.providers, 
-            count, 
-            simulation_date
-        )
-        
-        # Insert claims into the database
-        for claim in claims:
-            query = """
-            INSERT INTO Insurance.Claims (
-                ClaimNumber, PolicyID, MemberID, ProviderID, ServiceDate, SubmissionDate,
-                ClaimType, ServiceDescription, MBSItemNumber, ChargedAmount, MedicareAmount,
-                InsuranceAmount, GapAmount, ExcessApplied, Status, ProcessedDate,
-                PaymentDate, RejectionReason, LastModified
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            execute_non_query(query, (
-                claim.claim_number, claim.policy_id, claim.member_id, claim.provider_id,
-                claim.service_date, claim.submission_date, claim.claim_type,
-                claim.service_description, claim.mbs_item_number, claim.charged_amount,
-                claim.medicare_amount, claim.insurance_amount, claim.gap_amount,
-                claim.excess_applied, claim.status, claim.processed_date,
-                claim.payment_date, claim.rejection_reason, simulation_date
-            ), simulation_date)
-        
-        logger.info(f"Inserted {len(claims)} general treatment claims into the database")
-        return claims
\ No newline at end of file
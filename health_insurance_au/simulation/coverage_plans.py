@@ -114,6 +114,37 @@
     }
 ]
 
+# Included, restricted and excluded hospital services for each tier
+TIER_SERVICES = {
+    'Basic': (
+        ('Accidents', 'Ambulance'),
+        ('Rehabilitation', 'Psychiatric services'),
+        ('Heart and vascular system', 'Joint replacements', 'Pregnancy and birth')
+    ),
+    'Bronze': (
+        ('Accidents', 'Ambulance', 'Dental surgery', 'Hernia and appendix'),
+        ('Rehabilitation', 'Psychiatric services'),
+        ('Heart and vascular system', 'Joint replacements', 'Pregnancy and birth')
+    ),
+    'Silver': (
+        ('Accidents', 'Ambulance', 'Dental surgery', 'Hernia and appendix', 'Heart and vascular system', 'Lung and chest'),
+        ('Rehabilitation', 'Psychiatric services', 'Pregnancy and birth'),
+        ('Joint replacements',)
+    ),
+    'Gold': (
+        ('Accidents', 'Ambulance', 'Dental surgery', 'Hernia and appendix', 'Heart and vascular system', 'Lung and chest', 'Joint replacements', 'Pregnancy and birth', 'Rehabilitation', 'Psychiatric services'),
+        (),
+        ()
+    )
+}
+
+# Excess options by hospital tier (lower tiers only offer the higher excesses)
+TIER_EXCESS_OPTIONS = {
+    'Basic': (500, 750),
+    'Bronze': (500, 750)
+}
+DEFAULT_EXCESS_OPTIONS = (0, 250, 500, 750)
+
 def generate_coverage_plans(count: int = 5, simulation_date: date = None) -> List[CoveragePlan]:
     """
     Generate a list of coverage plans.
@@ -144,40 +175,20 @@ def generate_coverage_plans(count: int = 5, simulation_date: date = None) -> Lis
         monthly_premium = round(template['base_premium'] * variation, 2)
         
         # Generate excess options
-        if template['tier'] in ['Basic', 'Bronze']:
-            excess_options = [500, 750]
-        else:
-            excess_options = [0, 250, 500, 750]
+        excess_options = list(TIER_EXCESS_OPTIONS.get(template['tier'], DEFAULT_EXCESS_OPTIONS))
         
         # Generate waiting periods
         waiting_periods = DEFAULT_WAITING_PERIODS.copy()
         
-        # Generate coverage details
+        # Generate coverage details, with services based on tier (anything else is Gold)
+        included_services, restricted_services, excluded_services = TIER_SERVICES.get(template['tier'], TIER_SERVICES['Gold'])
         coverage_details = {
             'description': f"{template['name']} provides cover for {template['tier']} tier hospital services",
-            'included_services': [],
-            'restricted_services': [],
-            'excluded_services': []
+            'included_services': list(included_services),
+            'restricted_services': list(restricted_services),
+            'excluded_services': list(excluded_services)
         }
         
-        # Add services based on tier
-        if template['tier'] == 'Basic':
-            coverage_details['included_services'] = ['Accidents', 'Ambulance']
-            coverage_details['restricted_services'] = ['Rehabilitation', 'Psychiatric services']
-            coverage_details['excluded_services'] = ['Heart and vascular system', 'Joint replacements', 'Pregnancy and birth']
-        elif template['tier'] == 'Bronze':
-            coverage_details['included_services'] = ['Accidents', 'Ambulance', 'Dental surgery', 'Hernia and appendix']
-            coverage_details['restricted_services'] = ['Rehabilitation', 'Psychiatric services']
-            coverage_details['excluded_services'] = ['Heart and vascular system', 'Joint replacements', 'Pregnancy and birth']
-        elif template['tier'] == 'Silver':
-            coverage_details['included_services'] = ['Accidents', 'Ambulance', 'Dental surgery', 'Hernia and appendix', 'Heart and vascular system', 'Lung and chest']
-            coverage_details['restricted_services'] = ['Rehabilitation', 'Psychiatric services', 'Pregnancy and birth']
-            coverage_details['excluded_services'] = ['Joint replacements']
-        else:  # Gold
-            coverage_details['included_services'] = ['Accidents', 'Ambulance', 'Dental surgery', 'Hernia and appendix', 'Heart and vascular system', 'Lung and chest', 'Joint replacements', 'Pregnancy and birth', 'Rehabilitation', 'Psychiatric services']
-            coverage_details['restricted_services'] = []
-            coverage_details['excluded_services'] = []
-        
         # Create the plan with effective date relative to simulation date
         plan = CoveragePlan(
             plan_code=f"H{i+1:03d}",
@@ -232,10 +243,7 @@ def generate_coverage_plans(count: int = 5, simulation_date: date = None) -> Lis
         monthly_premium = round(template['base_premium'] * variation, 2)
         
         # Generate excess options
-        if template['hospital_tier'] in ['Basic', 'Bronze']:
-            excess_options = [500, 750]
-        else:
-            excess_options = [0, 250, 500, 750]
+        excess_options = list(TIER_EXCESS_OPTIONS.get(template['hospital_tier'], DEFAULT_EXCESS_OPTIONS))
         
         # Generate waiting periods (combined from both)
         waiting_periods = DEFAULT_WAITING_PERIODS.copy()
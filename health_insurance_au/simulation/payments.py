@@ -2,7 +2,7 @@
 Premium payments generator for the Health Insurance AU simulation.
 """
 import random
-import string
+from itertools import accumulate
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Optional
 
@@ -12,6 +12,35 @@
 # Set up logging
 logger = get_logger(__name__)
 
+# Length of the period covered by one premium payment, by premium frequency
+# (anything other than monthly or quarterly is billed annually)
+PREMIUM_PERIODS = {
+    'Monthly': timedelta(days=30),
+    'Quarterly': timedelta(days=90),
+}
+ANNUAL_PREMIUM_PERIOD = timedelta(days=365)
+
+# Payment outcomes (most are successful), with cumulative weights for batch draws
+PAYMENT_STATUSES = ('Successful', 'Failed', 'Pending')
+PAYMENT_STATUS_CUM_WEIGHTS = tuple(accumulate((0.95, 0.03, 0.02)))
+
+def generate_payment_references(count: int, payment_date: date = None) -> List[str]:
+    """
+    Generate a batch of random payment references for the same date.
+    
+    Args:
+        count: Number of payment references to generate
+        payment_date: The date to use in the references (default: today)
+        
+    Returns:
+        A list of payment reference strings in the format PMT-YYYYMMDD-NNNNN
+    """
+    # Format: PMT-YYYYMMDD-NNNNN where YYYYMMDD is the payment date and NNNNN is a 5-digit number;
+    # the date part is formatted once for the whole batch
+    prefix = f"PMT-{(payment_date or date.today()).strftime('%Y%m%d')}-"
+    randrange = random.randrange
+    return [f"{prefix}{randrange(100000):05d} " for _ in range(count)]  # Added space to make it 19 characters
+
 def generate_payment_reference(payment_date: date = None) -> str:
     """
     Generate a random payment reference.
@@ -22,10 +51,7 @@ def generate_payment_reference(payment_date: date = None) -> str:
     Returns:
         A payment reference string in the format PMT-YYYYMMDD-NNNNN
     """
-    # Format: PMT-YYYYMMDD-NNNNN where YYYYMMDD is the payment date and NNNNN is a 5-digit number
-    date_str = payment_date.strftime('%Y%m%d') if payment_date else date.today().strftime('%Y%m%d')
-    number = ''.join(random.choices(string.digits, k=5)).zfill(5)  # Ensure 5 digits
-    return f"PMT-{date_str}-{number} "  # Added space to make it 19 characters
+    return generate_payment_references(1, payment_date)[0]
 
 def generate_premium_payments(policies: List[Policy], simulation_date: date) -> List[PremiumPayment]:
     """
@@ -40,46 +66,40 @@ def generate_premium_payments(policies: List[Policy], simulation_date: date) ->
     """
     payments = []
     
-    # Filter for active policies with payments due on or before the simulation date
-    due_policies = [p for p in policies if p.status == 'Active' and p.next_premium_due_date and p.next_premium_due_date <= simulation_date]
+    # Filter for active policies with payments due on or before the simulation date,
+    # keeping each policy's position as the fallback ID
+    due_policies = [
+        (index, p) for index, p in enumerate(policies, 1)
+        if p.status == 'Active' and p.next_premium_due_date and p.next_premium_due_date <= simulation_date
+    ]
     
     logger.info(f"Found {len(due_policies)} policies with payments due on or before {simulation_date}")
     
-    for policy in due_policies:
+    if not due_policies:
+        return payments
+    
+    # Draw every payment's status and reference up front, using the simulation date
+    status_draws = random.choices(PAYMENT_STATUSES, cum_weights=PAYMENT_STATUS_CUM_WEIGHTS, k=len(due_policies))
+    payment_references = generate_payment_references(len(due_policies), simulation_date)
+    
+    for (index, policy), payment_status, payment_reference in zip(due_policies, status_draws, payment_references):
         # Determine payment amount
         payment_amount = policy.current_premium
         
         # Determine payment method (use the one from the policy)
         payment_method = policy.payment_method
         
-        # Generate payment reference using the simulation date
-        payment_reference = generate_payment_reference(simulation_date)
-        
-        # Determine payment status (most are successful)
-        payment_status = random.choices(
-            ['Successful', 'Failed', 'Pending'],
-            weights=[0.95, 0.03, 0.02],
-            k=1
-        )[0]
-        
         # Determine period start and end dates
         # The period start date should be the current next_premium_due_date (which is the date being paid)
         period_start_date = policy.next_premium_due_date
         
         # Calculate the next due date based on the premium frequency
-        if policy.premium_frequency == 'Monthly':
-            period_end_date = period_start_date + timedelta(days=30)
-            next_due_date = period_end_date
-        elif policy.premium_frequency == 'Quarterly':
-            period_end_date = period_start_date + timedelta(days=90)
-            next_due_date = period_end_date
-        else:  # Annually
-            period_end_date = period_start_date + timedelta(days=365)
-            next_due_date = period_end_date
+        period_end_date = period_start_date + PREMIUM_PERIODS.get(policy.premium_frequency, ANNUAL_PREMIUM_PERIOD)
+        next_due_date = period_end_date
         
         # Create the payment
         # Use the actual policy_id from the database if available, otherwise fall back to index
-        actual_policy_id = getattr(policy, 'policy_id', policies.index(policy) + 1)
+        actual_policy_id = getattr(policy, 'policy_id', index)
         payment = PremiumPayment(
             policy_id=actual_policy_id,
             payment_date=simulation_date,
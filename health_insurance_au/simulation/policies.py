@@ -2,24 +2,41 @@
 Policy generator for the Health Insurance AU simulation.
 """
 import random
-import string
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 
+from health_insurance_au.config import STATE_CODES, PHI_REBATE_UNDER_65
 from health_insurance_au.models.models import Policy, PolicyMember, Member, CoveragePlan
+from health_insurance_au.simulation.payments import PREMIUM_PERIODS, ANNUAL_PREMIUM_PERIOD
 from health_insurance_au.utils.logging_config import get_logger
 from health_insurance_au.utils.db_utils import execute_query
 
 # Set up logging
 logger = get_logger(__name__)
 
+# Premium multiplier by coverage type (unknown types are charged as Single)
+COVERAGE_TYPE_MULTIPLIERS = {
+    'Single': 1.0,
+    'Couple': 2.0,
+    'Family': 2.5,
+    'Single Parent': 1.5
+}
+
+# Plan types whose policies can carry an excess
+EXCESS_PLAN_TYPES = frozenset({'Hospital', 'Combined'})
+
+# Premium discount by excess amount for hospital and combined plans
+EXCESS_DISCOUNTS = {
+    250: 0.05,
+    500: 0.10,
+    750: 0.15
+}
+
 def generate_policy_number() -> str:
     """Generate a random policy number."""
     # Format: POL-XX-NNNNNN where XX is a state code and NNNNNN is a 6-digit number
-    state_codes = ['NSW', 'VIC', 'QLD', 'WA', 'SA', 'TAS', 'ACT', 'NT']
-    state_code = random.choice(state_codes)
-    number = ''.join(random.choices(string.digits, k=6))
-    return f"POL-{state_code}-{number}"
+    state_code = random.choice(STATE_CODES)
+    return f"POL-{state_code}-{random.randrange(1000000):06d}"
 
 def calculate_premium(plan: CoveragePlan, coverage_type: str, excess_amount: float) -> float:
     """
@@ -36,26 +53,12 @@ def calculate_premium(plan: CoveragePlan, coverage_type: str, excess_amount: flo
     base_premium = plan.monthly_premium
     
     # Apply multiplier based on coverage type
-    if coverage_type == 'Single':
-        multiplier = 1.0
-    elif coverage_type == 'Couple':
-        multiplier = 2.0
-    elif coverage_type == 'Family':
-        multiplier = 2.5
-    elif coverage_type == 'Single Parent':
-        multiplier = 1.5
-    else:
-        multiplier = 1.0
+    multiplier = COVERAGE_TYPE_MULTIPLIERS.get(coverage_type, 1.0)
     
     # Apply discount for higher excess (only for hospital and combined plans)
     excess_discount = 0.0
-    if plan.plan_type in ['Hospital', 'Combined'] and excess_amount > 0:
-        if excess_amount == 250:
-            excess_discount = 0.05
-        elif excess_amount == 500:
-            excess_discount = 0.10
-        elif excess_amount == 750:
-            excess_discount = 0.15
+    if plan.plan_type in EXCESS_PLAN_TYPES and excess_amount > 0:
+        excess_discount = EXCESS_DISCOUNTS.get(excess_amount, 0.0)
     
     # Calculate final premium
     premium = base_premium * multiplier * (1 - excess_discount)
@@ -104,6 +107,28 @@ def generate_policies(members: List[Member], plans: List[CoveragePlan], count: i
     
     logger.info(f"Starting with PolicyID: {next_policy_id}")
     
+    # Draw the weighted categorical attributes for every policy in one call each
+    # rather than three separate random.choices calls per policy
+    coverage_types = random.choices(
+        ['Single', 'Couple', 'Family', 'Single Parent'],
+        weights=[0.4, 0.3, 0.2, 0.1],
+        k=count
+    )
+    payment_frequencies = random.choices(
+        ['Monthly', 'Quarterly', 'Annually'],
+        weights=[0.7, 0.2, 0.1],
+        k=count
+    )
+    payment_methods = random.choices(
+        ['Direct Debit', 'Credit Card', 'BPAY', 'PayPal'],
+        weights=[0.6, 0.3, 0.08, 0.02],
+        k=count
+    )
+    
+    # Birth year of the oldest member, used to skip the child candidate scan for
+    # primary members that no other member can satisfy the age gap for
+    oldest_birth_year = min(m.date_of_birth.year for m in members)
+    
     for i in range(count):
         # Find a member who doesn't already have a policy
         available_members = [m for idx, m in enumerate(members) if idx not in members_with_policies]
@@ -119,31 +144,21 @@ def generate_policies(members: List[Member], plans: List[CoveragePlan], count: i
         plan = random.choice(plans)
         
         # Determine coverage type and add additional members if needed
-        coverage_type = random.choices(
-            ['Single', 'Couple', 'Family', 'Single Parent'],
-            weights=[0.4, 0.3, 0.2, 0.1],
-            k=1
-        )[0]
+        coverage_type = coverage_types[i]
         
         # Generate policy number
         policy_number = generate_policy_number()
         
         # Determine excess amount
         excess_amount = 0.0
-        if plan.plan_type in ['Hospital', 'Combined'] and plan.excess_options:
+        if plan.plan_type in EXCESS_PLAN_TYPES and plan.excess_options:
             excess_amount = random.choice(plan.excess_options)
         
         # Calculate premium
         premium = calculate_premium(plan, coverage_type, excess_amount)
         
-        # Apply rebate (simplified)
-        rebate_percentage = 0.0
-        if primary_member.phi_rebate_tier == 'Base':
-            rebate_percentage = 24.608  # Base tier for under 65
-        elif primary_member.phi_rebate_tier == 'Tier1':
-            rebate_percentage = 16.405
-        elif primary_member.phi_rebate_tier == 'Tier2':
-            rebate_percentage = 8.202
+        # Apply rebate (simplified, using the under-65 rate for the member's tier)
+        rebate_percentage = PHI_REBATE_UNDER_65.get(primary_member.phi_rebate_tier, 0.0)
         
         # Apply LHC loading
         lhc_loading_percentage = primary_member.lhc_loading_percentage
@@ -151,29 +166,14 @@ def generate_policies(members: List[Member], plans: List[CoveragePlan], count: i
         # Generate start date (between 1 and 3 years ago, relative to simulation date)
         start_date = simulation_date - timedelta(days=random.randint(30, 1095))
         
-        # Determine payment frequency
-        payment_frequency = random.choices(
-            ['Monthly', 'Quarterly', 'Annually'],
-            weights=[0.7, 0.2, 0.1],
-            k=1
-        )[0]
-        
-        # Determine payment method
-        payment_method = random.choices(
-            ['Direct Debit', 'Credit Card', 'BPAY', 'PayPal'],
-            weights=[0.6, 0.3, 0.08, 0.02],
-            k=1
-        )[0]
+        # Determine payment frequency and method
+        payment_frequency = payment_frequencies[i]
+        payment_method = payment_methods[i]
         
         # Generate last premium paid date and next due date (relative to simulation date)
         last_paid_date = simulation_date - timedelta(days=random.randint(0, 30))
         
-        if payment_frequency == 'Monthly':
-            next_due_date = last_paid_date + timedelta(days=30)
-        elif payment_frequency == 'Quarterly':
-            next_due_date = last_paid_date + timedelta(days=90)
-        else:  # Annually
-            next_due_date = last_paid_date + timedelta(days=365)
+        next_due_date = last_paid_date + PREMIUM_PERIODS.get(payment_frequency, ANNUAL_PREMIUM_PERIOD)
         
         # Create the policy
         policy = Policy(
@@ -241,7 +241,7 @@ def generate_policies(members: List[Member], plans: List[CoveragePlan], count: i
                 else:
                     logger.warning(f"Skipping duplicate policy-member relationship: Policy {current_policy_id}, Member {partner_db_id}")
         
-        if coverage_type in ['Family', 'Single Parent']:
+        if coverage_type in ['Family', 'Single Parent'] and primary_member.date_of_birth.year - oldest_birth_year > 18:
             # Try to find 1-3 children (much younger)
             child_count = random.randint(1, 3)
             child_candidates = [
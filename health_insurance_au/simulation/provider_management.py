@@ -6,10 +6,10 @@
 from typing import List, Dict, Any, Optional
 
 from health_insurance_au.models.models import Provider
-from health_insurance_au.simulation.providers import generate_providers, CITIES, STATES
+from health_insurance_au.simulation.providers import generate_providers, CITIES, STATE_CODES
 from health_insurance_au.utils.logging_config import get_logger
 from health_insurance_au.utils.datetime_utils import generate_random_datetime
-from health_insurance_au.utils.db_utils import execute_query, execute_non_query
+from health_insurance_au.utils.db_utils import execute_query, execute_non_query, execute_many
 
 # Set up logging
 logger = get_logger(__name__)
@@ -27,40 +27,29 @@ def end_provider_agreements(percentage: float = 5.0, simulation_date: Optional[d
     if simulation_date is None:
         simulation_date = date.today()
     
-    # Get active preferred providers with no end date from database
-    providers_data = execute_query("""
-        SELECT * FROM Insurance.Providers 
+    # Pick random providers and give each a random end date 30-90 days after the
+    # simulation date in a single server-side UPDATE, rather than fetching every
+    # provider row and updating the chosen ones one statement at a time. TOP PERCENT
+    # sizes the sample on the server (rounding up, so at least one provider is
+    # chosen whenever any qualify) without a separate COUNT(*) round trip
+    query = """
+    WITH ChosenProviders AS (
+        SELECT TOP (?) PERCENT AgreementEndDate, LastModified
+        FROM Insurance.Providers
         WHERE IsActive = 1 AND IsPreferredProvider = 1 
         AND AgreementStartDate IS NOT NULL AND AgreementEndDate IS NULL
-    """)
+        ORDER BY NEWID()
+    )
+    UPDATE ChosenProviders
+    SET AgreementEndDate = DATEADD(DAY, 30 + (CHECKSUM(NEWID()) & 0x7fffffff) % 61, CAST(? AS DATE)),
+        LastModified = ?
+    """
+    updated_count = execute_non_query(query, (percentage, simulation_date, simulation_date), simulation_date)
     
-    if not providers_data:
+    if updated_count <= 0:
         logger.warning("No active preferred providers available to end agreements")
         return
     
-    # Calculate number of providers to update
-    count = max(1, int(len(providers_data) * percentage / 100))
-    
-    # Select random providers to update
-    providers_to_update = random.sample(providers_data, min(count, len(providers_data)))
-    
-    updated_count = 0
-    for provider in providers_to_update:
-        # Set end date to a random date in the future relative to simulation date
-        end_date = simulation_date + timedelta(days=random.randint(30, 90))
-        
-        # Update the database
-        try:
-            query = """
-            UPDATE Insurance.Providers
-            SET AgreementEndDate = ?, LastModified = ?
-            WHERE ProviderNumber = ?
-            """
-            execute_non_query(query, (end_date, simulation_date, provider['ProviderNumber']), simulation_date)
-            updated_count += 1
-        except Exception as e:
-            logger.error(f"Error updating provider agreement {provider['ProviderNumber']}: {e}")
-    
     logger.info(f"Ended agreements for {updated_count} providers")
 
 def update_provider_details(percentage: float = 10.0, simulation_date: Optional[date] = None):
@@ -76,20 +65,22 @@ def update_provider_details(percentage: float = 10.0, simulation_date: Optional[
     if simulation_date is None:
         simulation_date = date.today()
     
-    # Get providers from database
-    providers_data = execute_query("SELECT * FROM Insurance.Providers WHERE IsActive = 1")
-    
-    if not providers_data:
+    # Select random providers to update on the server, fetching only the sampled
+    # rows and the columns the update needs rather than every active provider;
+    # TOP PERCENT sizes the sample without a separate COUNT(*) round trip
+    providers_to_update = execute_query("""
+        SELECT TOP (?) PERCENT ProviderNumber, ProviderName, Phone, Email, AddressLine1, City, State,
+               PostCode, IsPreferredProvider, AgreementStartDate, AgreementEndDate
+        FROM Insurance.Providers
+        WHERE IsActive = 1
+        ORDER BY NEWID()
+    """, (percentage,))
+    
+    if not providers_to_update:
         logger.warning("No providers available to update")
         return
     
-    # Calculate number of providers to update
-    count = max(1, int(len(providers_data) * percentage / 100))
-    
-    # Select random providers to update
-    providers_to_update = random.sample(providers_data, min(count, len(providers_data)))
-    
-    updated_count = 0
+    update_params = []
     for provider in providers_to_update:
         # Randomly select what to update
         update_type = random.choice(['contact', 'address', 'both'])
@@ -118,7 +109,7 @@ def update_provider_details(percentage: float = 10.0, simulation_date: Optional[
             # Update city and state (25% chance)
             if random.random() < 0.25:
                 city = random.choice(CITIES)
-                state = random.choice(list(STATES.keys()))
+                state = random.choice(STATE_CODES)
                 post_code = f"{random.randint(2000, 7000)}"
         
         # Small chance (5%) of changing preferred provider status
@@ -135,29 +126,27 @@ def update_provider_details(percentage: float = 10.0, simulation_date: Optional[
                 agreement_start_date = None
                 agreement_end_date = None
         
-        # Update the database
-        try:
-            query = """
-            UPDATE Insurance.Providers
-            SET Phone = ?, Email = ?, AddressLine1 = ?, City = ?, State = ?, PostCode = ?,
-                IsPreferredProvider = ?, AgreementStartDate = ?, AgreementEndDate = ?, LastModified = ?
-            WHERE ProviderNumber = ?
-            """
-            execute_non_query(query, (
-                phone, 
-                email, 
-                address_line1, 
-                city, 
-                state, 
-                post_code, 
-                1 if is_preferred_provider else 0, 
-                agreement_start_date, 
-                agreement_end_date,
-                simulation_date,
-                provider['ProviderNumber']
-            ), simulation_date)
-            updated_count += 1
-        except Exception as e:
-            logger.error(f"Error updating provider {provider['ProviderNumber']}: {e}")
+        update_params.append((
+            phone, 
+            email, 
+            address_line1, 
+            city, 
+            state, 
+            post_code, 
+            1 if is_preferred_provider else 0, 
+            agreement_start_date, 
+            agreement_end_date,
+            simulation_date,
+            provider['ProviderNumber']
+        ))
+    
+    # Update the database with one batched statement for all selected providers
+    query = """
+    UPDATE Insurance.Providers
+    SET Phone = ?, Email = ?, AddressLine1 = ?, City = ?, State = ?, PostCode = ?,
+        IsPreferredProvider = ?, AgreementStartDate = ?, AgreementEndDate = ?, LastModified = ?
+    WHERE ProviderNumber = ?
+    """
+    updated_count = execute_many(query, update_params)
     
     logger.info(f"Updated details for {updated_count} providers")
\ No newline at end of file
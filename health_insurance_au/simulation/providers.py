@@ -6,7 +6,7 @@
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Optional
 
-from health_insurance_au.config import STATES
+from health_insurance_au.config import STATE_CODES
 from health_insurance_au.models.models import Provider
 from health_insurance_au.utils.logging_config import get_logger
 
@@ -69,9 +69,7 @@
 def generate_provider_number() -> str:
     """Generate a random provider number."""
     # Format: 6 digits followed by a letter
-    digits = ''.join(random.choices(string.digits, k=6))
-    letter = random.choice(string.ascii_uppercase)
-    return f"{digits}{letter}"
+    return f"{random.randrange(1000000):06d}{random.choice(string.ascii_uppercase)}"
 
 def generate_providers(count: int = 50, simulation_date: date = None) -> List[Provider]:
     """
@@ -95,13 +93,13 @@ def generate_providers(count: int = 50, simulation_date: date = None) -> List[Pr
     gp_count = max(10, count // 5)
     other_count = count - hospital_count - specialist_count - gp_count
     
-    # Generate hospitals
-    for i in range(hospital_count):
-        city = random.choice(CITIES)
-        state = random.choice(list(STATES.keys()))
-        
+    # Generate hospitals (location and name template drawn for the whole group at once)
+    for city, state, name_template in zip(
+        random.choices(CITIES, k=hospital_count),
+        random.choices(STATE_CODES, k=hospital_count),
+        random.choices(HOSPITAL_NAMES, k=hospital_count)
+    ):
         # Generate hospital name
-        name_template = random.choice(HOSPITAL_NAMES)
         name = name_template.format(city=city)
         
         # Generate a provider number
@@ -146,12 +144,12 @@ def generate_providers(count: int = 50, simulation_date: date = None) -> List[Pr
         providers.append(provider)
     
     # Generate GPs
-    for i in range(gp_count):
-        city = random.choice(CITIES)
-        state = random.choice(list(STATES.keys()))
-        
+    for city, state, name_template in zip(
+        random.choices(CITIES, k=gp_count),
+        random.choices(STATE_CODES, k=gp_count),
+        random.choices(PRACTICE_NAMES, k=gp_count)
+    ):
         # Generate practice name
-        name_template = random.choice(PRACTICE_NAMES)
         name = name_template.format(city=city, type='Medical')
         
         # Generate a provider number
@@ -196,13 +194,13 @@ def generate_providers(count: int = 50, simulation_date: date = None) -> List[Pr
         providers.append(provider)
     
     # Generate specialists
-    for i in range(specialist_count):
-        city = random.choice(CITIES)
-        state = random.choice(list(STATES.keys()))
-        
+    for city, state, specialist_type, name_template in zip(
+        random.choices(CITIES, k=specialist_count),
+        random.choices(STATE_CODES, k=specialist_count),
+        random.choices(['Cardiology', 'Orthopedic', 'Dermatology', 'Neurology', 'Oncology', 'Gynecology', 'Urology', 'ENT', 'Ophthalmology'], k=specialist_count),
+        random.choices(PRACTICE_NAMES, k=specialist_count)
+    ):
         # Generate practice name
-        specialist_type = random.choice(['Cardiology', 'Orthopedic', 'Dermatology', 'Neurology', 'Oncology', 'Gynecology', 'Urology', 'ENT', 'Ophthalmology'])
-        name_template = random.choice(PRACTICE_NAMES)
         name = name_template.format(city=city, type=specialist_type)
         
         # Generate a provider number
@@ -247,13 +245,13 @@ def generate_providers(count: int = 50, simulation_date: date = None) -> List[Pr
         providers.append(provider)
     
     # Generate other provider types
-    for i in range(other_count):
-        city = random.choice(CITIES)
-        state = random.choice(list(STATES.keys()))
-        
+    for city, state, provider_type, name_template in zip(
+        random.choices(CITIES, k=other_count),
+        random.choices(STATE_CODES, k=other_count),
+        random.choices(PROVIDER_TYPES[3:], k=other_count),  # Skip Hospital, GP, Specialist
+        random.choices(PRACTICE_NAMES, k=other_count)
+    ):
         # Generate practice name
-        provider_type = random.choice(PROVIDER_TYPES[3:])  # Skip Hospital, GP, Specialist
-        name_template = random.choice(PRACTICE_NAMES)
         name = name_template.format(city=city, type=provider_type)
         
         # Generate a provider number
@@ -3,29 +3,63 @@
 """
 import random
 import json
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Tuple
 
 from health_insurance_au.utils.db_utils import (
-    execute_query, execute_non_query, 
-    execute_stored_procedure, bulk_insert
+    get_connection, iter_query, execute_non_query, execute_many,
+    execute_stored_procedure, bulk_insert, bulk_insert_rows, bulk_insert_tvp, close_connections,
+    MAX_IN_CLAUSE_PARAMS
 )
 from health_insurance_au.utils.data_loader import load_sample_data, convert_to_members
 from health_insurance_au.utils.dynamic_data_generator import generate_dynamic_data, convert_to_members as convert_dynamic_to_members
 from health_insurance_au.simulation.coverage_plans import generate_coverage_plans
 from health_insurance_au.simulation.providers import generate_providers
 from health_insurance_au.simulation.policies import generate_policies
-from health_insurance_au.simulation.claims import generate_hospital_claims, generate_general_treatment_claims
+from health_insurance_au.simulation.claims import (
+    generate_hospital_claims, generate_general_treatment_claims,
+    CLAIM_INSERT_QUERY, claim_insert_params, GENERAL_REJECTION_REASONS
+)
 from health_insurance_au.simulation.payments import generate_premium_payments
 from health_insurance_au.models.models import (
     Member, CoveragePlan, Policy, PolicyMember, 
     Provider, Claim, PremiumPayment
 )
+from health_insurance_au.utils.datetime_utils import add_months
 from health_insurance_au.utils.logging_config import get_logger
 
 # Set up logging
 logger = get_logger(__name__)
 
+# Premium payment batches larger than this are sent as one table-valued parameter
+TVP_INSERT_THRESHOLD = 1000
+
+# Worker threads for loading the four simulation tables concurrently
+LOADER_THREADS = 4
+
+# Step between historical simulation runs for each fixed-length frequency;
+# monthly runs step by calendar month instead
+SIMULATION_FREQUENCIES = {
+    'daily': timedelta(days=1),
+    'weekly': timedelta(days=7)
+}
+
+# Choices for the random changes made to existing members and policies
+MEMBER_CHANGE_TYPES = ('contact', 'address', 'both')
+STREET_TYPES = ('Street', 'Road', 'Avenue', 'Boulevard')
+POLICY_CHANGE_TYPES = ('plan', 'coverage_type', 'excess', 'status', 'payment_method')
+COVERAGE_TYPES = ('Single', 'Couple', 'Family', 'Single Parent')
+EXCESS_AMOUNTS = (0, 250, 500, 750)
+POLICY_STATUSES = ('Active', 'Suspended', 'Cancelled')
+PAYMENT_METHODS = ('Direct Debit', 'Credit Card', 'BPAY', 'PayPal')
+
+# Outcomes of claim assessment, by a roll of 0-99 per claim: below the first
+# cut-off is Approved (20%), below the second is Paid (70%), the rest Rejected
+ASSESSMENT_STATUS_CUTOFFS = (20, 90)
+
 class HealthInsuranceSimulation:
     """
     Main class for the Health Insurance AU simulation.
@@ -40,14 +74,80 @@ def __init__(self):
         self.providers = []
         self.claims = []
         self.premium_payments = []
+        # Static sample data, read from disk on first use and reused across days
+        self.sample_data = None
+        # Worker thread for server-side steps that can overlap the rest of a day;
+        # it keeps its own database connection warm across days
+        self._background = None
+        # Worker threads for the start-of-day table loads, kept across days so
+        # their connections stay warm
+        self._loaders = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """
+        Release the simulation's worker thread and database connections.
+        
+        A single simulation is meant to be reused for every day of a run so its
+        connections stay open between days; call this once the run is over.
+        """
+        if self._background is not None:
+            # Connections are cached per thread, so the worker closes its own
+            self._background.submit(close_connections).result()
+            self._background.shutdown()
+            self._background = None
+        if self._loaders is not None:
+            # Hold each task at a barrier so every loader thread closes its own
+            barrier = threading.Barrier(LOADER_THREADS)
+            closes = [
+                self._loaders.submit(self._close_connections_at, barrier)
+                for _ in range(LOADER_THREADS)
+            ]
+            for close in closes:
+                close.result()
+            self._loaders.shutdown()
+            self._loaders = None
+        close_connections()
+    
+    @staticmethod
+    def _close_connections_at(barrier: threading.Barrier):
+        """Close the calling worker thread's connections, then wait for the other workers."""
+        close_connections()
+        barrier.wait()
     
     def load_data_from_db(self):
-        """Load existing data from the database."""
+        """
+        Load existing data from the database.
+        
+        The four tables are independent, so they are read concurrently, each on
+        its own worker thread and connection, overlapping the server round trips.
+        The workers are reused by later calls, so their connections are too.
+        """
         logger.info("Loading existing data from the database...")
         
-        # Load members
-        members_data = execute_query("SELECT * FROM Insurance.Members")
-        self.members = []
+        if self._loaders is None:
+            self._loaders = ThreadPoolExecutor(max_workers=LOADER_THREADS)
+        members = self._loaders.submit(self._load_members)
+        coverage_plans = self._loaders.submit(self._load_coverage_plans)
+        policies = self._loaders.submit(self._load_policies)
+        providers = self._loaders.submit(self._load_providers)
+        
+        self.members = members.result()
+        self.coverage_plans = coverage_plans.result()
+        self.policies = policies.result()
+        self.providers = providers.result()
+        
+        logger.info(f"Loaded {len(self.members)} members, {len(self.coverage_plans)} coverage plans, {len(self.policies)} policies, and {len(self.providers)} providers from database")
+    
+    def _load_members(self) -> List[Member]:
+        """Load members, converting rows as they stream in rather than materializing them all first."""
+        members_data = iter_query("SELECT * FROM Insurance.Members")
+        members = []
         for member_data in members_data:
             try:
                 member = Member(
@@ -72,13 +172,16 @@ def load_data_from_db(self):
                     join_date=member_data['JoinDate'] if isinstance(member_data['JoinDate'], date) else datetime.strptime(member_data['JoinDate'], '%Y-%m-%d').date() if member_data['JoinDate'] else date.today(),
                     is_active=member_data['IsActive'] == '1'
                 )
-                self.members.append(member)
+                members.append(member)
             except Exception as e:
                 logger.error(f"Error converting member data to Member object: {e}")
         
-        # Load coverage plans
-        plans_data = execute_query("SELECT * FROM Insurance.CoveragePlans")
-        self.coverage_plans = []
+        return members
+    
+    def _load_coverage_plans(self) -> List[CoveragePlan]:
+        """Load coverage plans."""
+        plans_data = iter_query("SELECT * FROM Insurance.CoveragePlans")
+        coverage_plans = []
         for plan_data in plans_data:
             try:
                 # Parse JSON fields
@@ -118,13 +221,16 @@ def load_data_from_db(self):
                     is_active=plan_data['IsActive'] == '1',
                     end_date=plan_data['EndDate'] if isinstance(plan_data['EndDate'], date) else datetime.strptime(plan_data['EndDate'], '%Y-%m-%d').date() if plan_data['EndDate'] else None
                 )
-                self.coverage_plans.append(plan)
+                coverage_plans.append(plan)
             except Exception as e:
                 logger.error(f"Error converting plan data to CoveragePlan object: {e}")
         
-        # Load policies
-        policies_data = execute_query("SELECT * FROM Insurance.Policies")
-        self.policies = []
+        return coverage_plans
+    
+    def _load_policies(self) -> List[Policy]:
+        """Load policies, keeping each row's database PolicyID."""
+        policies_data = iter_query("SELECT * FROM Insurance.Policies")
+        policies = []
         for policy_data in policies_data:
             try:
                 policy = Policy(
@@ -146,13 +252,16 @@ def load_data_from_db(self):
                 )
                 # Store the actual database policy_id for correct reference in premium payments
                 setattr(policy, 'policy_id', policy_data['PolicyID'])
-                self.policies.append(policy)
+                policies.append(policy)
             except Exception as e:
                 logger.error(f"Error converting policy data to Policy object: {e}")
         
-        # Load providers
-        providers_data = execute_query("SELECT * FROM Insurance.Providers")
-        self.providers = []
+        return policies
+    
+    def _load_providers(self) -> List[Provider]:
+        """Load providers."""
+        providers_data = iter_query("SELECT * FROM Insurance.Providers")
+        providers = []
         for provider_data in providers_data:
             try:
                 provider = Provider(
@@ -172,11 +281,11 @@ def load_data_from_db(self):
                     agreement_end_date=provider_data['AgreementEndDate'] if isinstance(provider_data['AgreementEndDate'], date) else datetime.strptime(provider_data['AgreementEndDate'], '%Y-%m-%d').date() if provider_data['AgreementEndDate'] else None,
                     is_active=provider_data['IsActive'] == '1'
                 )
-                self.providers.append(provider)
+                providers.append(provider)
             except Exception as e:
                 logger.error(f"Error converting provider data to Provider object: {e}")
         
-        logger.info(f"Loaded {len(self.members)} members, {len(self.coverage_plans)} coverage plans, {len(self.policies)} policies, and {len(self.providers)} providers from database")
+        return providers
     
     def add_members(self, count: int = 10, simulation_date: date = None, use_dynamic_data: bool = True):
         """
@@ -200,14 +309,16 @@ def add_members(self, count: int = 10, simulation_date: date = None, use_dynamic
             # Convert to Member objects - our updated function will handle the count correctly
             new_members = convert_dynamic_to_members(dynamic_data, count)
         else:
-            # Load sample data from static JSON file
-            sample_data = load_sample_data()
-            if not sample_data:
+            # Load sample data from static JSON file (once per simulation run;
+            # the member tracker keeps already-used records from being reused)
+            if not self.sample_data:
+                self.sample_data = load_sample_data()
+            if not self.sample_data:
                 logger.error("Failed to load sample data")
                 return
             
             # Convert to Member objects
-            new_members = convert_to_members(sample_data, count)
+            new_members = convert_to_members(self.sample_data, count)
             
         if not new_members:
             logger.error("Failed to convert data to Member objects")
@@ -341,30 +452,34 @@ def update_members(self, percentage: float = 5.0, simulation_date: date = None):
         # Select random members to update
         members_to_update = random.sample(self.members, count)
         
-        for member in members_to_update:
+        # Draw every member's change type up front
+        change_types = random.choices(MEMBER_CHANGE_TYPES, k=len(members_to_update))
+        
+        for member, change_type in zip(members_to_update, change_types):
             # Make random changes
-            change_type = random.choice(['contact', 'address', 'both'])
-            
-            if change_type in ['contact', 'both']:
+            if change_type in ('contact', 'both'):
                 # Update contact information
                 member.email = f"updated_{member.first_name.lower()}.{member.last_name.lower()}@example.com"
                 member.mobile_phone = f"04{random.randint(10, 99)}{random.randint(100000, 999999)}"
             
-            if change_type in ['address', 'both']:
+            if change_type in ('address', 'both'):
                 # Update address
-                member.address_line1 = f"{random.randint(1, 999)} New {random.choice(['Street', 'Road', 'Avenue', 'Boulevard'])}"
+                member.address_line1 = f"{random.randint(1, 999)} New {random.choice(STREET_TYPES)}"
                 # Keep the same city and state
-            
-            # Update the database
-            try:
-                query = """
-                UPDATE Insurance.Members
-                SET Email = ?, MobilePhone = ?, AddressLine1 = ?, LastModified = ?
-                WHERE MemberNumber = ?
-                """
-                execute_non_query(query, (member.email, member.mobile_phone, member.address_line1, simulation_date, member.member_number), simulation_date)
-            except Exception as e:
-                logger.error(f"Error updating member {member.member_number}: {e}")
+        
+        # Update the database with one batched statement for all changed members
+        try:
+            query = """
+            UPDATE Insurance.Members
+            SET Email = ?, MobilePhone = ?, AddressLine1 = ?, LastModified = ?
+            WHERE MemberNumber = ?
+            """
+            execute_many(query, [
+                (member.email, member.mobile_phone, member.address_line1, simulation_date, member.member_number)
+                for member in members_to_update
+            ])
+        except Exception as e:
+            logger.error(f"Error updating members: {e}")
         
         logger.info(f"Updated {len(members_to_update)} members")
     
@@ -388,37 +503,42 @@ def process_policy_changes(self, percentage: float = 2.0, simulation_date: date
         # Select random policies to change
         policies_to_change = random.sample(self.policies, count)
         
-        for policy in policies_to_change:
+        # Draw every policy's change type up front
+        change_types = random.choices(POLICY_CHANGE_TYPES, k=len(policies_to_change))
+        
+        for policy, change_type in zip(policies_to_change, change_types):
             # Make random changes
-            change_type = random.choice(['plan', 'coverage_type', 'excess', 'status', 'payment_method'])
-            
             if change_type == 'plan' and self.coverage_plans:
-                # Change to a different plan
-                new_plan = random.choice(self.coverage_plans)
-                policy.plan_id = self.coverage_plans.index(new_plan) + 1
+                # Change to a different plan, drawing its position directly
+                # rather than searching the plan list for the drawn plan
+                plan_index = random.randrange(len(self.coverage_plans))
+                new_plan = self.coverage_plans[plan_index]
+                policy.plan_id = plan_index + 1
                 policy.current_premium = new_plan.monthly_premium
             elif change_type == 'coverage_type':
                 # Change coverage type
-                policy.coverage_type = random.choice(['Single', 'Couple', 'Family', 'Single Parent'])
+                policy.coverage_type = random.choice(COVERAGE_TYPES)
             elif change_type == 'excess':
                 # Change excess amount
-                policy.excess_amount = random.choice([0, 250, 500, 750])
+                policy.excess_amount = random.choice(EXCESS_AMOUNTS)
             elif change_type == 'status':
                 # Change status
-                policy.status = random.choice(['Active', 'Suspended', 'Cancelled'])
+                policy.status = random.choice(POLICY_STATUSES)
             elif change_type == 'payment_method':
                 # Change payment method
-                policy.payment_method = random.choice(['Direct Debit', 'Credit Card', 'BPAY', 'PayPal'])
+                policy.payment_method = random.choice(PAYMENT_METHODS)
             
-            # Update the database
-            try:
-                query = """
-                UPDATE Insurance.Policies
-                SET PlanID = ?, CoverageType = ?, ExcessAmount = ?, Status = ?, 
-                    PaymentMethod = ?, CurrentPremium = ?, LastModified = ?
-                WHERE PolicyNumber = ?
-                """
-                execute_non_query(query, (
+        
+        # Update the database with one batched statement for all changed policies
+        try:
+            query = """
+            UPDATE Insurance.Policies
+            SET PlanID = ?, CoverageType = ?, ExcessAmount = ?, Status = ?, 
+                PaymentMethod = ?, CurrentPremium = ?, LastModified = ?
+            WHERE PolicyNumber = ?
+            """
+            execute_many(query, [
+                (
                     policy.plan_id, 
                     policy.coverage_type, 
                     policy.excess_amount, 
@@ -427,9 +547,11 @@ def process_policy_changes(self, percentage: float = 2.0, simulation_date: date
                     policy.current_premium,
                     simulation_date,
                     policy.policy_number
-                ), simulation_date)
-            except Exception as e:
-                logger.error(f"Error updating policy {policy.policy_number}: {e}")
+                )
+                for policy in policies_to_change
+            ])
+        except Exception as e:
+            logger.error(f"Error updating policies: {e}")
         
         logger.info(f"Processed changes for {len(policies_to_change)} policies")
     
@@ -441,28 +563,7 @@ def generate_hospital_claims(self, count: int = 5, simulation_date: date = None)
             count: Number of claims to generate
             simulation_date: The date to use for LastModified
         """
-        logger.info(f"Generating {count} hospital claims...")
-        
-        if not self.policies or not self.members or not self.providers:
-            logger.error("No policies, members, or providers available to generate claims")
-            return
-        
-        # Generate claims
-        new_claims = generate_hospital_claims(self.policies, self.members, self.providers, count, simulation_date)
-        if not new_claims:
-            logger.error("Failed to generate hospital claims")
-            return
-        
-        # Insert into database
-        claim_dicts = [claim.to_dict() for claim in new_claims]
-        try:
-            rows_affected = bulk_insert("Insurance.Claims", claim_dicts, simulation_date)
-            logger.info(f"Added {rows_affected} new hospital claims to the database")
-            
-            # Add to in-memory collection
-            self.claims.extend(new_claims)
-        except Exception as e:
-            logger.error(f"Error adding hospital claims to database: {e}")
+        self.generate_claims(count, 0, simulation_date)
     
     def generate_general_treatment_claims(self, count: int = 15, simulation_date: date = None):
         """
@@ -472,28 +573,54 @@ def generate_general_treatment_claims(self, count: int = 15, simulation_date: da
             count: Number of claims to generate
             simulation_date: The date to use for LastModified
         """
-        logger.info(f"Generating {count} general treatment claims...")
+        self.generate_claims(0, count, simulation_date)
+    
+    def generate_claims(self, hospital_count: int = 5, general_count: int = 15, simulation_date: date = None):
+        """
+        Generate hospital and general treatment claims and insert them together.
+        
+        Both kinds of claim go to the same table, so they are written with a
+        single bulk insert rather than one per kind.
+        
+        Args:
+            hospital_count: Number of hospital claims to generate
+            general_count: Number of general treatment claims to generate
+            simulation_date: The date to use for LastModified
+        """
+        logger.info(f"Generating {hospital_count} hospital and {general_count} general treatment claims...")
         
         if not self.policies or not self.members or not self.providers:
             logger.error("No policies, members, or providers available to generate claims")
             return
         
         # Generate claims
-        new_claims = generate_general_treatment_claims(self.policies, self.members, self.providers, count, simulation_date)
+        new_claims = []
+        if hospital_count:
+            hospital_claims = generate_hospital_claims(self.policies, self.members, self.providers, hospital_count, simulation_date)
+            if not hospital_claims:
+                logger.error("Failed to generate hospital claims")
+            new_claims.extend(hospital_claims)
+        if general_count:
+            general_claims = generate_general_treatment_claims(self.policies, self.members, self.providers, general_count, simulation_date)
+            if not general_claims:
+                logger.error("Failed to generate general treatment claims")
+            new_claims.extend(general_claims)
         if not new_claims:
-            logger.error("Failed to generate general treatment claims")
             return
         
-        # Insert into database
-        claim_dicts = [claim.to_dict() for claim in new_claims]
+        # Insert into database, binding each claim's values as a tuple directly
+        # rather than building an intermediate dictionary per claim
+        last_modified = simulation_date or date.today()
         try:
-            rows_affected = bulk_insert("Insurance.Claims", claim_dicts, simulation_date)
-            logger.info(f"Added {rows_affected} new general treatment claims to the database")
+            rows_affected = execute_many(
+                CLAIM_INSERT_QUERY, [claim_insert_params(claim, last_modified) for claim in new_claims]
+            )
+            logger.info(f"Added {rows_affected} new claims to the database")
             
             # Add to in-memory collection
             self.claims.extend(new_claims)
         except Exception as e:
-            logger.error(f"Error adding general treatment claims to database: {e}")
+            logger.error(f"Error adding claims to database: {e}")
     
     def process_premium_payments(self, simulation_date: date = None):
         """
@@ -517,42 +644,61 @@ def process_premium_payments(self, simulation_date: date = None):
             logger.info("No premium payments due on this date")
             return
         
-        # Keep track of which policies were updated
-        updated_policies = []
-        for payment in new_payments:
-            policy = next((p for p in self.policies if getattr(p, 'policy_id', 0) == payment.policy_id), None)
+        # Keep track of which policies were updated, grouped by their new payment dates
+        policies_by_id = {getattr(p, 'policy_id', 0): p for p in self.policies}
+        policy_ids_by_dates = defaultdict(list)
+        for policy_id in {payment.policy_id for payment in new_payments}:
+            policy = policies_by_id.get(policy_id)
             if policy:
-                updated_policies.append(policy)
+                policy_ids_by_dates[(policy.last_premium_paid_date, policy.next_premium_due_date)].append(policy_id)
         
         # Insert into database
-        payment_dicts = [payment.to_dict() for payment in new_payments]
         try:
-            # Ensure LastModified is set to simulation_date for premium payments
-            for payment_dict in payment_dicts:
-                payment_dict['LastModified'] = simulation_date
+            rows_affected = 0
+            if len(new_payments) > TVP_INSERT_THRESHOLD:
+                payment_dicts = [payment.to_dict() for payment in new_payments]
                 
-            rows_affected = bulk_insert("Insurance.PremiumPayments", payment_dicts, simulation_date)
+                # Ensure LastModified is set to simulation_date for premium payments
+                for payment_dict in payment_dicts:
+                    payment_dict['LastModified'] = simulation_date
+                
+                rows_affected = bulk_insert_tvp(
+                    "Insurance.PremiumPayments", payment_dicts, "Insurance.PremiumPaymentRows", simulation_date
+                )
+            if not rows_affected:
+                # Smaller batches, and databases created without the table type, stream
+                # plain tuples with LastModified set to simulation_date
+                rows_affected = bulk_insert_rows(
+                    "Insurance.PremiumPayments",
+                    PremiumPayment.COLUMNS + ('LastModified',),
+                    (payment.to_row() + (simulation_date,) for payment in new_payments),
+                    simulation_date
+                )
             logger.info(f"Added {rows_affected} new premium payments to the database")
             
             # Add to in-memory collection
             self.premium_payments.extend(new_payments)
             
-            # Update policies with new payment dates
-            for policy in updated_policies:
-                try:
-                    query = """
-                    UPDATE Insurance.Policies
-                    SET LastPremiumPaidDate = ?, NextPremiumDueDate = ?, LastModified = ?
-                    WHERE PolicyID = ?
-                    """
-                    execute_non_query(query, (
-                        policy.last_premium_paid_date, 
-                        policy.next_premium_due_date,
-                        simulation_date,  # Explicitly set LastModified to simulation_date
-                        getattr(policy, 'policy_id', 0)
-                    ), None)  # Pass None to prevent execute_non_query from modifying the date
-                except Exception as e:
-                    logger.error(f"Error updating policy {policy.policy_number} payment dates: {e}")
+            # Update policies with new payment dates, one set-based UPDATE per distinct
+            # pair of dates, chunked to stay under SQL Server's parameter limit
+            for (last_paid_date, next_due_date), policy_ids in policy_ids_by_dates.items():
+                for start in range(0, len(policy_ids), MAX_IN_CLAUSE_PARAMS):
+                    batch_ids = policy_ids[start:start + MAX_IN_CLAUSE_PARAMS]
+                    try:
+                        placeholders = ', '.join('?' for _ in batch_ids)
+                        query = f"""
+                        UPDATE Insurance.Policies
+                        SET LastPremiumPaidDate = ?, NextPremiumDueDate = ?, LastModified = ?
+                        WHERE PolicyID IN ({placeholders})
+                        """
+                        execute_non_query(query, (
+                            last_paid_date,
+                            next_due_date,
+                            simulation_date,  # Explicitly set LastModified to simulation_date
+                            *batch_ids
+                        ), None)  # Pass None to prevent execute_non_query from modifying the date
+                    except Exception as e:
+                        logger.error(f"Error updating payment dates for {len(batch_ids)} policies: {e}")
         except Exception as e:
             logger.error(f"Error adding premium payments to database: {e}")
     
@@ -569,70 +715,92 @@ def process_claim_assessments(self, percentage: float = 80.0, simulation_date: d
         if simulation_date is None:
             simulation_date = date.today()
             
-        # Get submitted claims from database
-        submitted_claims = execute_query("""
-            SELECT * FROM Insurance.Claims 
-            WHERE Status = 'Submitted' OR Status = 'In Process'
-        """)
+        # Pick the claims and assess them in one server-side batch rather than
+        # fetching every submitted claim and sending back an update per claim.
+        # Each chosen claim's status and rejection-reason rolls are stored first so
+        # the UPDATE reads fixed values; NEWID() used inside CHOOSE or CASE would be
+        # drawn again for every branch. TOP PERCENT rounds up, so at least one
+        # claim is processed whenever any are waiting
+        reason_placeholders = ', '.join('?' for _ in GENERAL_REJECTION_REASONS)
+        query = f"""
+        SET NOCOUNT ON;
+        DECLARE @Chosen TABLE (ClaimID INT PRIMARY KEY, Roll INT NOT NULL, ReasonRoll INT NOT NULL);
+        INSERT INTO @Chosen (ClaimID, Roll, ReasonRoll)
+        SELECT TOP (?) PERCENT ClaimID, (CHECKSUM(NEWID()) & 0x7fffffff) % 100, (CHECKSUM(NEWID()) & 0x7fffffff) % ?
+        FROM Insurance.Claims
+        WHERE Status = 'Submitted' OR Status = 'In Process'
+        ORDER BY NEWID();
+        SET NOCOUNT OFF;
+        
+        UPDATE c
+        SET Status = s.NewStatus,
+            ProcessedDate = ?,
+            PaymentDate = CASE WHEN s.NewStatus = 'Paid' THEN ? END,
+            RejectionReason = CASE WHEN s.NewStatus = 'Rejected'
+                THEN CHOOSE(1 + ch.ReasonRoll, {reason_placeholders}) END,
+            LastModified = ?
+        FROM Insurance.Claims c
+        JOIN @Chosen ch ON ch.ClaimID = c.ClaimID
+        CROSS APPLY (
+            SELECT CASE WHEN ch.Roll < ? THEN 'Approved' WHEN ch.Roll < ? THEN 'Paid' ELSE 'Rejected' END AS NewStatus
+        ) s;
+        """
+        params = (
+            percentage,
+            len(GENERAL_REJECTION_REASONS),
+            simulation_date,  # ProcessedDate
+            simulation_date,  # PaymentDate, for paid claims
+            *GENERAL_REJECTION_REASONS,
+            simulation_date,  # LastModified
+            *ASSESSMENT_STATUS_CUTOFFS
+        )
+        
+        # Run the batch directly rather than through execute_non_query, which
+        # returns 0 on error and would read as there being no claims to process
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                processed_count = cursor.rowcount
+                while cursor.nextset():
+                    pass
+        except Exception as e:
+            logger.error(f"Error processing claim assessments: {e}")
+            return
         
-        if not submitted_claims:
+        if processed_count <= 0:
             logger.info("No submitted claims to process")
             return
         
-        # Calculate number of claims to process
-        count = max(1, int(len(submitted_claims) * percentage / 100))
+        logger.info(f"Processed {processed_count} claims")
+    
+    def _run_provider_maintenance(
+        self,
+        update_providers: bool,
+        provider_update_percentage: float,
+        end_provider_agreements: bool,
+        provider_agreement_end_percentage: float,
+        simulation_date: date
+    ):
+        """
+        Update provider details and end provider agreements.
         
-        # Select random claims to process
-        claims_to_process = random.sample(submitted_claims, min(count, len(submitted_claims)))
+        Both steps run entirely on the database server and don't touch the
+        in-memory collections, so they can run alongside the other daily steps.
         
-        for claim in claims_to_process:
-            # Determine new status
-            new_status = random.choices(
-                ['Approved', 'Paid', 'Rejected'],
-                weights=[0.2, 0.7, 0.1],
-                k=1
-            )[0]
-            
-            # Set processed date
-            processed_date = simulation_date
-            
-            # Set payment date and rejection reason
-            payment_date = None
-            rejection_reason = None
-            
-            if new_status == 'Paid':
-                # Payment date should be on or after the simulation date
-                # For simulation purposes, we'll use the simulation date
-                payment_date = simulation_date
-            elif new_status == 'Rejected':
-                rejection_reasons = [
-                    'Service not covered by policy',
-                    'Annual limit reached',
-                    'Waiting period not served',
-                    'Insufficient documentation',
-                    'Duplicate claim'
-                ]
-                rejection_reason = random.choice(rejection_reasons)
-            
-            # Update the database
-            try:
-                query = """
-                UPDATE Insurance.Claims
-                SET Status = ?, ProcessedDate = ?, PaymentDate = ?, RejectionReason = ?, LastModified = ?
-                WHERE ClaimNumber = ?
-                """
-                execute_non_query(query, (
-                    new_status, 
-                    processed_date, 
-                    payment_date, 
-                    rejection_reason,
-                    simulation_date,
-                    claim['ClaimNumber']
-                ), simulation_date)
-            except Exception as e:
-                logger.error(f"Error updating claim {claim['ClaimNumber']}: {e}")
+        Args:
+            update_providers: Whether to update provider details
+            provider_update_percentage: Percentage of providers to update
+            end_provider_agreements: Whether to end provider agreements
+            provider_agreement_end_percentage: Percentage of provider agreements to end
+            simulation_date: The date to use for LastModified
+        """
+        from health_insurance_au.simulation import provider_management
         
-        logger.info(f"Processed {len(claims_to_process)} claims")
+        if update_providers:
+            provider_management.update_provider_details(provider_update_percentage, simulation_date)
+        if end_provider_agreements:
+            provider_management.end_provider_agreements(provider_agreement_end_percentage, simulation_date)
     
     def run_daily_simulation(
         self,
@@ -720,27 +888,31 @@ def run_daily_simulation(
         if update_members:
             self.update_members(member_update_percentage, simulation_date)
             
-        # Update providers if requested
-        if update_providers:
-            from health_insurance_au.simulation.provider_management import update_provider_details
-            update_provider_details(provider_update_percentage, simulation_date)
-            
-        # End provider agreements if requested
-        if end_provider_agreements:
-            from health_insurance_au.simulation.provider_management import end_provider_agreements
-            end_provider_agreements(provider_agreement_end_percentage, simulation_date)
+        # Update providers and end provider agreements if requested, on the
+        # background thread so their round trips overlap the remaining steps
+        provider_maintenance = None
+        if update_providers or end_provider_agreements:
+            if self._background is None:
+                self._background = ThreadPoolExecutor(max_workers=1)
+            provider_maintenance = self._background.submit(
+                self._run_provider_maintenance,
+                update_providers, provider_update_percentage,
+                end_provider_agreements, provider_agreement_end_percentage,
+                simulation_date
+            )
         
         # Process policy changes if requested
         if process_policy_changes:
             self.process_policy_changes(policy_change_percentage, simulation_date)
         
-        # Generate hospital claims if requested
-        if generate_hospital_claims:
-            self.generate_hospital_claims(hospital_claims_count, simulation_date)
-        
-        # Generate general treatment claims if requested
-        if generate_general_claims:
-            self.generate_general_treatment_claims(general_claims_count, simulation_date)
+        # Generate hospital and general treatment claims if requested, inserting
+        # both kinds in one batch
+        if generate_hospital_claims or generate_general_claims:
+            self.generate_claims(
+                hospital_claims_count if generate_hospital_claims else 0,
+                general_claims_count if generate_general_claims else 0,
+                simulation_date
+            )
         
         # Process premium payments if requested
         if process_premium_payments:
@@ -750,6 +922,10 @@ def run_daily_simulation(
         if process_claims:
             self.process_claim_assessments(claim_process_percentage, simulation_date)
         
+        # Wait for provider maintenance so the next day starts from a settled state
+        if provider_maintenance is not None:
+            provider_maintenance.result()
+        
         logger.info(f"Daily simulation completed for {simulation_date}")
     
     def run_historical_simulation(
@@ -773,20 +949,28 @@ def run_historical_simulation(
             
         logger.info(f"Running historical simulation from {start_date} to {end_date} with {frequency} frequency...")
         
-        # Determine the date increment based on frequency
-        if frequency == 'daily':
-            date_increment = timedelta(days=1)
-        elif frequency == 'weekly':
-            date_increment = timedelta(days=7)
-        elif frequency == 'monthly':
-            date_increment = timedelta(days=30)
+        # Precompute every simulation date up front. Runs stay sequential because
+        # each day builds on the database state left by the previous one.
+        if frequency == 'monthly':
+            # Step from the start date by calendar months so the day of the
+            # month doesn't drift (days past a month's end clamp to that end)
+            simulation_dates = []
+            current_date = start_date
+            while current_date <= end_date:
+                simulation_dates.append(current_date)
+                current_date = add_months(start_date, len(simulation_dates))
         else:
-            logger.error(f"Invalid frequency: {frequency}")
-            return
+            # Determine the date increment based on frequency
+            date_increment = SIMULATION_FREQUENCIES.get(frequency)
+            if date_increment is None:
+                logger.error(f"Invalid frequency: {frequency}")
+                return
+            
+            run_count = (end_date - start_date) // date_increment + 1 if end_date >= start_date else 0
+            simulation_dates = [start_date + i * date_increment for i in range(run_count)]
         
         # Run the simulation for each date
-        current_date = start_date
-        while current_date <= end_date:
+        for current_date in simulation_dates:
             # Vary the parameters slightly for each run to create more realistic data
             self.run_daily_simulation(
                 simulation_date=current_date,
@@ -809,8 +993,5 @@ def run_historical_simulation(
                 process_claims=random.random() < 0.8,  # 80% chance of processing claims
                 claim_process_percentage=random.uniform(70.0, 95.0)
             )
-            
-            # Increment the date
-            current_date += date_increment
         
         logger.info(f"Historical simulation completed from {start_date} to {end_date}")
\ No newline at end of file
@@ -1,48 +1,70 @@
 """
 Utilities for working with Change Data Capture (CDC) in the Health Insurance AU database.
 """
+import re
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
 
-from health_insurance_au.utils.db_utils import execute_query
+from health_insurance_au.utils.db_utils import execute_query, get_connection
 from health_insurance_au.utils.logging_config import get_logger
 
 # Set up logging
 logger = get_logger(__name__)
 
-def get_cdc_changes(schema_name: str, table_name: str, 
-                    from_time: Optional[datetime] = None, 
-                    to_time: Optional[datetime] = None) -> List[Dict[str, Any]]:
+# CDC __$operation codes
+CDC_OPERATION_DELETE = 1
+CDC_OPERATION_INSERT = 2
+CDC_OPERATION_UPDATE = 4
+
+# Display names for CDC __$operation codes (3 is the pre-update image in all-changes output)
+CDC_OPERATION_NAMES = {
+    CDC_OPERATION_DELETE: 'DELETE',
+    CDC_OPERATION_INSERT: 'INSERT',
+    3: 'UPDATE (before)',
+    CDC_OPERATION_UPDATE: 'UPDATE'
+}
+
+# Capture instance names are interpolated into function names, so only allow identifiers
+CAPTURE_INSTANCE_PATTERN = re.compile(r'^\w+$')
+
+# Parameterized so the plan is cached and reused across tables
+CAPTURE_INSTANCE_QUERY = """
+SELECT capture_instance FROM cdc.change_tables
+WHERE source_schema_name = ?
+AND source_name = ?
+"""
+
+def _get_lsn_range(from_time: Optional[datetime] = None,
+                   to_time: Optional[datetime] = None) -> Optional[Tuple[str, str]]:
     """
-    Get changes from CDC for a specific table between two points in time.
+    Map a time range to a CDC LSN range.
     
     Args:
-        schema_name: The schema name of the table
-        table_name: The table name
         from_time: The start time for changes (default: 24 hours ago)
         to_time: The end time for changes (default: current time)
         
     Returns:
-        A list of dictionaries representing the changes
+        A tuple of (from_lsn, to_lsn) as hex strings, or None if the range is invalid
     """
-    # Set default times if not provided
-    if from_time is None:
-        from_time = datetime.now() - timedelta(days=1)
-    
-    if to_time is None:
-        to_time = datetime.now()
+    # Set default times if not provided, reading the clock only once
+    if from_time is None or to_time is None:
+        now = datetime.now()
+        if from_time is None:
+            from_time = now - timedelta(days=1)
+        if to_time is None:
+            to_time = now
     
     # Convert datetime to SQL Server datetime string
     from_time_str = from_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
     to_time_str = to_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
     
     # Get the LSN range for the time period
-    lsn_query = f"""
+    lsn_query = """
     DECLARE @from_lsn binary(10), @to_lsn binary(10);
     
     -- Get the LSNs for the time range
-    SET @from_lsn = sys.fn_cdc_map_time_to_lsn('smallest greater than or equal', '{from_time_str}');
-    SET @to_lsn = sys.fn_cdc_map_time_to_lsn('largest less than or equal', '{to_time_str}');
+    SET @from_lsn = sys.fn_cdc_map_time_to_lsn('smallest greater than or equal', ?);
+    SET @to_lsn = sys.fn_cdc_map_time_to_lsn('largest less than or equal', ?);
     
     -- Return the LSNs as strings
     SELECT 
@@ -50,53 +72,108 @@ def get_cdc_changes(schema_name: str, table_name: str,
         CONVERT(nvarchar(23), @to_lsn, 1) as to_lsn;
     """
     
-    lsn_result = execute_query(lsn_query)
+    lsn_result = execute_query(lsn_query, (from_time_str, to_time_str))
     
     if not lsn_result:
         logger.error("Failed to get LSN range")
-        return []
+        return None
     
     from_lsn = lsn_result[0].get('from_lsn')
     to_lsn = lsn_result[0].get('to_lsn')
     
     if not from_lsn or not to_lsn:
         logger.error("Invalid LSN range")
-        return []
+        return None
     
-    # Get the CDC capture instance name
-    instance_query = f"""
-    SELECT capture_instance FROM cdc.change_tables
-    WHERE source_schema_name = '{schema_name}'
-    AND source_name = '{table_name}'
+    return from_lsn, to_lsn
+
+def _get_capture_instance(schema_name: str, table_name: str) -> Optional[str]:
     """
+    Look up the CDC capture instance name for a table.
     
-    instance_result = execute_query(instance_query)
+    Args:
+        schema_name: The schema name of the table
+        table_name: The table name
+        
+    Returns:
+        The capture instance name, or None if the table is not tracked
+    """
+    instance_result = execute_query(CAPTURE_INSTANCE_QUERY, (schema_name, table_name))
     
     if not instance_result:
         logger.error(f"No CDC capture instance found for {schema_name}.{table_name}")
-        return []
+        return None
     
     capture_instance = instance_result[0].get('capture_instance')
     
     if not capture_instance:
         logger.error(f"Invalid CDC capture instance for {schema_name}.{table_name}")
+        return None
+    
+    return capture_instance
+
+def _query_cdc_function(schema_name: str, table_name: str, select_clause: str,
+                        function_prefix: str, from_time: Optional[datetime],
+                        to_time: Optional[datetime], suffix: str = '') -> List[Dict[str, Any]]:
+    """
+    Run a query against a CDC table-valued function for a table and time range.
+    
+    Args:
+        schema_name: The schema name of the table
+        table_name: The table name
+        select_clause: The columns to select from the CDC function
+        function_prefix: Either 'fn_cdc_get_all_changes_' or 'fn_cdc_get_net_changes_'
+        from_time: The start time for changes
+        to_time: The end time for changes
+        suffix: Optional trailing clause, e.g. GROUP BY
+        
+    Returns:
+        A list of dictionaries representing the query results
+    """
+    lsn_range = _get_lsn_range(from_time, to_time)
+    if lsn_range is None:
+        return []
+    from_lsn, to_lsn = lsn_range
+    
+    # Get the CDC capture instance name
+    capture_instance = _get_capture_instance(schema_name, table_name)
+    if capture_instance is None:
         return []
     
-    # Get the changes
-    changes_query = f"""
+    if not CAPTURE_INSTANCE_PATTERN.match(capture_instance):
+        logger.error(f"Unexpected CDC capture instance name {capture_instance!r}")
+        return []
+    
+    # The LSNs are bound as parameters so the plan is reused across runs
+    query = f"""
     DECLARE @from_lsn binary(10), @to_lsn binary(10);
     
     -- Convert string LSNs back to binary
-    SET @from_lsn = CONVERT(binary(10), '{from_lsn}', 1);
-    SET @to_lsn = CONVERT(binary(10), '{to_lsn}', 1);
+    SET @from_lsn = CONVERT(binary(10), ?, 1);
+    SET @to_lsn = CONVERT(binary(10), ?, 1);
     
-    -- Get all changes
-    SELECT * FROM cdc.fn_cdc_get_all_changes_{capture_instance}(@from_lsn, @to_lsn, 'all');
+    SELECT {select_clause} FROM cdc.{function_prefix}{capture_instance}(@from_lsn, @to_lsn, 'all'){suffix};
     """
     
-    changes = execute_query(changes_query)
+    return execute_query(query, (from_lsn, to_lsn))
+
+def get_cdc_changes(schema_name: str, table_name: str, 
+                    from_time: Optional[datetime] = None, 
+                    to_time: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Get changes from CDC for a specific table between two points in time.
     
-    return changes
+    Args:
+        schema_name: The schema name of the table
+        table_name: The table name
+        from_time: The start time for changes (default: 24 hours ago)
+        to_time: The end time for changes (default: current time)
+        
+    Returns:
+        A list of dictionaries representing the changes
+    """
+    return _query_cdc_function(schema_name, table_name, '*', 'fn_cdc_get_all_changes_',
+                               from_time, to_time)
 
 def get_cdc_net_changes(schema_name: str, table_name: str, 
                          from_time: Optional[datetime] = None, 
@@ -114,78 +191,193 @@ def get_cdc_net_changes(schema_name: str, table_name: str,
     Returns:
         A list of dictionaries representing the net changes
     """
-    # Set default times if not provided
-    if from_time is None:
-        from_time = datetime.now() - timedelta(days=1)
-    
-    if to_time is None:
-        to_time = datetime.now()
-    
-    # Convert datetime to SQL Server datetime string
-    from_time_str = from_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-    to_time_str = to_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-    
-    # Get the LSN range for the time period
-    lsn_query = f"""
-    DECLARE @from_lsn binary(10), @to_lsn binary(10);
+    return _query_cdc_function(schema_name, table_name, '*', 'fn_cdc_get_net_changes_',
+                               from_time, to_time)
+
+def get_cdc_change_counts(schema_name: str, table_name: str,
+                          from_time: Optional[datetime] = None,
+                          to_time: Optional[datetime] = None,
+                          net_changes: bool = False) -> Dict[int, int]:
+    """
+    Count CDC changes for a table by operation, aggregated on the server.
     
-    -- Get the LSNs for the time range
-    SET @from_lsn = sys.fn_cdc_map_time_to_lsn('smallest greater than or equal', '{from_time_str}');
-    SET @to_lsn = sys.fn_cdc_map_time_to_lsn('largest less than or equal', '{to_time_str}');
+    Only one row per operation type crosses the network, rather than every
+    changed row as with get_cdc_changes.
     
-    -- Return the LSNs as strings
-    SELECT 
-        CONVERT(nvarchar(23), @from_lsn, 1) as from_lsn,
-        CONVERT(nvarchar(23), @to_lsn, 1) as to_lsn;
+    Args:
+        schema_name: The schema name of the table
+        table_name: The table name
+        from_time: The start time for changes (default: 24 hours ago)
+        to_time: The end time for changes (default: current time)
+        net_changes: Count net changes instead of all changes
+        
+    Returns:
+        A dictionary mapping CDC operation code (1=delete, 2=insert, 4=update) to count
     """
+    function_prefix = 'fn_cdc_get_net_changes_' if net_changes else 'fn_cdc_get_all_changes_'
+    rows = _query_cdc_function(
+        schema_name, table_name,
+        '__$operation AS operation, COUNT(*) AS change_count', function_prefix,
+        from_time, to_time, suffix=' GROUP BY __$operation'
+    )
+    
+    counts = {CDC_OPERATION_DELETE: 0, CDC_OPERATION_INSERT: 0, CDC_OPERATION_UPDATE: 0}
+    for row in rows:
+        counts[row['operation']] = row['change_count']
+    return counts
+
+def _list_capture_instances(net_changes_only: bool = False) -> List[Dict[str, Any]]:
+    """
+    List the CDC capture instances whose names are safe to use in function names.
     
-    lsn_result = execute_query(lsn_query)
-    
-    if not lsn_result:
-        logger.error("Failed to get LSN range")
-        return []
+    Args:
+        net_changes_only: Only include instances with net-change support
+        
+    Returns:
+        A list of dictionaries with schema_name, table_name and capture_instance
+    """
+    instances = execute_query("""
+    SELECT s.name AS schema_name, t.name AS table_name,
+           ct.capture_instance, ct.supports_net_changes
+    FROM cdc.change_tables ct
+    JOIN sys.tables t ON ct.source_object_id = t.object_id
+    JOIN sys.schemas s ON t.schema_id = s.schema_id
+    ORDER BY s.name, t.name
+    """)
     
-    from_lsn = lsn_result[0].get('from_lsn')
-    to_lsn = lsn_result[0].get('to_lsn')
+    if net_changes_only:
+        instances = [instance for instance in instances if instance['supports_net_changes']]
     
-    if not from_lsn or not to_lsn:
-        logger.error("Invalid LSN range")
-        return []
+    valid_instances = []
+    for instance in instances:
+        if CAPTURE_INSTANCE_PATTERN.match(instance['capture_instance'] or ''):
+            valid_instances.append(instance)
+        else:
+            logger.warning(f"Skipping unexpected capture instance name {instance['capture_instance']!r}")
     
-    # Get the CDC capture instance name
-    instance_query = f"""
-    SELECT capture_instance FROM cdc.change_tables
-    WHERE source_schema_name = '{schema_name}'
-    AND source_name = '{table_name}'
+    return valid_instances
+
+def get_cdc_max_lsns() -> Dict[str, Optional[str]]:
     """
+    Get the highest captured LSN for every CDC capture instance in one query.
     
-    instance_result = execute_query(instance_query)
+    Returns:
+        A dictionary mapping capture instance name to its latest LSN as a hex
+        string, or None if the change table is empty
+    """
+    instances = _list_capture_instances()
+    if not instances:
+        return {}
+    
+    query = ' UNION ALL'.join(
+        f"""
+    SELECT ? AS capture_instance, CONVERT(nvarchar(23), MAX(__$start_lsn), 1) AS max_lsn
+    FROM cdc.{instance['capture_instance']}_CT"""
+        for instance in instances
+    )
+    params = tuple(instance['capture_instance'] for instance in instances)
+    
+    return {row['capture_instance']: row['max_lsn'] for row in execute_query(query, params)}
+
+def get_all_cdc_change_counts(from_time: Optional[datetime] = None,
+                              to_time: Optional[datetime] = None,
+                              net_changes: bool = False,
+                              capture_instances: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Count CDC changes by operation for every tracked table in a single batch.
     
-    if not instance_result:
-        logger.error(f"No CDC capture instance found for {schema_name}.{table_name}")
-        return []
+    Discovers the capture instances once and then counts all of them in one
+    batch, instead of a separate LSN, capture-instance and change query per
+    table.
     
-    capture_instance = instance_result[0].get('capture_instance')
+    Args:
+        from_time: The start time for changes (default: 24 hours ago)
+        to_time: The end time for changes (default: current time)
+        net_changes: Count net changes instead of all changes; tables without
+            net-change support are skipped
+        capture_instances: Optional set of capture instance names to restrict to
+        
+    Returns:
+        A list of dictionaries with schema_name, table_name and a counts dictionary
+        mapping CDC operation code (1=delete, 2=insert, 4=update) to count. Tables
+        whose change data does not reach the range are left out, and an empty
+        list is returned if the counts query fails
+    """
+    valid_instances = _list_capture_instances(net_changes_only=net_changes)
+    if capture_instances is not None:
+        valid_instances = [instance for instance in valid_instances
+                           if instance['capture_instance'] in capture_instances]
     
-    if not capture_instance:
-        logger.error(f"Invalid CDC capture instance for {schema_name}.{table_name}")
+    if not valid_instances:
         return []
     
-    # Get the net changes
-    changes_query = f"""
+    lsn_range = _get_lsn_range(from_time, to_time)
+    if lsn_range is None:
+        return []
+    from_lsn, to_lsn = lsn_range
+    
+    function_prefix = 'fn_cdc_get_net_changes_' if net_changes else 'fn_cdc_get_all_changes_'
+    
+    # Clamp the lower bound to each instance's own minimum LSN so tables enabled
+    # after from_time do not make the whole batch fail, and skip instances whose
+    # clamped lower bound is past @to_lsn (enabled after to_time, or purged by
+    # cleanup), since the change functions raise error 313 for such a range.
+    # Each instance that is counted also records a row with operation 0, so the
+    # results tell a table with no changes apart from one that was skipped
+    blocks = []
+    params = [from_lsn, to_lsn]
+    for index, instance in enumerate(valid_instances):
+        capture_instance = instance['capture_instance']
+        params.append(capture_instance)
+        blocks.append(f"""
+    DECLARE @from_lsn_{index} binary(10) = sys.fn_cdc_get_min_lsn(?);
+    IF @from_lsn_{index} < @from_lsn SET @from_lsn_{index} = @from_lsn;
+    IF @from_lsn_{index} <= @to_lsn
+    BEGIN
+        INSERT INTO @counts (instance_index, operation, change_count) VALUES ({index}, 0, 0);
+        INSERT INTO @counts (instance_index, operation, change_count)
+        SELECT {index}, __$operation, COUNT(*)
+        FROM cdc.{function_prefix}{capture_instance}(@from_lsn_{index}, @to_lsn, 'all')
+        GROUP BY __$operation;
+    END""")
+    
+    query = f"""
+    SET NOCOUNT ON;
     DECLARE @from_lsn binary(10), @to_lsn binary(10);
-    
-    -- Convert string LSNs back to binary
-    SET @from_lsn = CONVERT(binary(10), '{from_lsn}', 1);
-    SET @to_lsn = CONVERT(binary(10), '{to_lsn}', 1);
-    
-    -- Get net changes
-    SELECT * FROM cdc.fn_cdc_get_net_changes_{capture_instance}(@from_lsn, @to_lsn, 'all');
+    DECLARE @counts TABLE (instance_index int, operation int, change_count int);
+    SET @from_lsn = CONVERT(binary(10), ?, 1);
+    SET @to_lsn = CONVERT(binary(10), ?, 1);
+    {''.join(blocks)}
+    SELECT instance_index, operation, change_count FROM @counts;
     """
     
-    changes = execute_query(changes_query)
+    # Run the batch directly rather than through execute_query, which returns an
+    # empty list on error that would read as every table having no changes
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            while cursor.nextset():
+                pass
+    except Exception as e:
+        logger.error(f"Error counting CDC changes: {e}")
+        return []
     
-    return changes
+    results = {}
+    for instance_index, operation, change_count in rows:
+        if instance_index not in results:
+            instance = valid_instances[instance_index]
+            results[instance_index] = {
+                'schema_name': instance['schema_name'],
+                'table_name': instance['table_name'],
+                'counts': {CDC_OPERATION_DELETE: 0, CDC_OPERATION_INSERT: 0, CDC_OPERATION_UPDATE: 0}
+            }
+        if operation:
+            results[instance_index]['counts'][operation] = change_count
+    
+    # Keep the tables in capture-instance order
+    return [results[index] for index in sorted(results)]
 
 def list_cdc_tables() -> List[Dict[str, str]]:
     """
@@ -206,4 +398,4 @@ def list_cdc_tables() -> List[Dict[str, str]]:
     ORDER BY s.name, t.name
     """
     
-    return execute_query(query)
\ No newline at end of file
+    return execute_query(query)
@@ -1,7 +1,22 @@
 """
 Data generation utilities for the Health Insurance AU simulation.
 """
+import importlib
 
-from health_insurance_au.utils.data_generation.generate_data import generate_fixed_records
+__all__ = ['generate_fixed_records']
 
-__all__ = ['generate_fixed_records']
\ No newline at end of file
+# Generators are imported on first access (PEP 562) so that importing the
+# package does not pull in Faker until data is actually generated
+_LAZY_IMPORTS = {
+    'generate_fixed_records': 'health_insurance_au.utils.data_generation.generate_data',
+}
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -8,8 +8,10 @@
 import random
 import argparse
 import datetime
+import multiprocessing
+from bisect import bisect
+from itertools import accumulate
 from faker import Faker
-import numpy as np
 from collections import defaultdict
 
 # Initialize Faker
@@ -30,6 +32,7 @@
     'VA': 'Virginia', 'WA': 'Washington', 'WV': 'West Virginia', 'WI': 'Wisconsin', 'WY': 'Wyoming',
     'DC': 'District of Columbia'
 }
+STATE_CODES = tuple(STATES)
 
 RACES = {
     'white': 0.6,
@@ -70,16 +73,29 @@
     'marital_status_change': 0.4 # Probability of marital status change
 }
 
-def weighted_choice(choices_with_weights):
-    """Select an item from a list of (choice, weight) tuples."""
+# Days in each month indexed by month number (February is capped at 28 so the
+# generated day is valid in every year)
+DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def cumulative_weights(choices_with_weights):
+    """Build a (choices, cumulative weights) table from (choice, weight) tuples."""
     choices, weights = zip(*choices_with_weights)
-    total = sum(weights)
-    normalized_weights = [w/total for w in weights]
-    return choices[np.random.choice(len(choices), p=normalized_weights)]
+    return choices, list(accumulate(weights))
+
+def choose_from_table(table):
+    """Select an item from a table built by cumulative_weights."""
+    choices, cum_weights = table
+    return choices[bisect(cum_weights, random.random() * cum_weights[-1])]
+
+# Cumulative weight tables for the fixed distributions, built once at import
+AGE_TABLE = cumulative_weights(AGE_DISTRIBUTION)
+RACE_TABLE = cumulative_weights(RACES.items())
+ETHNICITY_TABLE = cumulative_weights(ETHNICITIES.items())
+MARITAL_STATUS_TABLE = cumulative_weights(MARITAL_STATUS.items())
 
 def generate_age_based_on_distribution():
     """Generate an age based on realistic US population distribution."""
-    age_range = weighted_choice(AGE_DISTRIBUTION)
+    age_range = choose_from_table(AGE_TABLE)
     return random.randint(age_range[0], age_range[1])
 
 def generate_birthdate(age):
@@ -89,8 +105,7 @@ def generate_birthdate(age):
     
     # Generate random month and day
     month = random.randint(1, 12)
-    max_day = 28 if month == 2 else 30 if month in [4, 6, 9, 11] else 31
-    day = random.randint(1, max_day)
+    day = random.randint(1, DAYS_IN_MONTH[month])
     
     # Adjust if the birthday hasn't occurred yet this year
     birth_date = datetime.date(birth_year, month, day)
@@ -101,7 +116,7 @@ def generate_birthdate(age):
 
 def generate_address():
     """Generate a realistic address with length constraints."""
-    state_code = random.choice(list(STATES.keys()))
+    state_code = random.choice(STATE_CODES)
     street_address = fake.street_address()
     # Ensure the street address isn't too long (max 100 chars)
     if len(street_address) > 100:
@@ -274,22 +289,19 @@ def generate_patient_demographics(age=None, gender=None):
     birthdate = generate_birthdate(age)
     
     # Generate other demographic details
-    race_items = list(RACES.items())
-    race = weighted_choice(race_items)
+    race = choose_from_table(RACE_TABLE)
     
     # Ensure consistency between race and ethnicity
     if race == 'hispanic':
         ethnicity = 'hispanic'
     else:
-        ethnicity_items = list(ETHNICITIES.items())
-        ethnicity = weighted_choice(ethnicity_items)
+        ethnicity = choose_from_table(ETHNICITY_TABLE)
     
     # Generate marital status based on age
     if age < 18:
         marital_status = 'S'  # Children are always single
     else:
-        marital_status_items = list(MARITAL_STATUS.items())
-        marital_status = weighted_choice(marital_status_items)
+        marital_status = choose_from_table(MARITAL_STATUS_TABLE)
     
     return {
         "first": first_name,
@@ -490,11 +502,11 @@ def generate_variants(demographics):
     
     return variants
 
-def generate_fixed_records(num_patients):
-    """Generate fixed records for the specified number of patients."""
+def generate_fixed_records(num_patients, start_index=0):
+    """Generate fixed records for the specified number of patients, numbered from start_index + 1."""
     fixed_records = []
     
-    for i in range(num_patients):
+    for i in range(start_index, start_index + num_patients):
         # Generate base demographics
         demographics = generate_patient_demographics()
         
@@ -547,22 +559,47 @@ def generate_fixed_records(num_patients):
     
     return fixed_records
 
+def _generate_record_chunk(chunk):
+    """Generate one worker's share of fixed records with its own random seed."""
+    start_index, num_patients, seed = chunk
+    random.seed(seed)
+    Faker.seed(seed)
+    return generate_fixed_records(num_patients, start_index)
+
+def generate_fixed_records_parallel(num_patients, workers):
+    """Generate fixed records by splitting the patients across worker processes."""
+    if workers <= 1 or num_patients < 2:
+        return generate_fixed_records(num_patients)
+    
+    # Patients are independent, so each worker generates a contiguous block of
+    # patient numbers; seeds are drawn here so --seed still gives repeatable output
+    chunk_size = -(-num_patients // workers)
+    chunks = [
+        (start, min(chunk_size, num_patients - start), random.getrandbits(32))
+        for start in range(0, num_patients, chunk_size)
+    ]
+    
+    with multiprocessing.Pool(len(chunks)) as pool:
+        results = pool.map(_generate_record_chunk, chunks)
+    
+    return [record for chunk_records in results for record in chunk_records]
+
 def main():
     """Main function to parse arguments and generate data."""
     parser = argparse.ArgumentParser(description='Generate synthetic patient data for Synthea.')
     parser.add_argument('--num_patients', type=int, default=10, help='Number of patients to generate')
     parser.add_argument('--output', type=str, default='fixed_records.json', help='Output JSON file')
     parser.add_argument('--seed', type=int, help='Random seed for reproducibility')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes to generate patients with')
     
     args = parser.parse_args()
     
     # Set random seed if provided
     if args.seed is not None:
         random.seed(args.seed)
-        np.random.seed(args.seed)
     
     # Generate fixed records
-    fixed_records = generate_fixed_records(args.num_patients)
+    fixed_records = generate_fixed_records_parallel(args.num_patients, args.workers)
     
     # Format as expected by Synthea (object with 'records' key)
     synthea_format = {"records": fixed_records}
@@ -4,6 +4,7 @@
 import json
 import random
 import os
+import sys
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Optional
 
@@ -36,6 +37,10 @@ def load_sample_data() -> List[Dict[str, Any]]:
         logger.error(f"Error loading sample data: {e}")
         return []
 
+def _intern(value: Any) -> Any:
+    """Intern a string value so repeated values share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
 def convert_to_members(data: List[Dict[str, Any]], count: int = None) -> List[Member]:
     """
     Convert sample data to Member objects.
@@ -62,23 +67,25 @@ def convert_to_members(data: List[Dict[str, Any]], count: int = None) -> List[Me
             # Parse date of birth
             dob = datetime.strptime(item['date_of_birth'], '%Y-%m-%d').date() if 'date_of_birth' in item else None
             
-            # Create a Member object
+            # Create a Member object. The JSON decoder allocates a new string
+            # for every value, so low-cardinality fields are interned to share
+            # one object across all members.
             member = Member(
                 first_name=item.get('first_name', ''),
                 last_name=item.get('last_name', ''),
                 date_of_birth=dob,
-                gender=item.get('gender', ''),
+                gender=_intern(item.get('gender', '')),
                 address_line1=item.get('address', ''),
-                city=item.get('city', ''),
-                state=item.get('state', ''),
+                city=_intern(item.get('city', '')),
+                state=_intern(item.get('state', '')),
                 post_code=str(item.get('postcode', '')),
                 member_number=item.get('member_id', ''),
                 email=item.get('email', ''),
                 mobile_phone=item.get('mobile_phone', ''),
                 home_phone=item.get('home_phone', ''),
                 medicare_number=item.get('medicare_number', ''),
-                # Generate random LHC loading between 0% and 20%
-                lhc_loading_percentage=round(random.uniform(0, 20), 2) if random.random() < 0.3 else 0.0,
+                # Generate random LHC loading between 0% and 20% (drawn in whole hundredths)
+                lhc_loading_percentage=random.randint(0, 2000) / 100 if random.random() < 0.3 else 0.0,
                 # Randomly assign a PHI rebate tier
                 phi_rebate_tier=random.choice(['Base', 'Tier1', 'Tier2', 'Tier3']),
                 # Generate a join date within the last 5 years
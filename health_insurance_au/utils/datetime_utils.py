@@ -2,15 +2,29 @@
 Datetime utilities for the Health Insurance AU simulation.
 """
 import random
-from datetime import datetime, time
+from calendar import monthrange
+from datetime import date, datetime
+
+# Business hours (8:00:00 AM to 5:59:59 PM) as seconds since midnight
+BUSINESS_HOURS_START = 8 * 3600
+BUSINESS_HOURS_END = 18 * 3600
 
 def generate_random_datetime(date_value):
     """Generate a random datetime within the given date."""
-    # Business hours (8 AM to 5 PM)
-    random_hour = random.randint(8, 17)
-    random_minute = random.randint(0, 59)
-    random_second = random.randint(0, 59)
-    return datetime.combine(date_value, time(random_hour, random_minute, random_second))
+    # Draw the time of day with a single call instead of one per component
+    seconds = random.randrange(BUSINESS_HOURS_START, BUSINESS_HOURS_END)
+    random_hour, remainder = divmod(seconds, 3600)
+    random_minute, random_second = divmod(remainder, 60)
+    # Build the datetime directly rather than allocating a time() to combine
+    return datetime(date_value.year, date_value.month, date_value.day,
+                    random_hour, random_minute, random_second)
+
+def add_months(date_value: date, months: int) -> date:
+    """Step a date by whole calendar months, clamping the day to the end of the target month."""
+    year, month_index = divmod(date_value.month - 1 + months, 12)
+    year += date_value.year
+    month = month_index + 1
+    return date(year, month, min(date_value.day, monthrange(year, month)[1]))
 
 # Apply this function to convert dates to datetimes in the claims.py module
 # Example usage:
@@ -1,45 +1,129 @@
 """
 Database connection utilities for the Health Insurance AU simulation using pyodbc.
 """
+import threading
+from itertools import islice
+from operator import itemgetter
 import pyodbc
 from datetime import datetime, date
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Sequence, Tuple
 from contextlib import contextmanager
 
-from health_insurance_au.config import DB_CONFIG
+from health_insurance_au import config
 from health_insurance_au.utils.logging_config import get_logger
 
 # Set up logging
 logger = get_logger(__name__)
 
+# Enable ODBC driver-manager pooling before the first connection is opened
+pyodbc.pooling = True
+
+# Open connections are cached per thread (pyodbc connections must not be shared
+# between threads) and keyed on the connection string, so scripts that override
+# DB_CONFIG at runtime transparently get a connection to the new target.
+_thread_local = threading.local()
+
+# SQL Server allows at most 2100 parameters per statement; leave room for the
+# other values bound alongside an IN list
+MAX_IN_CLAUSE_PARAMS = 2000
+
+# Whether each table (keyed by qualified name) has a LastModified column, so
+# repeated bulk inserts into the same table skip the INFORMATION_SCHEMA lookup
+_last_modified_columns: Dict[str, bool] = {}
+
+# Column names of each table type used for table-valued parameters, in
+# definition order, keyed by the type's schema-qualified name
+_table_type_columns: Dict[str, List[str]] = {}
+
+def _build_connection_string() -> str:
+    """
+    Build the ODBC connection string from the current database configuration.
+    
+    Returns:
+        The ODBC connection string
+    """
+    return (
+        f"DRIVER={config.DB_CONFIG['driver']};"
+        f"SERVER={config.DB_CONFIG['server']};"
+        f"DATABASE={config.DB_CONFIG['database']};"
+        f"UID={config.DB_CONFIG['username']};"
+        f"PWD={config.DB_CONFIG['password']};"
+        f"TrustServerCertificate=yes;"
+    )
+
+def _get_cached_connections() -> Dict[str, Any]:
+    """Return the connection cache for the current thread."""
+    connections = getattr(_thread_local, 'connections', None)
+    if connections is None:
+        connections = _thread_local.connections = {}
+    return connections
+
 @contextmanager
 def get_connection():
     """
     Context manager for database connections.
     
+    The underlying connection is opened once per thread and reused by later
+    calls instead of paying the login handshake on every query. A connection
+    that fails at the connection level is discarded so the next call
+    reconnects; statement errors leave it cached.
+    
     Yields:
         A pyodbc connection object
     """
-    # Construct connection string
-    conn_str = (
-        f"DRIVER={DB_CONFIG['driver']};"
-        f"SERVER={DB_CONFIG['server']};"
-        f"DATABASE={DB_CONFIG['database']};"
-        f"UID={DB_CONFIG['username']};"
-        f"PWD={DB_CONFIG['password']};"
-        f"TrustServerCertificate=yes;"
-    )
+    conn_str = _build_connection_string()
+    connections = _get_cached_connections()
+    
+    conn = connections.get(conn_str)
+    if conn is None:
+        try:
+            conn = pyodbc.connect(conn_str, autocommit=True)  # Set autocommit to True
+        except Exception as e:
+            logger.error(f"Database connection error: {e}")
+            raise
+        connections[conn_str] = conn
     
-    conn = None
     try:
-        conn = pyodbc.connect(conn_str, autocommit=True)  # Set autocommit to True
         yield conn
     except Exception as e:
-        logger.error(f"Database connection error: {e}")
+        # Statement errors (constraint violations, missing objects, ...) leave the
+        # connection usable, so it stays cached and the error goes to the caller;
+        # only a failed connection is discarded
+        if _is_connection_error(e):
+            logger.error(f"Database connection error: {e}")
+            stale = connections.pop(conn_str, None)
+            if stale is not None:
+                try:
+                    stale.close()
+                except Exception:
+                    pass
         raise
-    finally:
-        if conn:
+
+def _is_connection_error(error: Exception) -> bool:
+    """
+    Check whether an error means the connection itself has failed.
+    
+    Args:
+        error: The exception raised while using the connection
+        
+    Returns:
+        True for pyodbc operational errors and SQLSTATE class 08 (connection
+        exception) errors
+    """
+    if isinstance(error, pyodbc.OperationalError):
+        return True
+    sqlstate = error.args[0] if error.args else None
+    return isinstance(sqlstate, str) and sqlstate.startswith('08')
+
+def close_connections():
+    """Close and forget all cached database connections for the current thread."""
+    connections = _get_cached_connections()
+    while connections:
+        _, conn = connections.popitem()
+        try:
             conn.close()
+        except Exception as e:
+            logger.warning(f"Error closing database connection: {e}")
 
 def get_qualified_table_name(table_name: str) -> str:
     """
@@ -55,7 +139,7 @@ def get_qualified_table_name(table_name: str) -> str:
     # extract just the table part (after the first dot)
     if '.' in table_name:
         # Check if the table name already starts with the database name
-        if table_name.startswith(f"{DB_CONFIG['database']}."):
+        if table_name.startswith(f"{config.DB_CONFIG['database']}."):
             return table_name
         
         # Check if there's already a database name (contains two dots)
@@ -63,10 +147,10 @@ def get_qualified_table_name(table_name: str) -> str:
         if len(parts) > 2:
             # Extract just the schema and table parts
             schema_table = '.'.join(parts[-2:])
-            return f"{DB_CONFIG['database']}.{schema_table}"
+            return f"{config.DB_CONFIG['database']}.{schema_table}"
     
     # Add the database name to the table name
-    return f"{DB_CONFIG['database']}.{table_name}"
+    return f"{config.DB_CONFIG['database']}.{table_name}"
 
 def execute_query(query: str, params: Optional[Tuple] = None) -> List[Dict[str, Any]]:
     """
@@ -92,14 +176,9 @@ def execute_query(query: str, params: Optional[Tuple] = None) -> List[Dict[str,
             if cursor.description:
                 column_names = [column[0] for column in cursor.description]
                 
-                # Fetch all rows and convert to dictionaries
-                rows = []
-                for row in cursor.fetchall():
-                    # Convert row to dictionary
-                    row_dict = {}
-                    for i, value in enumerate(row):
-                        row_dict[column_names[i]] = value
-                    rows.append(row_dict)
+                # Stream rows from the cursor and convert to dictionaries without
+                # materializing an intermediate fetchall() list
+                rows = [dict(zip(column_names, row)) for row in cursor]
                 
                 # Ensure we consume any remaining results to prevent "busy with results" errors
                 while cursor.nextset():
@@ -112,6 +191,48 @@ def execute_query(query: str, params: Optional[Tuple] = None) -> List[Dict[str,
         logger.error(f"Database query error: {e}")
         return []
 
+def iter_query(query: str, params: Optional[Tuple] = None, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    Execute a SQL query and yield the results one dictionary at a time.
+    
+    Rows are fetched from the server in batches, so only one batch is held in
+    memory at once. The caller must not run other statements on this thread's
+    connection until the iterator has been exhausted or closed.
+    
+    Args:
+        query: The SQL query to execute
+        params: Optional parameters for the query
+        batch_size: The number of rows to fetch per round trip
+        
+    Yields:
+        A dictionary for each row of the query results
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                
+                if not cursor.description:
+                    return
+                
+                column_names = [column[0] for column in cursor.description]
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(zip(column_names, row))
+            finally:
+                # Closing the cursor discards any unread results so the connection
+                # is free for the next statement even if iteration stopped early
+                cursor.close()
+    except Exception as e:
+        logger.error(f"Database query error: {e}")
+
 def execute_non_query(query: str, params: Optional[Tuple] = None, simulation_date: Optional[date] = None) -> int:
     """
     Execute a non-query SQL statement (INSERT, UPDATE, DELETE) and return the number of affected rows.
@@ -137,16 +258,60 @@ def execute_non_query(query: str, params: Optional[Tuple] = None, simulation_dat
                 
             # No need to commit with autocommit=True
             
+            # Read the affected row count before draining, since moving past the
+            # last result set resets it to -1
+            rowcount = cursor.rowcount
+            
             # Ensure we consume any remaining results to prevent "busy with results" errors
             while cursor.nextset():
                 pass
                 
             # Return the number of affected rows
-            return cursor.rowcount
+            return rowcount
     except Exception as e:
         logger.error(f"Database non-query error: {e}")
         return 0
 
+def execute_many(query: str, params_list: List[Tuple], batch_size: int = 1000) -> int:
+    """
+    Execute a parameterized statement once per parameter tuple using a single
+    array-bound executemany call per batch.
+    
+    Args:
+        query: The SQL statement to execute
+        params_list: A list of parameter tuples, one per execution
+        batch_size: The number of parameter tuples to send per round trip
+        
+    Returns:
+        The number of parameter tuples executed; if a batch fails, the count of
+        those in the batches that completed before it
+    """
+    if not params_list:
+        return 0
+    
+    # Batches are committed as they go (autocommit), so count them outside the
+    # try block and report the ones that went in even if a later batch fails
+    executed = 0
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            # Send each batch as a single parameter array rather than row by row
+            cursor.fast_executemany = True
+            
+            for i in range(0, len(params_list), batch_size):
+                batch = params_list[i:i + batch_size]
+                cursor.executemany(query, batch)
+                
+                # Ensure we consume any remaining results to prevent "busy with results" errors
+                while cursor.nextset():
+                    pass
+                
+                executed += len(batch)
+            
+    except Exception as e:
+        logger.error(f"Database executemany error after {executed} of {len(params_list)} rows: {e}")
+    return executed
+
 def execute_stored_procedure(proc_name: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
     """
     Execute a stored procedure and return the results as a list of dictionaries.
@@ -186,12 +351,8 @@ def execute_stored_procedure(proc_name: str, params: Optional[Dict[str, Any]] =
                 if cursor.description:
                     column_names = [column[0] for column in cursor.description]
                     
-                    for row in cursor.fetchall():
-                        # Convert row to dictionary
-                        row_dict = {}
-                        for i, value in enumerate(row):
-                            row_dict[column_names[i]] = value
-                        results.append(row_dict)
+                    # Stream rows straight from the cursor
+                    results.extend(dict(zip(column_names, row)) for row in cursor)
                 
                 if not cursor.nextset():
                     break
@@ -201,6 +362,31 @@ def execute_stored_procedure(proc_name: str, params: Optional[Dict[str, Any]] =
         logger.error(f"Database stored procedure error: {e}")
         return []
 
+def _has_last_modified_column(cursor, table_name: str) -> bool:
+    """
+    Check once per table whether it has a LastModified column.
+    
+    Args:
+        cursor: An open cursor to run the lookup on
+        table_name: The name of the table
+        
+    Returns:
+        True if the table has a LastModified column
+    """
+    qualified_table_name = get_qualified_table_name(table_name)
+    has_last_modified = _last_modified_columns.get(qualified_table_name)
+    if has_last_modified is None:
+        try:
+            table_info_query = "SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = ? AND COLUMN_NAME = 'LastModified'"
+            cursor.execute(table_info_query, table_name.split('.')[-1])
+            has_last_modified = cursor.fetchone() is not None
+            _last_modified_columns[qualified_table_name] = has_last_modified
+        except Exception as e:
+            logger.warning(f"Could not check for LastModified column: {e}")
+            # Assume no LastModified column in case of error
+            has_last_modified = False
+    return has_last_modified
+
 def bulk_insert(table_name: str, data: List[Dict[str, Any]], simulation_date: Optional[date] = None) -> int:
     """
     Perform a bulk insert operation.
@@ -226,28 +412,22 @@ def bulk_insert(table_name: str, data: List[Dict[str, Any]], simulation_date: Op
             # Get column names from the first dictionary
             columns = list(data[0].keys())
             
-            # We'll skip the actual database check for LastModified column in tests
-            # by not executing the query directly
-            has_last_modified = False
-            try:
-                table_info_query = f"SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = '{table_name.split('.')[-1]}' AND COLUMN_NAME = 'LastModified'"
-                cursor.execute(table_info_query)
-                if cursor.fetchone():
-                    has_last_modified = True
-            except Exception as e:
-                logger.warning(f"Could not check for LastModified column: {e}")
-                # Assume no LastModified column in case of error
-                has_last_modified = False
-            
-            # If the table has LastModified and it's not in the data, add it
+            has_last_modified = _has_last_modified_column(cursor, table_name)
+            
+            # Read each row's values straight from the dictionary in column order
+            # (itemgetter returns a bare value rather than a tuple for one column)
+            if len(columns) == 1:
+                column = columns[0]
+                get_values = lambda row: (row[column],)
+            else:
+                get_values = itemgetter(*columns)
+            
+            # If the table has LastModified and it's not in the data, append the
+            # simulation date or current date to every row without mutating the input
+            extra_values = ()
             if has_last_modified and 'LastModified' not in columns:
-                # Add LastModified to each row with the simulation date or current date
-                last_modified_value = simulation_date if simulation_date else datetime.now().date()
-                for row in data:
-                    row['LastModified'] = last_modified_value
-                
-                # Update columns list
-                columns = list(data[0].keys())
+                extra_values = (simulation_date if simulation_date else datetime.now().date(),)
+                columns.append('LastModified')
             
             columns_str = ", ".join(columns)
             
@@ -257,6 +437,10 @@ def bulk_insert(table_name: str, data: List[Dict[str, Any]], simulation_date: Op
             # Create the INSERT statement
             insert_sql = f"INSERT INTO {qualified_table_name} ({columns_str}) VALUES ({placeholders})"
             
+            # Send each batch as a single parameter array rather than row by row;
+            # this also avoids multi-row VALUES statements and their 2100-parameter cap
+            cursor.fast_executemany = True
+            
             # Insert rows in batches
             rows_inserted = 0
             batch_size = 1000  # Adjust based on your needs
@@ -264,15 +448,8 @@ def bulk_insert(table_name: str, data: List[Dict[str, Any]], simulation_date: Op
             for i in range(0, len(data), batch_size):
                 batch = data[i:i+batch_size]
                 
-                # Prepare batch parameters
-                batch_params = []
-                for row in batch:
-                    # Create a list of values in the same order as columns
-                    row_values = [row[col] for col in columns]
-                    batch_params.append(tuple(row_values))
-                
                 # Execute many
-                cursor.executemany(insert_sql, batch_params)
+                cursor.executemany(insert_sql, [get_values(row) + extra_values for row in batch])
                 # No need to commit with autocommit=True
                 
                 # Ensure we consume any remaining results to prevent "busy with results" errors
@@ -284,4 +461,151 @@ def bulk_insert(table_name: str, data: List[Dict[str, Any]], simulation_date: Op
             return rows_inserted
     except Exception as e:
         logger.error(f"Database bulk insert error: {e}")
-        return 0
\ No newline at end of file
+        return 0
+
+def bulk_insert_rows(table_name: str, columns: Sequence[str], rows: Iterable[Tuple[Any, ...]],
+                     simulation_date: Optional[date] = None) -> int:
+    """
+    Perform a bulk insert of rows that are already tuples in a fixed column order.
+    
+    Unlike bulk_insert, the rows need no per-row dictionary or key lookups, and
+    they are consumed lazily one batch at a time, so a generator can stream them.
+    
+    Args:
+        table_name: The name of the table to insert into
+        columns: The column names, in the order of each row's values
+        rows: The rows to insert, as tuples of values in column order
+        simulation_date: The date to use for LastModified (if None, uses current date)
+        
+    Returns:
+        The number of inserted rows
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            
+            columns = list(columns)
+            
+            # If the table has LastModified and it's not in the columns, append the
+            # simulation date or current date to every row
+            extra_values = ()
+            if 'LastModified' not in columns and _has_last_modified_column(cursor, table_name):
+                extra_values = (simulation_date if simulation_date else datetime.now().date(),)
+                columns.append('LastModified')
+            
+            placeholders = ", ".join(["?" for _ in columns])
+            insert_sql = f"INSERT INTO {get_qualified_table_name(table_name)} ({', '.join(columns)}) VALUES ({placeholders})"
+            
+            # Send each batch as a single parameter array
+            cursor.fast_executemany = True
+            
+            rows_inserted = 0
+            batch_size = 1000
+            rows = iter(rows)
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                if extra_values:
+                    batch = [row + extra_values for row in batch]
+                
+                cursor.executemany(insert_sql, batch)
+                
+                # Ensure we consume any remaining results to prevent "busy with results" errors
+                while cursor.nextset():
+                    pass
+                
+                rows_inserted += len(batch)
+            
+            return rows_inserted
+    except Exception as e:
+        logger.error(f"Database bulk insert error: {e}")
+        return 0
+
+def _get_table_type_columns(cursor, type_name: str) -> List[str]:
+    """
+    Get the column names of a user-defined table type in definition order.
+    
+    Args:
+        cursor: An open cursor to run the lookup on
+        type_name: The schema-qualified name of the table type
+        
+    Returns:
+        The column names, or an empty list if the type does not exist
+    """
+    columns = _table_type_columns.get(type_name)
+    if columns is None:
+        cursor.execute("""
+            SELECT c.name
+            FROM sys.table_types tt
+            JOIN sys.columns c ON c.object_id = tt.type_table_object_id
+            WHERE tt.user_type_id = TYPE_ID(?)
+            ORDER BY c.column_id
+        """, type_name)
+        columns = [row[0] for row in cursor.fetchall()]
+        if columns:
+            _table_type_columns[type_name] = columns
+    return columns
+
+def bulk_insert_tvp(table_name: str, data: List[Dict[str, Any]], type_name: str, simulation_date: Optional[date] = None) -> int:
+    """
+    Insert rows by sending them as a single table-valued parameter.
+    
+    All rows travel to the server as one rowset in a single statement, so large
+    batches need neither chunking nor a round trip per batch. The table type
+    must have a column for each key in the data; a LastModified column missing
+    from the data is filled with the simulation date or current date.
+    
+    Args:
+        table_name: The name of the table to insert into
+        data: A list of dictionaries representing the rows to insert
+        type_name: The schema-qualified name of the table type matching the rows
+        simulation_date: The date to use for LastModified (if None, uses current date)
+        
+    Returns:
+        The number of inserted rows (0 if the insert failed, in which case no
+        rows were inserted)
+    """
+    if not data:
+        return 0
+    
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            
+            type_columns = _get_table_type_columns(cursor, type_name)
+            if not type_columns:
+                logger.warning(f"Table type {type_name} not found")
+                return 0
+            
+            # Fill LastModified for rows that don't carry it, like bulk_insert
+            last_modified = simulation_date if simulation_date else datetime.now().date()
+            fill_last_modified = 'LastModified' in type_columns and 'LastModified' not in data[0]
+            
+            # The rowset is positional, so read each row's values in the type's column order
+            value_columns = [column for column in type_columns if not (fill_last_modified and column == 'LastModified')]
+            get_values = itemgetter(*value_columns) if len(value_columns) > 1 else (lambda row: (row[value_columns[0]],))
+            if fill_last_modified:
+                position = type_columns.index('LastModified')
+                rows = [values[:position] + (last_modified,) + values[position:] for values in map(get_values, data)]
+            else:
+                rows = [get_values(row) for row in data]
+            
+            schema, _, name = type_name.rpartition('.')
+            columns_str = ", ".join(type_columns)
+            insert_sql = (
+                f"INSERT INTO {get_qualified_table_name(table_name)} ({columns_str}) "
+                f"SELECT {columns_str} FROM ?"
+            )
+            
+            # pyodbc takes a TVP as a list of row tuples, led by the type and schema names
+            cursor.execute(insert_sql, ([name, schema or 'dbo', *rows],))
+            
+            # Ensure we consume any remaining results to prevent "busy with results" errors
+            while cursor.nextset():
+                pass
+            
+            return len(rows)
+    except Exception as e:
+        logger.error(f"Database table-valued parameter insert error: {e}")
+        return 0
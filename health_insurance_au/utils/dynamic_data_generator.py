@@ -9,9 +9,6 @@
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Optional
 
-# Import from the data_generation package
-from health_insurance_au.utils.data_generation import generate_fixed_records
-
 from health_insurance_au.models.models import Member
 from health_insurance_au.utils.logging_config import get_logger
 from health_insurance_au.utils.member_tracker import get_unused_members
@@ -19,6 +16,9 @@
 # Set up logging
 logger = get_logger(__name__)
 
+# Generated gender values mapped to the expected M/F codes (others pass through)
+GENDER_CODES = {'male': 'M', 'female': 'F'}
+
 def generate_dynamic_data(count: int = 10) -> List[Dict[str, Any]]:
     """
     Generate dynamic patient data using the generate_data module.
@@ -30,6 +30,9 @@ def generate_dynamic_data(count: int = 10) -> List[Dict[str, Any]]:
         A list of dictionaries containing the generated data
     """
     try:
+        # Imported here so Faker is only loaded when data is generated
+        from health_insurance_au.utils.data_generation import generate_fixed_records
+        
         # Generate fixed records using the generate_data module
         fixed_records = generate_fixed_records(count)
         
@@ -66,10 +69,7 @@ def generate_dynamic_data(count: int = 10) -> List[Dict[str, Any]]:
             }
             
             # Convert gender to match the expected format (M/F)
-            if member_data["gender"] == "male":
-                member_data["gender"] = "M"
-            elif member_data["gender"] == "female":
-                member_data["gender"] = "F"
+            member_data["gender"] = GENDER_CODES.get(member_data["gender"], member_data["gender"])
             
             # Add the converted data
             converted_data.append(member_data)
@@ -138,8 +138,8 @@ def convert_to_members(data: List[Dict[str, Any]], count: int = None) -> List[Me
                 mobile_phone=formatted_mobile,
                 home_phone=item.get('home_phone', ''),
                 medicare_number=item.get('medicare_number', ''),
-                # Generate random LHC loading between 0% and 20%
-                lhc_loading_percentage=round(random.uniform(0, 20), 2) if random.random() < 0.3 else 0.0,
+                # Generate random LHC loading between 0% and 20% (drawn in whole hundredths)
+                lhc_loading_percentage=random.randint(0, 2000) / 100 if random.random() < 0.3 else 0.0,
                 # Randomly assign a PHI rebate tier
                 phi_rebate_tier=random.choice(['Base', 'Tier1', 'Tier2', 'Tier3']),
                 # Generate a join date within the last 5 years
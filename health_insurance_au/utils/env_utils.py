@@ -2,6 +2,7 @@
 Environment variable utilities for the Health Insurance AU simulation.
 """
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -14,32 +15,39 @@ def load_env_file(env_file_path: str) -> Dict[str, str]:
     """
     Load environment variables from a file.
     
+    The file is parsed once per path and later calls are served from a cache.
+    
     Args:
         env_file_path: Path to the environment file
         
     Returns:
         A dictionary of environment variables
     """
-    env_vars = {}
+    return dict(_read_env_file(str(env_file_path)))
+
+@lru_cache(maxsize=None)
+def _read_env_file(env_file_path: str) -> Dict[str, str]:
+    """
+    Parse an environment file, caching the result per path.
     
+    Args:
+        env_file_path: Path to the environment file
+        
+    Returns:
+        A dictionary of environment variables
+    """
     try:
-        env_path = Path(env_file_path)
-        if not env_path.exists():
-            logger.warning(f"Environment file not found: {env_file_path}")
-            return env_vars
-            
-        with open(env_path, 'r') as file:
-            for line in file:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                    
-                key, value = line.split('=', 1)
-                env_vars[key.strip()] = value.strip()
-                
+        # Read the file in one call and parse every non-comment line in a single pass
+        text = Path(env_file_path).read_text()
+        lines = (line for line in map(str.strip, text.splitlines()) if line and not line.startswith('#'))
+        env_vars = {key.strip(): value.strip() for key, value in (line.split('=', 1) for line in lines)}
+        
         logger.info(f"Loaded {len(env_vars)} environment variables from {env_file_path}")
         return env_vars
         
+    except FileNotFoundError:
+        logger.warning(f"Environment file not found: {env_file_path}")
+        return {}
     except Exception as e:
         logger.error(f"Error loading environment file {env_file_path}: {e}")
         return {}
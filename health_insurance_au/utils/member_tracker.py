@@ -3,7 +3,7 @@
 """
 import os
 import json
-from typing import List, Set, Dict, Any
+from typing import List, Set, Dict, Any, Optional
 
 from health_insurance_au.utils.logging_config import get_logger
 
@@ -14,6 +14,10 @@
 USED_MEMBERS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
                                 "data", "used_members.json")
 
+# In-process copy of the used member IDs, loaded from the file on first use and
+# kept in step with every save so daily selections don't re-read the whole file
+_used_members_cache: Optional[Set[str]] = None
+
 def load_used_members() -> Set[str]:
     """
     Load the set of member IDs that have already been used.
@@ -36,6 +40,25 @@ def load_used_members() -> Set[str]:
         logger.warning(f"Error loading used members: {e}. Starting with empty set.")
         return set()
 
+def refresh_used_members() -> Set[str]:
+    """
+    Reload the cached set of used member IDs from the file.
+    
+    Call this if another process may have changed the file since it was loaded.
+    
+    Returns:
+        The cached set of member IDs
+    """
+    global _used_members_cache
+    _used_members_cache = load_used_members()
+    return _used_members_cache
+
+def _get_cached_used_members() -> Set[str]:
+    """Return the cached set of used member IDs, loading it on first use."""
+    if _used_members_cache is None:
+        return refresh_used_members()
+    return _used_members_cache
+
 def save_used_members(used_members: Set[str]) -> None:
     """
     Save the set of used member IDs to the file.
@@ -43,6 +66,9 @@ def save_used_members(used_members: Set[str]) -> None:
     Args:
         used_members: Set of member IDs that have been used
     """
+    global _used_members_cache
+    _used_members_cache = used_members
+    
     try:
         # Create the directory if it doesn't exist
         os.makedirs(os.path.dirname(USED_MEMBERS_FILE), exist_ok=True)
@@ -65,8 +91,8 @@ def get_unused_members(data: List[Dict[str, Any]], count: int) -> List[Dict[str,
     Returns:
         A list of dictionaries containing unused member data
     """
-    # Load the set of used member IDs
-    used_members = load_used_members()
+    # Use the cached set of used member IDs rather than re-reading the file
+    used_members = _get_cached_used_members()
     
     # Filter out members that have already been used
     unused_data = [item for item in data if item.get('member_id', '') not in used_members]
@@ -78,9 +104,8 @@ def get_unused_members(data: List[Dict[str, Any]], count: int) -> List[Dict[str,
     selected_count = min(count, len(unused_data))
     selected_members = unused_data[:selected_count]
     
-    # Update the set of used member IDs
-    for member in selected_members:
-        used_members.add(member.get('member_id', ''))
+    # Add only the newly selected IDs to the cached set
+    used_members.update(member.get('member_id', '') for member in selected_members)
     
     # Save the updated set of used member IDs
     save_used_members(used_members)
@@ -92,6 +117,9 @@ def reset_used_members() -> None:
     """
     Reset the list of used members (for testing or starting fresh).
     """
+    global _used_members_cache
+    _used_members_cache = None
+    
     try:
         if os.path.exists(USED_MEMBERS_FILE):
             os.remove(USED_MEMBERS_FILE)
@@ -1,36 +1,64 @@
 """
-Check the database structure.
+Check the database structure by listing each table's columns.
 """
-import subprocess
 import sys
 import os
 import argparse
+from collections import defaultdict
 
 # Add the parent directory to the path so we can import our modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from health_insurance_au.config import DB_CONFIG
+from health_insurance_au.schema import DESCRIBE_TABLES
+from health_insurance_au.utils.db_utils import get_connection
 from health_insurance_au.utils.env_utils import get_db_config
+from health_insurance_au.utils.logging_config import get_logger
 
-def run_sql_command(server, username, password, database, query):
-    """Run a SQL command using sqlcmd."""
-    cmd = [
-        'sqlcmd',
-        '-S', server,
-        '-U', username,
-        '-P', password,
-        '-d', database,
-        '-Q', query,
-        '-h', '-1',  # No headers
-        '-W',  # Remove trailing spaces
-    ]
+# Set up logging
+logger = get_logger(__name__)
+
+def get_table_columns(tables=DESCRIBE_TABLES):
+    """
+    Fetch column metadata for the given tables in a single round-trip.
+    
+    Args:
+        tables: (schema, table) pairs to describe
+        
+    Returns:
+        A dictionary mapping (schema, table) to a list of column metadata rows,
+        or None if the query failed
+    """
+    placeholders = ', '.join('OBJECT_ID(?)' for _ in tables)
+    query = f"""
+    SELECT s.name AS schema_name, tbl.name AS table_name, c.name AS column_name,
+           t.name AS data_type, c.max_length, c.is_nullable
+    FROM sys.columns c
+    JOIN sys.types t ON c.user_type_id = t.user_type_id
+    JOIN sys.tables tbl ON c.object_id = tbl.object_id
+    JOIN sys.schemas s ON tbl.schema_id = s.schema_id
+    WHERE tbl.object_id IN ({placeholders})
+    ORDER BY s.name, tbl.name, c.column_id
+    """
     
+    params = tuple(f"{schema}.{table}" for schema, table in tables)
+    
+    # Run the query directly rather than through execute_query, whose empty
+    # result on error would make every table look missing
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        print(f"SQL command error: {e}")
-        print(f"stderr: {e.stderr}")
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            column_names = [column[0] for column in cursor.description]
+            rows = [dict(zip(column_names, row)) for row in cursor]
+    except Exception as e:
+        logger.error(f"Could not read table metadata: {e}")
         return None
+    
+    columns = defaultdict(list)
+    for row in rows:
+        columns[(row['schema_name'], row['table_name'])].append(row)
+    return columns
 
 def main():
     """Main entry point for the script."""
@@ -45,51 +73,44 @@ def main():
     
     # Get database configuration from environment variables or file
     db_config = get_db_config(args.env_file)
-    print(db_config)
     
     # Override with command-line arguments if provided
-    server = args.server or db_config['server']
-    username = args.username or db_config['username']
-    password = args.password or db_config['password']
-    database = args.database or db_config['database']
+    DB_CONFIG['server'] = args.server or db_config['server']
+    DB_CONFIG['username'] = args.username or db_config['username']
+    DB_CONFIG['password'] = args.password or db_config['password']
+    DB_CONFIG['database'] = args.database or db_config['database']
     
     # Validate required parameters
-    if not server:
-        print("Error: Server address is required")
+    if not DB_CONFIG['server']:
+        logger.error("Server address is required")
         return
-    if not username:
-        print("Error: Username is required")
+    if not DB_CONFIG['username']:
+        logger.error("Username is required")
         return
-    if not password:
-        print("Error: Password is required")
+    if not DB_CONFIG['password']:
+        logger.error("Password is required")
         return
-    if not database:
-        print("Error: Database name is required")
+    if not DB_CONFIG['database']:
+        logger.error("Database name is required")
         return
     
-    # Check members
-    print("Checking Members table...")
-    result = run_sql_command(
-        server, username, password, database,
-        "SELECT TOP 1 * FROM Insurance.Members"
-    )
-    print(result)
-    
-    # Check coverage plans
-    print("\nChecking CoveragePlans table...")
-    result = run_sql_command(
-        server, username, password, database,
-        "SELECT TOP 1 * FROM Insurance.CoveragePlans"
-    )
-    print(result)
+    columns = get_table_columns()
+    if columns is None:
+        return
     
-    # Check providers
-    print("\nChecking Providers table...")
-    result = run_sql_command(
-        server, username, password, database,
-        "SELECT TOP 1 * FROM Insurance.Providers"
-    )
-    print(result)
+    for schema, table in DESCRIBE_TABLES:
+        print(f"\nChecking {schema}.{table} table...")
+        table_columns = columns.get((schema, table))
+        if not table_columns:
+            print("  Table not found")
+            continue
+        # Write each table's columns in one call rather than a print per column
+        sys.stdout.write("".join(format_column(column) for column in table_columns))
+
+def format_column(column):
+    """Format a column metadata row as an indented output line."""
+    nullable = 'NULL' if column['is_nullable'] else 'NOT NULL'
+    return f"  {column['column_name']} {column['data_type']}({column['max_length']}) {nullable}\n"
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -5,8 +5,9 @@
 import logging
 import sys
 import os
-from health_insurance_au.utils.db_utils import execute_non_query, execute_query
+from health_insurance_au.utils.db_utils import execute_non_query, execute_query, get_connection
 from health_insurance_au.config import DB_CONFIG, LOG_CONFIG
+from health_insurance_au.schema import CDC_TABLES, CDC_ALL_CHANGES_ONLY_TABLES
 from health_insurance_au.utils.logging_config import configure_logging, get_logger
 from health_insurance_au.utils.env_utils import get_db_config
 
@@ -43,39 +44,97 @@ def enable_cdc_on_database(database_name):
         logger.error(f"Failed to enable CDC on database {database_name}: {e}")
         return False
 
-def enable_cdc_on_table(schema_name, table_name, role_name='cdc_admin'):
+def build_enable_cdc_sql(schema_name, table_name, role_name='cdc_admin', supports_net_changes=False):
+    """
+    Build the T-SQL statement that enables CDC on a table.
+    
+    Net-change support maintains an extra index on the change table, so it is only
+    requested for tables whose net changes are actually queried.
+    """
+    return f"""
+    EXEC sys.sp_cdc_enable_table
+        @source_schema = '{schema_name}',
+        @source_name = '{table_name}',
+        @role_name = '{role_name}',
+        @supports_net_changes = {1 if supports_net_changes else 0};
+    """
+
+def get_cdc_tracked_tables():
+    """
+    Get the tables that already have CDC enabled.
+    
+    Returns:
+        A set of (schema, table) pairs
+    """
+    rows = execute_query("""
+    SELECT s.name AS schema_name, t.name AS table_name
+    FROM sys.tables t
+    JOIN sys.schemas s ON t.schema_id = s.schema_id
+    WHERE t.is_tracked_by_cdc = 1
+    """)
+    return {(row['schema_name'], row['table_name']) for row in rows}
+
+def enable_cdc_on_table(schema_name, table_name, role_name='cdc_admin', supports_net_changes=False):
     """Enable CDC on a specific table."""
-    logger.info(f"Enabling CDC on table {schema_name}.{table_name}...")
+    return enable_cdc_on_tables([(schema_name, table_name)], role_name,
+                                net_change_tables={(schema_name, table_name)} if supports_net_changes else set())
+
+def enable_cdc_on_tables(tables, role_name='cdc_admin', net_change_tables=None):
+    """
+    Enable CDC on several tables with a single batch.
     
-    # Enable CDC on the table
-    sql = f"""
-    IF NOT EXISTS (
-        SELECT 1 FROM sys.tables t
-        JOIN sys.schemas s ON t.schema_id = s.schema_id
-        WHERE s.name = '{schema_name}' AND t.name = '{table_name}' AND t.is_tracked_by_cdc = 1
-    )
-    BEGIN
-        EXEC sys.sp_cdc_enable_table
-            @source_schema = '{schema_name}',
-            @source_name = '{table_name}',
-            @role_name = '{role_name}',
-            @supports_net_changes = 1;
-        PRINT 'CDC enabled on table {schema_name}.{table_name}';
-    END
-    ELSE
-    BEGIN
-        PRINT 'CDC already enabled on table {schema_name}.{table_name}';
-    END
+    Tables that are already tracked are looked up once up front and skipped,
+    and the tracked tables are checked again afterwards.
+    
+    Args:
+        tables: (schema, table) pairs to enable CDC on
+        role_name: The gating role for access to the change data
+        net_change_tables: (schema, table) pairs that should support net changes
+        
+    Returns:
+        True if the batch succeeded, False otherwise
     """
+    net_change_tables = net_change_tables or set()
     
-    try:
-        result = execute_non_query(sql)
-        logger.info(f"CDC enable table result: {result}")
-        logger.info(f"CDC enabled on table {schema_name}.{table_name}")
+    tracked_tables = get_cdc_tracked_tables()
+    for schema, table in tables:
+        if (schema, table) in tracked_tables:
+            logger.info(f"CDC already enabled on table {schema}.{table}")
+    tables = [table for table in tables if table not in tracked_tables]
+    if not tables:
         return True
+    
+    table_names = ', '.join(f"{schema}.{table}" for schema, table in tables)
+    logger.info(f"Enabling CDC on tables {table_names}...")
+    
+    # One batch for all tables instead of a round trip per table
+    sql = "SET XACT_ABORT ON;\n" + "".join(
+        build_enable_cdc_sql(schema, table, role_name, (schema, table) in net_change_tables)
+        for schema, table in tables
+    )
+    
+    # Run the batch on a cursor directly; execute_non_query logs and swallows
+    # errors, and under XACT_ABORT the first failing table aborts the rest
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql)
+            while cursor.nextset():
+                pass
     except Exception as e:
-        logger.error(f"Failed to enable CDC on table {schema_name}.{table_name}: {e}")
+        logger.error(f"Failed to enable CDC on tables {table_names}: {e}")
+        return False
+    
+    # Confirm every table is now tracked rather than trusting the batch
+    tracked_tables = get_cdc_tracked_tables()
+    untracked_tables = [table for table in tables if table not in tracked_tables]
+    if untracked_tables:
+        untracked_names = ', '.join(f"{schema}.{table}" for schema, table in untracked_tables)
+        logger.error(f"CDC is not enabled on tables {untracked_names}")
         return False
+    
+    logger.info(f"CDC enabled on tables {table_names}")
+    return True
 
 def main():
     """Main entry point for the script."""
@@ -130,23 +189,10 @@ def main():
         sys.exit(1)
     
     # Enable CDC on key tables
-    tables = [
-        ('Insurance', 'Members'),
-        ('Insurance', 'CoveragePlans'),
-        ('Insurance', 'Policies'),
-        ('Insurance', 'PolicyMembers'),
-        ('Insurance', 'Providers'),
-        ('Insurance', 'Claims'),
-        ('Insurance', 'PremiumPayments'),
-        ('Regulatory', 'PHIRebateTiers'),
-        ('Regulatory', 'MBSItems'),
-        ('Integration', 'SyntheaPatients'),
-        ('Integration', 'SyntheaEncounters'),
-        ('Integration', 'SyntheaProcedures')
-    ]
-    
-    for schema, table in tables:
-        enable_cdc_on_table(schema, table)
+    net_change_tables = set(CDC_TABLES) - CDC_ALL_CHANGES_ONLY_TABLES
+    if not enable_cdc_on_tables(CDC_TABLES, net_change_tables=net_change_tables):
+        logger.error("Failed to enable CDC on tables, exiting")
+        sys.exit(1)
     
     logger.info("CDC setup completed successfully")
 
@@ -429,8 +429,50 @@ def initialize_database(server=None, database=None, username=None, password=None
                 )
                 """)
 
-                
-  
+                # Indexes supporting date-range predicates on premium scheduling
+                logger.info("Creating indexes...")
+                execute_script(conn, """
+                IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = N'IX_Policies_NextPremiumDueDate' AND object_id = OBJECT_ID(N'Insurance.Policies'))
+                CREATE NONCLUSTERED INDEX IX_Policies_NextPremiumDueDate ON Insurance.Policies (NextPremiumDueDate)
+                """)
+                execute_script(conn, """
+                IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = N'IX_PremiumPayments_PaymentDate' AND object_id = OBJECT_ID(N'Insurance.PremiumPayments'))
+                CREATE NONCLUSTERED INDEX IX_PremiumPayments_PaymentDate ON Insurance.PremiumPayments (PaymentDate)
+                """)
+
+                # Indexed view keeping a running member count per IsActive value, so
+                # daily parameter calculation reads one row instead of scanning Members
+                logger.info("Creating summary views...")
+                execute_script(conn, """
+                IF OBJECT_ID(N'Insurance.MemberCounts', N'V') IS NULL
+                EXEC('CREATE VIEW Insurance.MemberCounts WITH SCHEMABINDING AS
+                      SELECT IsActive, COUNT_BIG(*) AS MemberCount
+                      FROM Insurance.Members
+                      GROUP BY IsActive')
+                """)
+                execute_script(conn, """
+                IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = N'IX_MemberCounts_IsActive' AND object_id = OBJECT_ID(N'Insurance.MemberCounts'))
+                CREATE UNIQUE CLUSTERED INDEX IX_MemberCounts_IsActive ON Insurance.MemberCounts (IsActive)
+                """)
+
+                # Table type for sending large batches of premium payments as a
+                # single table-valued parameter
+                logger.info("Creating table types...")
+                execute_script(conn, """
+                IF TYPE_ID(N'Insurance.PremiumPaymentRows') IS NULL
+                CREATE TYPE Insurance.PremiumPaymentRows AS TABLE (
+                    PolicyID INT NOT NULL,
+                    PaymentDate DATE NOT NULL,
+                    PaymentAmount DECIMAL(10,2) NOT NULL,
+                    PaymentMethod VARCHAR(20) NOT NULL,
+                    PaymentReference VARCHAR(50) NULL,
+                    PaymentStatus VARCHAR(20) NOT NULL,
+                    PeriodStartDate DATE NOT NULL,
+                    PeriodEndDate DATE NOT NULL,
+                    LastModified DATETIME2 NOT NULL
+                )
+                """)
+
                 logger.info("Database initialization completed successfully")
                 return True
         except Exception as e:
@@ -4,16 +4,124 @@
 import argparse
 import logging
 from datetime import datetime, timedelta
+import csv
+from collections import Counter
 import json
 import os
 
-from health_insurance_au.db.cdc import get_cdc_changes, get_cdc_net_changes, list_cdc_tables
+from health_insurance_au.db.cdc import (
+    get_cdc_changes, get_cdc_net_changes, get_all_cdc_change_counts, get_cdc_max_lsns,
+    list_cdc_tables
+)
+from health_insurance_au.utils.cdc_utils import CDC_OPERATION_NAMES
 from health_insurance_au.utils.logging_config import configure_logging, get_logger
 from health_insurance_au.config import LOG_CONFIG
 
 # Set up logging
 logger = get_logger(__name__)
 
+# Reports are written to the project's reports directory
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'reports')
+
+# Latest LSN seen per capture instance by the last --skip-unchanged summary
+CDC_STATE_FILE = os.path.join(REPORTS_DIR, '.cdc_state.json')
+
+# Buffer size for report files
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+def save_changes(changes, output_file, output_format='json'):
+    """Write CDC change rows to a JSON, CSV or Parquet file. Returns True on success."""
+    if output_format == 'parquet':
+        # pyarrow is optional and only needed for Parquet output
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            logger.error("Parquet output requires pyarrow (pip install pyarrow)")
+            return False
+        
+        # Let pyarrow pivot the rows into its columnar layout natively rather than
+        # building a Python list per column first; compressed with snappy
+        pq.write_table(pa.Table.from_pylist(changes), output_file, compression='snappy')
+        return True
+    
+    # A large buffer amortizes write syscalls for big exports
+    if output_format == 'csv':
+        # All rows come from one result set, so their values share the header's
+        # column order and can be written positionally without per-row key lookups
+        with open(output_file, 'w', newline='', buffering=WRITE_BUFFER_SIZE, encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(changes[0].keys())
+            writer.writerows(change.values() for change in changes)
+    else:
+        with open(output_file, 'w', buffering=WRITE_BUFFER_SIZE, encoding='utf-8') as f:
+            json.dump(changes, f, default=str, indent=2)
+    return True
+
+def load_cdc_state():
+    """Load the latest LSN per capture instance recorded by the previous run."""
+    try:
+        with open(CDC_STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cdc_state(state):
+    """Record the latest LSN per capture instance for the next run."""
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    with open(CDC_STATE_FILE, 'w') as f:
+        json.dump(state, f)
+
+def summarize_changes(from_time, to_time, net_changes=False, skip_unchanged=False):
+    """
+    Log insert/update/delete counts for every table with CDC enabled.
+    
+    With skip_unchanged, tables whose change table has not advanced since the
+    previous --skip-unchanged run are left out entirely, even if they have
+    changes inside the from_time/to_time window; the flag means "changed since
+    the last run", not "changed within the window".
+    """
+    capture_instances = None
+    current_state = None
+    if skip_unchanged:
+        # Only count tables whose change table has advanced since the last run
+        current_state = get_cdc_max_lsns()
+        if not current_state:
+            logger.warning("Could not read the latest CDC LSNs; counting every table")
+        else:
+            previous_state = load_cdc_state()
+            capture_instances = {
+                instance for instance, max_lsn in current_state.items()
+                if max_lsn != previous_state.get(instance)
+            }
+            logger.info(f"Skipping {len(current_state) - len(capture_instances)} tables "
+                        f"with no changes since the last run (their counts for this "
+                        f"window are not shown)")
+            if not capture_instances:
+                return
+    
+    # One batched query covers every tracked table
+    summary = get_all_cdc_change_counts(from_time, to_time, net_changes, capture_instances)
+    if not summary:
+        logger.info("No CDC change counts found.")
+        return
+    
+    logger.info(f"Change summary from {from_time} to {to_time}:")
+    totals = Counter()
+    for table in summary:
+        counts = table['counts']
+        logger.info(f"  {table['schema_name']}.{table['table_name']}: "
+                    f"{counts[2]} inserts, {counts[4]} updates, {counts[1]} deletes")
+        # Add every operation's count to the running totals in one call
+        totals.update(counts)
+    logger.info(f"  Total across {len(summary)} tables: "
+                f"{totals[2]} inserts, {totals[4]} updates, {totals[1]} deletes")
+    
+    # Only move the saved state forward once this run's summary has been reported,
+    # so a failed run does not make the next one skip tables it never counted
+    if current_state:
+        save_cdc_state(current_state)
+
 def main():
     """Main entry point for the script."""
     parser = argparse.ArgumentParser(description='Monitor CDC changes in the Health Insurance AU database')
@@ -21,7 +129,14 @@ def main():
     parser.add_argument('--table', default='Members', help='Table name')
     parser.add_argument('--hours', type=int, default=24, help='Number of hours to look back')
     parser.add_argument('--list-tables', action='store_true', help='List all tables with CDC enabled')
-    parser.add_argument('--net-changes', action='store_true', help='Show only net changes')
+    parser.add_argument('--summary', action='store_true',
+                        help='Show per-operation change counts for all tables with CDC enabled')
+    parser.add_argument('--skip-unchanged', action='store_true',
+                        help='With --summary, skip tables with no new changes since the last '
+                             '--skip-unchanged run, even if they changed within --hours')
+    parser.add_argument('--net-changes', action='store_true', help='Show only net changes (table must have net-change support enabled)')
+    parser.add_argument('--format', choices=['json', 'csv', 'parquet'], default='json',
+                        help='Output format for the saved changes')
     parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'], 
                         default=os.environ.get('HEALTH_INSURANCE_LOG_LEVEL', LOG_CONFIG['default_level']),
                         help='Set the logging level')
@@ -49,9 +164,14 @@ def main():
             logger.info("No tables with CDC enabled found.")
         return
     
-    # Calculate the time range
+    # Calculate the time range; the end time also stamps any report written by this run
     to_time = datetime.now()
     from_time = to_time - timedelta(hours=args.hours)
+    run_timestamp = to_time.strftime('%Y%m%d_%H%M%S')
+    
+    if args.summary:
+        summarize_changes(from_time, to_time, args.net_changes, args.skip_unchanged)
+        return
     
     logger.info(f"Monitoring CDC changes for {args.schema}.{args.table}")
     logger.info(f"Time range: {from_time} to {to_time}")
@@ -64,9 +184,15 @@ def main():
         logger.info(f"Found {len(changes)} changes")
     
     if changes:
+        # Tally operations in a single pass
+        operation_counts = Counter(change.get('__$operation') for change in changes)
+        logger.info(f"Operations: {operation_counts.get(2, 0)} inserts, "
+                    f"{operation_counts.get(4, 0)} updates, {operation_counts.get(1, 0)} deletes")
+        
         # Pretty print the first 5 changes
         for i, change in enumerate(changes[:5]):
-            logger.info(f"Change {i+1}:")
+            operation = CDC_OPERATION_NAMES.get(change.get('__$operation'), 'UPDATE')
+            logger.info(f"Change {i+1} ({operation}):")
             for key, value in change.items():
                 logger.info(f"  {key}: {value}")
         
@@ -74,14 +200,11 @@ def main():
             logger.info(f"... and {len(changes) - 5} more changes")
         
         # Save all changes to a file
-        output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'reports')
-        os.makedirs(output_dir, exist_ok=True)
-        output_file = os.path.join(output_dir, f"cdc_changes_{args.schema}_{args.table}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-        
-        with open(output_file, 'w') as f:
-            json.dump(changes, f, default=str, indent=2)
+        os.makedirs(REPORTS_DIR, exist_ok=True)
+        output_file = os.path.join(REPORTS_DIR, f"cdc_changes_{args.schema}_{args.table}_{run_timestamp}.{args.format}")
         
-        logger.info(f"All changes saved to {output_file}")
+        if save_changes(changes, output_file, args.format):
+            logger.info(f"All changes saved to {output_file}")
     else:
         logger.info("No changes found in the specified time range")
 
@@ -26,6 +26,9 @@
         "pytest",
         "pytest-cov",
     ],
+    extras_require={
+        "parquet": ["pyarrow>=7.0"],
+    },
     entry_points={
         "console_scripts": [
             "hi-init-db=health_insurance_au.cli.initialize_db:main",
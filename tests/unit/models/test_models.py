@@ -496,4 +496,23 @@ def test_premium_payment_to_dict(self):
         assert result['PaymentReference'] == 'PMT-20220401-12345'
         assert result['PaymentStatus'] == 'Successful'
         assert result['PeriodStartDate'] == date(2022, 4, 1)
-        assert result['PeriodEndDate'] == date(2022, 4, 30)
\ No newline at end of file
+        assert result['PeriodEndDate'] == date(2022, 4, 30)
+    
+    def test_premium_payment_to_row(self):
+        """Test converting a PremiumPayment object to a row tuple."""
+        # Arrange
+        payment = PremiumPayment(
+            policy_id=1,
+            payment_date=date(2022, 4, 1),
+            payment_amount=300.0,
+            payment_method='Credit Card',
+            period_start_date=date(2022, 4, 1),
+            period_end_date=date(2022, 4, 30),
+            payment_reference='PMT-20220401-12345'
+        )
+        
+        # Act
+        result = payment.to_row()
+        
+        # Assert
+        assert result == tuple(payment.to_dict()[column] for column in PremiumPayment.COLUMNS)
\ No newline at end of file
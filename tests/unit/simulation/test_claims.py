@@ -8,7 +8,7 @@
 
 from health_insurance_au.simulation.claims import (
     generate_hospital_claims, generate_general_treatment_claims,
-    generate_claim_number
+    generate_claim_number, generate_claim_numbers
 )
 from health_insurance_au.models.models import Member, Policy, Provider, Claim
 
@@ -110,26 +110,38 @@ def test_generate_claim_number(self):
         assert self.test_date.strftime('%Y%m%d') in claim_number
         assert len(claim_number) == 19  # Format: CLM-YYYYMMDD-NNNNN
     
+    def test_generate_claim_numbers(self):
+        """Test generating a batch of claim numbers."""
+        # Act
+        claim_numbers = generate_claim_numbers(3, self.test_date)
+        
+        # Assert
+        assert len(claim_numbers) == 3
+        for claim_number in claim_numbers:
+            assert claim_number.startswith(f"CLM-{self.test_date.strftime('%Y%m%d')}-")
+            assert len(claim_number) == 19  # Format: CLM-YYYYMMDD-NNNNN
+    
     @patch('health_insurance_au.simulation.claims.random.choices')
     @patch('health_insurance_au.simulation.claims.random.choice')
     @patch('health_insurance_au.utils.datetime_utils.generate_random_datetime')
     @patch('health_insurance_au.simulation.claims.random.uniform')
-    @patch('health_insurance_au.simulation.claims.generate_claim_number')
+    @patch('health_insurance_au.simulation.claims.generate_claim_numbers')
     def test_generate_hospital_claims(self, mock_gen_number, mock_uniform, mock_datetime, mock_choice, mock_choices):
         """Test generating hospital claims."""
         # Arrange
-        mock_gen_number.return_value = 'CLM-20220415-00001'
+        mock_gen_number.return_value = ['CLM-20220415-00001']
         mock_uniform.return_value = 0.5  # For random calculations
         mock_datetime.side_effect = [
             datetime.combine(self.test_date - timedelta(days=5), time(10, 0, 0)),  # Service date
             datetime.combine(self.test_date - timedelta(days=3), time(14, 0, 0))   # Submission date
         ]
-        mock_choice.side_effect = [
-            self.test_policies[0],  # Choose first policy
-            self.test_providers[0],  # Choose first provider
-            {'description': 'Appendectomy', 'number': '30571', 'fee': 445.40},  # MBS item
+        mock_choices.side_effect = [
+            [self.test_policies[0]],  # Choose first policy
+            [self.test_providers[0]],  # Choose first provider
+            [{'description': 'Appendectomy', 'number': '30571', 'fee': 445.40, 'medicare_benefit': 334.05}],  # MBS item
+            ['Submitted'],  # Status
+            [False],  # Excess not applied
         ]
-        mock_choices.return_value = ['Submitted']  # Status
         
         # Act
         claims = generate_hospital_claims(
@@ -160,23 +172,25 @@ def test_generate_hospital_claims(self, mock_gen_number, mock_uniform, mock_date
     @patch('health_insurance_au.simulation.claims.random.choice')
     @patch('health_insurance_au.utils.datetime_utils.generate_random_datetime')
     @patch('health_insurance_au.simulation.claims.random.uniform')
-    @patch('health_insurance_au.simulation.claims.generate_claim_number')
+    @patch('health_insurance_au.simulation.claims.generate_claim_numbers')
     def test_generate_general_treatment_claims(self, mock_gen_number, mock_uniform, mock_datetime, mock_choice, mock_choices):
         """Test generating general treatment claims."""
         # Arrange
-        mock_gen_number.return_value = 'CLM-20220415-00001'
+        mock_gen_number.return_value = ['CLM-20220415-00001']
         mock_uniform.return_value = 0.5  # For random calculations
         mock_datetime.side_effect = [
             datetime.combine(self.test_date - timedelta(days=2), time(10, 0, 0)),  # Service date
             datetime.combine(self.test_date - timedelta(days=1), time(14, 0, 0))   # Submission date
         ]
         mock_choice.side_effect = [
-            self.test_policies[0],  # Choose first policy
-            'Dental',  # Claim type
             self.test_providers[1],  # Choose second provider (dental)
-            {'description': 'Dental Checkup', 'fee': 120.00},  # Service
         ]
-        mock_choices.return_value = ['Submitted']  # Status
+        mock_choices.side_effect = [
+            [self.test_policies[0]],  # Choose first policy
+            # Claim type, matching providers and service
+            [('Dental', [self.test_providers[1]], {'description': 'Dental Checkup', 'fee': 120.00})],
+            ['Submitted'],  # Status
+        ]
         
         # Act
         claims = generate_general_treatment_claims(
@@ -6,7 +6,7 @@
 from datetime import date, timedelta
 
 from health_insurance_au.simulation.payments import (
-    generate_premium_payments, generate_payment_reference
+    generate_premium_payments, generate_payment_reference, generate_payment_references
 )
 from health_insurance_au.models.models import Policy, PremiumPayment
 
@@ -81,11 +81,22 @@ def test_generate_payment_reference_default_date(self):
         assert date.today().strftime('%Y%m%d') in payment_ref
         assert len(payment_ref) == 19  # Format: PMT-YYYYMMDD-NNNNN
     
-    @patch('health_insurance_au.simulation.payments.generate_payment_reference')
+    def test_generate_payment_references(self):
+        """Test generating a batch of payment references."""
+        # Act
+        payment_refs = generate_payment_references(3, self.test_date)
+        
+        # Assert
+        assert len(payment_refs) == 3
+        for payment_ref in payment_refs:
+            assert payment_ref.startswith(f"PMT-{self.test_date.strftime('%Y%m%d')}-")
+            assert len(payment_ref) == 19  # Format: PMT-YYYYMMDD-NNNNN
+    
+    @patch('health_insurance_au.simulation.payments.generate_payment_references')
     def test_generate_premium_payments(self, mock_gen_reference):
         """Test generating premium payments."""
         # Arrange
-        mock_gen_reference.side_effect = [
+        mock_gen_reference.return_value = [
             'PMT-20220415-00001',
             'PMT-20220415-00002'
         ]
@@ -200,8 +211,8 @@ def test_generate_premium_payments_different_payment_methods(self):
         setattr(policies[0], 'policy_id', 5)
         
         # Act
-        with patch('health_insurance_au.simulation.payments.generate_payment_reference') as mock_gen_ref:
-            mock_gen_ref.return_value = 'PMT-20220415-00001'
+        with patch('health_insurance_au.simulation.payments.generate_payment_references') as mock_gen_ref:
+            mock_gen_ref.return_value = ['PMT-20220415-00001']
             payments = generate_premium_payments(policies, self.test_date)
         
         # Assert
@@ -228,8 +239,8 @@ def test_generate_premium_payments_annual_frequency(self):
         setattr(policies[0], 'policy_id', 6)
         
         # Act
-        with patch('health_insurance_au.simulation.payments.generate_payment_reference') as mock_gen_ref:
-            mock_gen_ref.return_value = 'PMT-20220415-00001'
+        with patch('health_insurance_au.simulation.payments.generate_payment_references') as mock_gen_ref:
+            mock_gen_ref.return_value = ['PMT-20220415-00001']
             payments = generate_premium_payments(policies, self.test_date)
         
         # Assert
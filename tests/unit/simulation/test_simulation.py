@@ -1,6 +1,7 @@
 """
 Unit tests for the main simulation module.
 """
+import threading
 import pytest
 from unittest.mock import patch, MagicMock, call
 from datetime import date, datetime, timedelta
@@ -116,12 +117,13 @@ def setup_method(self):
             )
         ]
     
-    @patch('health_insurance_au.simulation.simulation.execute_query')
-    def test_load_data_from_db(self, mock_execute_query):
+    @patch('health_insurance_au.simulation.simulation.iter_query')
+    def test_load_data_from_db(self, mock_iter_query):
         """Test loading data from the database."""
         # Arrange
         # Mock member data
-        mock_execute_query.side_effect = [
+        # The tables are loaded concurrently, so answer each query by its text
+        table_rows = [
             # Members
             [
                 {
@@ -207,17 +209,20 @@ def test_load_data_from_db(self, mock_execute_query):
             ]
         ]
         
+        queries = [
+            "SELECT * FROM Insurance.Members",
+            "SELECT * FROM Insurance.CoveragePlans",
+            "SELECT * FROM Insurance.Policies",
+            "SELECT * FROM Insurance.Providers"
+        ]
+        mock_iter_query.side_effect = dict(zip(queries, table_rows)).get
+        
         # Act
         self.simulation.load_data_from_db()
         
         # Assert
-        assert mock_execute_query.call_count == 4
-        mock_execute_query.assert_has_calls([
-            call("SELECT * FROM Insurance.Members"),
-            call("SELECT * FROM Insurance.CoveragePlans"),
-            call("SELECT * FROM Insurance.Policies"),
-            call("SELECT * FROM Insurance.Providers")
-        ])
+        assert mock_iter_query.call_count == 4
+        mock_iter_query.assert_has_calls([call(query) for query in queries], any_order=True)
         
         # Check that data was loaded correctly
         assert len(self.simulation.members) == 1
@@ -235,6 +240,30 @@ def test_load_data_from_db(self, mock_execute_query):
         assert len(self.simulation.providers) == 1
         assert self.simulation.providers[0].provider_number == 'P10001'
     
+    @patch('health_insurance_au.simulation.simulation.close_connections')
+    @patch('health_insurance_au.simulation.simulation.iter_query')
+    def test_load_data_from_db_reuses_loader_threads(self, mock_iter_query, mock_close_connections):
+        """Test that daily loads share one set of loader threads until close."""
+        # Arrange
+        mock_iter_query.return_value = []
+        closing_threads = []
+        mock_close_connections.side_effect = lambda: closing_threads.append(threading.get_ident())
+        
+        # Act
+        self.simulation.load_data_from_db()
+        loaders = self.simulation._loaders
+        self.simulation.load_data_from_db()
+        
+        # Assert
+        assert self.simulation._loaders is loaders
+        mock_close_connections.assert_not_called()
+        
+        # Each loader thread closes its own connections, then the calling thread
+        self.simulation.close()
+        assert self.simulation._loaders is None
+        assert len(set(closing_threads[:-1])) == 4
+        assert closing_threads[-1] == threading.get_ident()
+    
     @patch('health_insurance_au.simulation.simulation.load_sample_data')
     @patch('health_insurance_au.simulation.simulation.convert_to_members')
     @patch('health_insurance_au.simulation.simulation.bulk_insert')
@@ -256,6 +285,24 @@ def test_add_members_from_static_data(self, mock_bulk_insert, mock_convert, mock
         # Check that members were added to the simulation
         assert len(self.simulation.members) == 2
     
+    @patch('health_insurance_au.simulation.simulation.load_sample_data')
+    @patch('health_insurance_au.simulation.simulation.convert_to_members')
+    @patch('health_insurance_au.simulation.simulation.bulk_insert')
+    def test_add_members_reuses_static_data(self, mock_bulk_insert, mock_convert, mock_load_data):
+        """Test that static sample data is read once and reused across calls."""
+        # Arrange
+        mock_load_data.return_value = [{'first_name': 'John', 'last_name': 'Doe'}]
+        mock_convert.return_value = self.test_members
+        mock_bulk_insert.return_value = 2
+        
+        # Act
+        self.simulation.add_members(count=2, simulation_date=self.test_date, use_dynamic_data=False)
+        self.simulation.add_members(count=2, simulation_date=self.test_date, use_dynamic_data=False)
+        
+        # Assert
+        mock_load_data.assert_called_once()
+        assert mock_convert.call_count == 2
+    
     @patch('health_insurance_au.simulation.simulation.generate_dynamic_data')
     @patch('health_insurance_au.simulation.simulation.convert_dynamic_to_members')
     @patch('health_insurance_au.simulation.simulation.bulk_insert')
@@ -337,48 +384,50 @@ def test_create_new_policies(self, mock_bulk_insert, mock_generate_policies):
         assert len(self.simulation.policies) == 2
     
     @patch('health_insurance_au.simulation.simulation.random.sample')
-    @patch('health_insurance_au.simulation.simulation.execute_non_query')
-    def test_update_members(self, mock_execute_non_query, mock_random_sample):
+    @patch('health_insurance_au.simulation.simulation.execute_many')
+    def test_update_members(self, mock_execute_many, mock_random_sample):
         """Test updating members."""
         # Arrange
         self.simulation.members = self.test_members
         mock_random_sample.return_value = [self.test_members[0]]  # Select first member for update
-        mock_execute_non_query.return_value = 1
+        mock_execute_many.return_value = 1
         
         # Act
         self.simulation.update_members(percentage=50.0, simulation_date=self.test_date)
         
         # Assert
         mock_random_sample.assert_called_once_with(self.test_members, 1)
-        mock_execute_non_query.assert_called_once()
+        mock_execute_many.assert_called_once()
         
-        # Check that the query includes the member number
-        args = mock_execute_non_query.call_args[0]
-        assert 'M10001' in args[1]  # Member number should be in the parameters
+        # Check that the batched parameters include the member number
+        params_list = mock_execute_many.call_args[0][1]
+        assert len(params_list) == 1
+        assert 'M10001' in params_list[0]  # Member number should be in the parameters
     
     @patch('health_insurance_au.simulation.simulation.random.sample')
-    @patch('health_insurance_au.simulation.simulation.execute_non_query')
-    def test_process_policy_changes(self, mock_execute_non_query, mock_random_sample):
+    @patch('health_insurance_au.simulation.simulation.execute_many')
+    def test_process_policy_changes(self, mock_execute_many, mock_random_sample):
         """Test processing policy changes."""
         # Arrange
         self.simulation.policies = self.test_policies
         mock_random_sample.return_value = [self.test_policies[0]]  # Select first policy for update
-        mock_execute_non_query.return_value = 1
+        mock_execute_many.return_value = 1
         
         # Act
         self.simulation.process_policy_changes(percentage=50.0, simulation_date=self.test_date)
         
         # Assert
         mock_random_sample.assert_called_once_with(self.test_policies, 1)
-        mock_execute_non_query.assert_called_once()
+        mock_execute_many.assert_called_once()
         
-        # Check that the query includes the policy number
-        args = mock_execute_non_query.call_args[0]
-        assert 'POL10001' in args[1]  # Policy number should be in the parameters
+        # Check that the batched parameters include the policy number
+        params_list = mock_execute_many.call_args[0][1]
+        assert len(params_list) == 1
+        assert 'POL10001' in params_list[0]  # Policy number should be in the parameters
     
     @patch('health_insurance_au.simulation.simulation.generate_hospital_claims')
-    @patch('health_insurance_au.simulation.simulation.bulk_insert')
-    def test_generate_hospital_claims(self, mock_bulk_insert, mock_generate_claims):
+    @patch('health_insurance_au.simulation.simulation.execute_many')
+    def test_generate_hospital_claims(self, mock_execute_many, mock_generate_claims):
         """Test generating hospital claims."""
         # Arrange
         self.simulation.policies = self.test_policies
@@ -400,7 +449,7 @@ def test_generate_hospital_claims(self, mock_bulk_insert, mock_generate_claims):
         ]
         
         mock_generate_claims.return_value = test_claims
-        mock_bulk_insert.return_value = 1
+        mock_execute_many.return_value = 1
         
         # Act
         self.simulation.generate_hospital_claims(count=1, simulation_date=self.test_date)
@@ -409,14 +458,14 @@ def test_generate_hospital_claims(self, mock_bulk_insert, mock_generate_claims):
         mock_generate_claims.assert_called_once_with(
             self.test_policies, self.test_members, self.test_providers, 1, self.test_date
         )
-        mock_bulk_insert.assert_called_once()
+        mock_execute_many.assert_called_once()
         
         # Check that claims were added to the simulation
         assert len(self.simulation.claims) == 1
     
     @patch('health_insurance_au.simulation.simulation.generate_general_treatment_claims')
-    @patch('health_insurance_au.simulation.simulation.bulk_insert')
-    def test_generate_general_treatment_claims(self, mock_bulk_insert, mock_generate_claims):
+    @patch('health_insurance_au.simulation.simulation.execute_many')
+    def test_generate_general_treatment_claims(self, mock_execute_many, mock_generate_claims):
         """Test generating general treatment claims."""
         # Arrange
         self.simulation.policies = self.test_policies
@@ -438,7 +487,7 @@ def test_generate_general_treatment_claims(self, mock_bulk_insert, mock_generate
         ]
         
         mock_generate_claims.return_value = test_claims
-        mock_bulk_insert.return_value = 1
+        mock_execute_many.return_value = 1
         
         # Act
         self.simulation.generate_general_treatment_claims(count=1, simulation_date=self.test_date)
@@ -447,15 +496,70 @@ def test_generate_general_treatment_claims(self, mock_bulk_insert, mock_generate
         mock_generate_claims.assert_called_once_with(
             self.test_policies, self.test_members, self.test_providers, 1, self.test_date
         )
-        mock_bulk_insert.assert_called_once()
+        mock_execute_many.assert_called_once()
         
         # Check that claims were added to the simulation
         assert len(self.simulation.claims) == 1
     
+    @patch('health_insurance_au.simulation.simulation.generate_general_treatment_claims')
+    @patch('health_insurance_au.simulation.simulation.generate_hospital_claims')
+    @patch('health_insurance_au.simulation.simulation.execute_many')
+    def test_generate_claims(self, mock_execute_many, mock_generate_hospital, mock_generate_general):
+        """Test generating hospital and general treatment claims in one batch."""
+        # Arrange
+        self.simulation.policies = self.test_policies
+        self.simulation.members = self.test_members
+        self.simulation.providers = self.test_providers
+        
+        hospital_claim = Claim(
+            claim_number='CLM10001',
+            policy_id=1,
+            member_id=1,
+            provider_id=1,
+            service_date=datetime(2022, 4, 10, 10, 0),
+            submission_date=datetime(2022, 4, 12, 14, 30),
+            claim_type='Hospital',
+            service_description='Appendectomy',
+            charged_amount=5000.0
+        )
+        general_claim = Claim(
+            claim_number='CLM10002',
+            policy_id=1,
+            member_id=1,
+            provider_id=2,
+            service_date=datetime(2022, 4, 10, 9, 0),
+            submission_date=datetime(2022, 4, 10, 10, 0),
+            claim_type='General',
+            service_description='Dental Checkup',
+            charged_amount=150.0
+        )
+        
+        mock_generate_hospital.return_value = [hospital_claim]
+        mock_generate_general.return_value = [general_claim]
+        mock_execute_many.return_value = 2
+        
+        # Act
+        self.simulation.generate_claims(1, 1, self.test_date)
+        
+        # Assert
+        mock_generate_hospital.assert_called_once_with(
+            self.test_policies, self.test_members, self.test_providers, 1, self.test_date
+        )
+        mock_generate_general.assert_called_once_with(
+            self.test_policies, self.test_members, self.test_providers, 1, self.test_date
+        )
+        
+        # Both kinds of claim should be written with a single insert
+        mock_execute_many.assert_called_once()
+        params_list = mock_execute_many.call_args[0][1]
+        assert [params[0] for params in params_list] == ['CLM10001', 'CLM10002']
+        assert params_list[0][-1] == self.test_date  # LastModified
+        assert self.simulation.claims == [hospital_claim, general_claim]
+    
     @patch('health_insurance_au.simulation.simulation.generate_premium_payments')
-    @patch('health_insurance_au.simulation.simulation.bulk_insert')
+    @patch('health_insurance_au.simulation.simulation.bulk_insert_rows')
     @patch('health_insurance_au.simulation.simulation.execute_non_query')
-    def test_process_premium_payments(self, mock_execute_non_query, mock_bulk_insert, mock_generate_payments):
+    def test_process_premium_payments(self, mock_execute_non_query, mock_bulk_insert_rows, mock_generate_payments):
         """Test processing premium payments."""
         # Arrange
         self.simulation.policies = self.test_policies
@@ -478,7 +582,7 @@ def test_process_premium_payments(self, mock_execute_non_query, mock_bulk_insert
         self.test_policies[0].next_premium_due_date = self.test_date + timedelta(days=30)
         
         mock_generate_payments.return_value = test_payments
-        mock_bulk_insert.return_value = 1
+        mock_bulk_insert_rows.return_value = 1
         mock_execute_non_query.return_value = 1
         
         # Act
@@ -486,42 +590,61 @@ def test_process_premium_payments(self, mock_execute_non_query, mock_bulk_insert
         
         # Assert
         mock_generate_payments.assert_called_once_with(self.test_policies, self.test_date)
-        mock_bulk_insert.assert_called_once()
+        mock_bulk_insert_rows.assert_called_once()
+        table_name, columns, rows, _ = mock_bulk_insert_rows.call_args[0]
+        assert table_name == "Insurance.PremiumPayments"
+        assert columns[-1] == 'LastModified'
+        assert list(rows) == [test_payments[0].to_row() + (self.test_date,)]
         mock_execute_non_query.assert_called_once()
         
         # Check that payments were added to the simulation
         assert len(self.simulation.premium_payments) == 1
     
-    @patch('health_insurance_au.simulation.simulation.execute_query')
-    @patch('health_insurance_au.simulation.simulation.random.sample')
-    @patch('health_insurance_au.simulation.simulation.execute_non_query')
-    def test_process_claim_assessments(self, mock_execute_non_query, mock_random_sample, mock_execute_query):
+    @patch('health_insurance_au.simulation.simulation.logger')
+    @patch('health_insurance_au.simulation.simulation.get_connection')
+    def test_process_claim_assessments(self, mock_get_connection, mock_logger):
         """Test processing claim assessments."""
         # Arrange
-        submitted_claims = [
-            {
-                'ClaimNumber': 'CLM10001',
-                'Status': 'Submitted',
-                'ServiceDate': self.test_date - timedelta(days=5),
-                'SubmissionDate': self.test_date - timedelta(days=2)
-            }
-        ]
+        cursor = MagicMock()
+        cursor.rowcount = 3
         
-        mock_execute_query.return_value = submitted_claims
-        mock_random_sample.return_value = submitted_claims
-        mock_execute_non_query.return_value = 1
+        def nextset():
+            # Moving past the last result set resets the row count, as pyodbc does
+            cursor.rowcount = -1
+            return False
+        
+        cursor.nextset.side_effect = nextset
+        mock_get_connection.return_value.__enter__.return_value.cursor.return_value = cursor
         
         # Act
-        self.simulation.process_claim_assessments(percentage=100.0, simulation_date=self.test_date)
+        self.simulation.process_claim_assessments(percentage=80.0, simulation_date=self.test_date)
         
         # Assert
-        mock_execute_query.assert_called_once()
-        mock_random_sample.assert_called_once_with(submitted_claims, 1)
-        mock_execute_non_query.assert_called_once()
+        cursor.execute.assert_called_once()
+        query, params = cursor.execute.call_args[0]
+        assert 'TOP (?) PERCENT' in query
+        assert params[0] == 80.0  # Percentage of submitted claims to process
+        assert params[1] == 5  # Number of rejection reasons to roll between
+        assert params[2] == self.test_date  # ProcessedDate
+        assert 'CHOOSE(1 + ch.ReasonRoll' in query  # Reason comes from the stored roll
+        assert 'Duplicate claim' in params  # Rejection reasons are bound as parameters
+        assert params[-2:] == (20, 90)  # Status cut-offs
+        mock_logger.info.assert_called_with("Processed 3 claims")
+    
+    @patch('health_insurance_au.simulation.simulation.logger')
+    @patch('health_insurance_au.simulation.simulation.get_connection')
+    def test_process_claim_assessments_error(self, mock_get_connection, mock_logger):
+        """Test that a failed claim assessment batch is reported as an error."""
+        # Arrange
+        cursor = mock_get_connection.return_value.__enter__.return_value.cursor.return_value
+        cursor.execute.side_effect = Exception("Deadlock")
+        
+        # Act
+        self.simulation.process_claim_assessments(percentage=80.0, simulation_date=self.test_date)
         
-        # Check that the query includes the claim number
-        args = mock_execute_non_query.call_args[0]
-        assert 'CLM10001' in args[1]  # Claim number should be in the parameters
+        # Assert
+        mock_logger.error.assert_called_once_with("Error processing claim assessments: Deadlock")
+        assert "No submitted claims to process" not in str(mock_logger.info.call_args_list)
     
     @patch('health_insurance_au.simulation.simulation.HealthInsuranceSimulation.load_data_from_db')
     @patch('health_insurance_au.simulation.simulation.HealthInsuranceSimulation.add_members')
@@ -530,13 +653,12 @@ def test_process_claim_assessments(self, mock_execute_non_query, mock_random_sam
     @patch('health_insurance_au.simulation.simulation.HealthInsuranceSimulation.create_new_policies')
     @patch('health_insurance_au.simulation.simulation.HealthInsuranceSimulation.update_members')
     @patch('health_insurance_au.simulation.simulation.HealthInsuranceSimulation.process_policy_changes')
-    @patch('health_insurance_au.simulation.simulation.HealthInsuranceSimulation.generate_hospital_claims')
-    @patch('health_insurance_au.simulation.simulation.HealthInsuranceSimulation.generate_general_treatment_claims')
+    @patch('health_insurance_au.simulation.simulation.HealthInsuranceSimulation.generate_claims')
     @patch('health_insurance_au.simulation.simulation.HealthInsuranceSimulation.process_premium_payments')
     @patch('health_insurance_au.simulation.simulation.HealthInsuranceSimulation.process_claim_assessments')
     def test_run_daily_simulation(
-        self, mock_process_claims, mock_process_payments, mock_gen_general_claims, 
-        mock_gen_hospital_claims, mock_process_policy_changes, mock_update_members,
+        self, mock_process_claims, mock_process_payments, mock_gen_claims, 
+        mock_process_policy_changes, mock_update_members,
         mock_create_policies, mock_add_providers, mock_add_plans, mock_add_members,
         mock_load_data
     ):
@@ -561,8 +683,7 @@ def test_run_daily_simulation(
         mock_create_policies.assert_called_once_with(4, self.test_date)
         mock_update_members.assert_called_once()
         mock_process_policy_changes.assert_called_once()
-        mock_gen_hospital_claims.assert_called_once_with(2, self.test_date)
-        mock_gen_general_claims.assert_called_once_with(5, self.test_date)
+        mock_gen_claims.assert_called_once_with(2, 5, self.test_date)
         mock_process_payments.assert_called_once_with(self.test_date)
         mock_process_claims.assert_called_once()
     
@@ -607,5 +728,27 @@ def test_run_historical_simulation_weekly(self, mock_run_daily):
         
         # Check that each week was simulated
         expected_dates = [date(2022, 4, 1), date(2022, 4, 8), date(2022, 4, 15), date(2022, 4, 22)]
+        for i, call_args in enumerate(mock_run_daily.call_args_list):
+            assert call_args[1]['simulation_date'] == expected_dates[i]
+    
+    @patch('health_insurance_au.simulation.simulation.HealthInsuranceSimulation.run_daily_simulation')
+    def test_run_historical_simulation_monthly(self, mock_run_daily):
+        """Test running a historical simulation with monthly frequency."""
+        # Arrange
+        start_date = date(2022, 1, 31)
+        end_date = date(2022, 4, 30)
+        
+        # Act
+        self.simulation.run_historical_simulation(
+            start_date=start_date,
+            end_date=end_date,
+            frequency='monthly'
+        )
+        
+        # Assert
+        assert mock_run_daily.call_count == 4  # Called once for each calendar month
+        
+        # Days past the end of a month clamp to that month's last day without drifting
+        expected_dates = [date(2022, 1, 31), date(2022, 2, 28), date(2022, 3, 31), date(2022, 4, 30)]
         for i, call_args in enumerate(mock_run_daily.call_args_list):
             assert call_args[1]['simulation_date'] == expected_dates[i]
\ No newline at end of file
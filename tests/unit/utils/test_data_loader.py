@@ -210,4 +210,33 @@ def test_convert_to_members_exception(self):
         result = convert_to_members(sample_data)
         
         # Assert
-        assert len(result) == 0
\ No newline at end of file
+        assert len(result) == 0
+    
+    def test_convert_to_members_interns_repeated_values(self):
+        """Test that repeated low-cardinality values share one string object."""
+        # Arrange
+        sample_data = [
+            {
+                'first_name': 'John',
+                'last_name': 'Doe',
+                'gender': ''.join(['Ma', 'le']),  # Build distinct string objects
+                'city': ''.join(['Syd', 'ney']),
+                'state': ''.join(['NS', 'W'])
+            },
+            {
+                'first_name': 'Jack',
+                'last_name': 'Doe',
+                'gender': ''.join(['Mal', 'e']),
+                'city': ''.join(['Sydn', 'ey']),
+                'state': ''.join(['N', 'SW'])
+            }
+        ]
+        
+        # Act
+        result = convert_to_members(sample_data)
+        
+        # Assert
+        assert len(result) == 2
+        assert result[0].gender is result[1].gender
+        assert result[0].city is result[1].city
+        assert result[0].state is result[1].state